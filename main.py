@@ -1,17 +1,38 @@
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
+from typing import Literal
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 import src.config.env as env
-from src.routes.api.v1 import router as api_router
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from src.app.exception_handlers import register_exception_handlers
+from src.app.metrics import registry
+from src.app.middleware import (
+    AccessLogMiddleware,
+    MetricsMiddleware,
+    ProfilerMiddleware,
 )
+from src.app.profiler import profile_response, profile_window
+from src.app.warmup import warmup, warmup_state
+from src.app.responses import FastJSONResponse
+from src.app.cache.backend import cache_backend
+from src.app.cache.token_cache import token_cache
+from src.app.cache.user_cache import user_cache
+from src.app.services.password_hasher import password_hasher
+from src.app.services.revocation_service import RevocationService
+from src.database.pool import get_pool_status
+from src.database.session import async_engine, check_database_health
+from src.config.logger import configure_logging, flush_logging
+from src.config.security import require_api_key
+from src.routes.api.v1 import router as api_router, user_router
+
+# Configure logging (queue + listener thread, JSON per batch)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -21,14 +42,35 @@ async def lifespan(app: FastAPI):
     Handle startup and shutdown events
     """
     # Startup
-    logger.info("🚀 FastAPI Starter Template is starting up...")
-    logger.info("📝 Documentation available at: http://0.0.0.0:8001/docs")
-    logger.info("🔗 API Base URL: http://0.0.0.0:8001/api/v1")
+    loop = asyncio.get_running_loop()
+    logger.info(
+        "🚀 FastAPI Starter Template is starting up (pid %s, loop %s)...",
+        os.getpid(),
+        type(loop).__module__.split(".")[0],
+    )
+    logger.info("📝 Documentation available at: %s/docs", env.API_PUBLIC_URL)
+    logger.info("🔗 API Base URL: %s", env.API_PUBLIC_URL)
+
+    if env.METRICS_ENABLED:
+        register_runtime_metrics()
+
+    # Subscribe invalidation/revocation dari worker lain (kalau backend shared)
+    await user_cache.start()
+    await RevocationService.start()
+
+    # Pool, mapper, schema, bcrypt siap sebelum request pertama
+    if env.WARMUP_ENABLED:
+        await warmup(app)
 
     yield  # Server is running
 
     # Shutdown
     logger.info("⚡️ FastAPI Starter Template is shutting down...")
+    password_hasher.shutdown()
+    await cache_backend.close()
+    await async_engine.dispose()
+    # Drain log queue di thread lain (blocking, dibatasi timeout)
+    await asyncio.to_thread(flush_logging)
 
 
 # Initialize FastAPI app
@@ -39,6 +81,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -50,8 +94,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Structured access log (menggantikan uvicorn access log)
+if env.ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+
+# Request latency histogram + in flight (paling luar, ukur semua middleware)
+if env.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Profiler cuma di-mount kalau API key di-set (tanpa key = terbuka untuk semua)
+PROFILER_ACTIVE = env.PROFILER_ENABLED and bool(env.API_KEY)
+if env.PROFILER_ENABLED and not PROFILER_ACTIVE:
+    logger.warning("⚠️ PROFILER_ENABLED without API_KEY: profiler is disabled")
+
+# Profile per request lewat header X-Profile (paling luar, ikut semua middleware)
+if PROFILER_ACTIVE:
+    app.add_middleware(ProfilerMiddleware)
+
+# Domain error (AppError) -> error response
+register_exception_handlers(app)
+
 # Include routers
 app.include_router(api_router)
+app.include_router(user_router)
 
 
 @app.get("/")
@@ -64,8 +129,14 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "health_ready": "/health/ready",
+            "health_db": "/health/db",
+            "health_db_pool": "/health/db/pool",
+            "health_cache": "/health/cache",
+            "metrics": "/metrics",
             "api_v1": "/api/v1",
             "auth": "/api/v1/auth",
+            "users": "/api/v1/users",
             "docs": "/docs",
         },
     }
@@ -73,16 +144,204 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Basic health check endpoint"""
+    """Liveness: process hidup dan event loop jalan (tanpa cek dependency)"""
     return {"status": "healthy", "service": "FastAPI Starter", "version": "1.0.0"}
 
 
-if __name__ == "__main__":
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness: warmup selesai dan database bisa dijangkau
+    503 -> load balancer jangan kirim traffic ke worker ini dulu
+    """
+    database = await check_database_health()
+    warmed = warmup_state.completed or not env.WARMUP_ENABLED
+    ready = warmed and database["status"] == "healthy"
+
+    if not ready:
+        status = "not_ready"
+    elif warmup_state.failed:
+        status = "degraded"  # Step warmup gagal, request pertama lebih lambat
+    else:
+        status = "ready"
+
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": status,
+            "database": database["status"],
+            "warmup": warmup_state.stats(),
+        },
+    )
+
+
+@app.get("/health/db")
+async def database_health_check():
+    """Database connectivity (tanpa detail error / pool, endpoint ini public)"""
+    health = await check_database_health()
+    status_code = 200 if health["status"] == "healthy" else 503
+    return FastJSONResponse(status_code=status_code, content=health)
+
+
+@app.get(
+    "/health/db/pool",
+    include_in_schema=False,
+    dependencies=[Depends(require_api_key)],
+)
+async def database_pool_status():
+    """Snapshot connection pool worker ini (checkout, overflow, wait), butuh API key"""
+    return FastJSONResponse(get_pool_status(async_engine.pool))
+
+
+@app.get("/health/cache")
+async def cache_health_check():
+    """User / token cache hit/miss counters (untuk sizing cache)"""
+    return {"user_cache": user_cache.stats(), "token_cache": token_cache.stats()}
+
+
+def register_runtime_metrics() -> None:
+    """
+    Pool, password hasher dan cache counters, dibaca dari stats() waktu scrape
+    Dipanggil waktu startup (bukan import): worker yang di-spawn import
+    main.py dua kali (__mp_main__ dan main:app)
+    """
+    if "db_pool_connections" in registry:
+        return
+
+    def pool_connections():
+        pool = get_pool_status(async_engine.pool)
+        return {
+            (state,): pool.get(state, 0)
+            for state in ("checked_in", "checked_out", "overflow")
+        }
+
+    def pool_counter(field: str):
+        def collect():
+            metrics = getattr(async_engine.pool, "metrics", None)
+            return {(): getattr(metrics, field)} if metrics is not None else {}
+
+        return collect
+
+    registry.gauge(
+        "db_pool_connections",
+        "Database pool connections by state",
+        ("state",),
+        callback=pool_connections,
+    )
+    registry.counter(
+        "db_pool_checkouts_total",
+        "Database pool checkouts",
+        callback=pool_counter("checkouts"),
+    )
+    registry.counter(
+        "db_pool_timeouts_total",
+        "Database pool checkout timeouts",
+        callback=pool_counter("timeouts"),
+    )
+    registry.counter(
+        "db_pool_wait_seconds_total",
+        "Total time spent waiting for a pooled connection",
+        callback=pool_counter("total_wait"),
+    )
+    registry.gauge(
+        "password_hash_pending",
+        "Password hash/verify jobs running or queued",
+        callback=lambda: {(): password_hasher.stats()["pending"]},
+    )
+    registry.counter(
+        "password_hash_rejected_total",
+        "Password hash/verify jobs rejected because the pool was saturated",
+        callback=lambda: {(): password_hasher.stats()["rejected"]},
+    )
+
+    def cache_counter(field: str):
+        def collect():
+            user_stats = user_cache.stats()
+            token_stats = token_cache.stats()
+            if field == "hits":
+                user_value = user_stats["local_hits"] + user_stats["shared_hits"]
+            else:
+                user_value = user_stats[field]
+            return {("user",): user_value, ("token",): token_stats[field]}
+
+        return collect
+
+    registry.counter(
+        "cache_hits_total", "Cache hits", ("cache",), callback=cache_counter("hits")
+    )
+    registry.counter(
+        "cache_misses_total",
+        "Cache misses",
+        ("cache",),
+        callback=cache_counter("misses"),
+    )
+
+
+if env.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics (text format) untuk worker ini"""
+        return PlainTextResponse(
+            registry.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
+if PROFILER_ACTIVE:
+
+    @app.get(
+        "/debug/profile",
+        include_in_schema=False,
+        dependencies=[Depends(require_api_key)],
+    )
+    async def profile_worker(
+        seconds: float = Query(10, gt=0, le=env.PROFILER_MAX_SECONDS),
+        format: Literal["collapsed", "speedscope"] = "speedscope",
+    ):
+        """Sample semua thread worker ini selama `seconds` (flamegraph / speedscope)"""
+        sampler = await profile_window(seconds)
+        return profile_response(
+            sampler, format, name=f"worker {os.getpid()} ({seconds:g}s)"
+        )
+
+
+def run() -> None:
+    """
+    Jalankan server dari setting SERVER_* (default: worker = jumlah core
+    dengan CACHE_BACKEND=redis, 1 worker tanpa redis; uvloop + httptools
+    kalau ter-install, reload off)
+    """
+    if env.SERVER_WORKERS > 1 and env.CACHE_BACKEND != "redis":
+        # Memory backend per process: logout / refresh rotation / reset token
+        # di satu worker tidak kelihatan di worker lain
+        logger.error(
+            "❌ SERVER_WORKERS=%s requires CACHE_BACKEND=redis: token revocation, "
+            "refresh rotation, reset tokens and user cache invalidation are per "
+            "process with the memory backend",
+            env.SERVER_WORKERS,
+        )
+        flush_logging()
+        raise SystemExit(1)
+
+    # Worker yang di-spawn bagi core untuk password hasher (lihat env.py)
+    os.environ["SERVER_PROCESSES"] = str(env.SERVER_WORKERS)
     uvicorn.run(
         "main:app",
         host=env.API_HOST,
         port=env.API_PORT,
-        reload=True,  # Enable auto-reload for development
-        access_log=True,
-        log_level="info",
+        reload=env.SERVER_RELOAD,
+        workers=env.SERVER_WORKERS,
+        loop=env.SERVER_LOOP,
+        http=env.SERVER_HTTP,
+        backlog=env.SERVER_BACKLOG,
+        timeout_keep_alive=env.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=env.SERVER_GRACEFUL_TIMEOUT,
+        limit_concurrency=env.SERVER_LIMIT_CONCURRENCY,
+        limit_max_requests=env.SERVER_LIMIT_MAX_REQUESTS,
+        access_log=False,  # Diganti AccessLogMiddleware
+        log_level=env.LOG_LEVEL.lower(),
     )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,24 @@
+import src.config.env as env
+from src.app.cache.base import CacheBackend
+from src.app.cache.memory_backend import MemoryCacheBackend
+
+
+def create_cache_backend() -> CacheBackend:
+    """Buat cache backend sesuai CACHE_BACKEND (memory | redis)"""
+    if env.CACHE_BACKEND == "redis":
+        from src.app.cache.redis_backend import RedisCacheBackend
+
+        return RedisCacheBackend(env.CACHE_URL)
+
+    if env.CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown cache backend: {env.CACHE_BACKEND}")
+
+    return MemoryCacheBackend()
+
+
+def cache_key(*parts) -> str:
+    """Namespaced key, misalnya cache_key("user", "id", 1)"""
+    return env.CACHE_KEY_PREFIX + ":".join(str(part) for part in parts)
+
+
+cache_backend = create_cache_backend()
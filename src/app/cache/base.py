@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence
+
+MessageHandler = Callable[[str], None]
+
+
+class CacheBackend(ABC):
+    """
+    Interface cache backend (Redis-protocol semantics)
+    Value selalu bytes, serialisasi jadi tanggung jawab caller
+    """
+
+    # True kalau data di-share antar worker/node (Redis), False kalau per process
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get value, None kalau tidak ada / expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Set value dengan TTL (detik) optional"""
+
+    @abstractmethod
+    async def set_if_absent(
+        self, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        """Set value kalau key belum ada (SET NX); True kalau berhasil di-set"""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Delete satu atau lebih key"""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Get banyak key dalam satu round trip (MGET)"""
+
+    @abstractmethod
+    async def set_many(
+        self, mapping: Dict[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        """Set banyak key dalam satu round trip (pipeline)"""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Increment counter; TTL di-set waktu counter pertama kali dibuat"""
+
+    @abstractmethod
+    async def scan(self, prefix: str) -> Dict[str, bytes]:
+        """Ambil semua key dengan prefix (untuk warmup, jangan di hot path)"""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Publish message ke semua subscriber channel"""
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        """Register handler untuk message di channel"""
+
+    async def close(self) -> None:
+        """Release connection / background task"""
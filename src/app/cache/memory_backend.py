@@ -0,0 +1,119 @@
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.app.cache.base import CacheBackend, MessageHandler
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process backend dengan semantics yang sama seperti Redis backend
+    (TTL, MGET/pipeline, INCR, pub/sub). Default untuk single worker dan
+    local stand-in waktu development/testing
+    """
+
+    shared = False
+
+    # Sweep expired key setiap N write supaya key yang tidak pernah dibaca
+    # tidak numpuk
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._subscribers: Dict[str, List[MessageHandler]] = defaultdict(list)
+        self._writes = 0
+
+    def _read(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl is not None else None
+
+    def _maybe_sweep(self) -> None:
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY:
+            return
+
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (expires_at, _) in self._data.items()
+            if expires_at is not None and expires_at < now
+        ]
+        for key in expired:
+            del self._data[key]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._read(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (self._expiry(ttl), value)
+        self._maybe_sweep()
+
+    async def set_if_absent(
+        self, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        # Tidak ada await antara read dan write: atomic dalam satu event loop
+        if self._read(key) is not None:
+            return False
+        await self.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self._read(key) for key in keys]
+
+    async def set_many(
+        self, mapping: Dict[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        expires_at = self._expiry(ttl)
+        for key, value in mapping.items():
+            self._data[key] = (expires_at, value)
+        self._maybe_sweep()
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        current = self._read(key)
+        if current is None:
+            value = amount
+            expires_at = self._expiry(ttl)
+        else:
+            value = int(current) + amount
+            expires_at = self._data[key][0]
+
+        self._data[key] = (expires_at, str(value).encode())
+        self._maybe_sweep()
+        return value
+
+    async def scan(self, prefix: str) -> Dict[str, bytes]:
+        result = {}
+        for key in list(self._data):
+            if key.startswith(prefix):
+                value = self._read(key)
+                if value is not None:
+                    result[key] = value
+        return result
+
+    async def publish(self, channel: str, message: str) -> None:
+        for handler in self._subscribers.get(channel, []):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception("Cache subscriber failed on channel %s", channel)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        self._subscribers[channel].append(handler)
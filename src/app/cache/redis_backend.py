@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.app.cache.base import CacheBackend, MessageHandler
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache backend untuk multi worker / multi node (Redis protocol)
+    Butuh package `redis` (redis.asyncio); client bisa di-inject, misalnya
+    fakeredis untuk testing
+    """
+
+    shared = True
+
+    def __init__(self, url: str = "", client: Any = None):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "CACHE_BACKEND=redis requires the 'redis' package"
+                ) from e
+            client = redis.from_url(url)
+
+        self._client = client
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return int(ttl * 1000) if ttl is not None else None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._client.set(key, value, px=self._px(ttl))
+
+    async def set_if_absent(
+        self, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        return bool(await self._client.set(key, value, px=self._px(ttl), nx=True))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._client.mget(list(keys))
+
+    async def set_many(
+        self, mapping: Dict[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        if not mapping:
+            return
+
+        px = self._px(ttl)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, px=px)
+            await pipe.execute()
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incrby(key, amount)
+            if ttl is not None:
+                # NX: TTL cuma di-set sekali (waktu counter dibuat)
+                pipe.pexpire(key, self._px(ttl), nx=True)
+            result = await pipe.execute()
+        return int(result[0])
+
+    async def scan(self, prefix: str) -> Dict[str, bytes]:
+        keys = [key async for key in self._client.scan_iter(match=f"{prefix}*")]
+        values = await self.get_many(keys)
+        return {
+            (key.decode() if isinstance(key, bytes) else key): value
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        if self._pubsub is None:
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+
+        self._handlers.setdefault(channel, []).append(handler)
+        await self._pubsub.subscribe(channel)
+
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Redis pub/sub listener error")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message.get("type") != "message":
+                continue
+
+            channel = message["channel"]
+            data = message["data"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            if isinstance(data, bytes):
+                data = data.decode()
+
+            for handler in self._handlers.get(channel, []):
+                try:
+                    handler(data)
+                except Exception:
+                    logger.exception("Cache subscriber failed on channel %s", channel)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+        await self._client.aclose()
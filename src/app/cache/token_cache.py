@@ -0,0 +1,55 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import src.config.env as env
+from src.app.cache.lru import TTLCache
+from src.app.schemas.user_schema import TokenData
+
+
+class TokenCache:
+    """
+    Cache token yang sudah diverifikasi -> TokenData
+    Key-nya digest token (token mentah tidak disimpan), entry expired di `exp`
+    token. Cuma token valid yang masuk cache; revocation tetap dicek tiap
+    request di AuthService.authenticate_token
+    """
+
+    def __init__(self, max_size: int, enabled: bool = True):
+        self.enabled = enabled
+        # TTL default tidak dipakai, tiap entry pakai sisa umur token
+        self._tokens: TTLCache[TokenData] = TTLCache(max_size=max_size, ttl=0)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+    def get(self, token: str) -> Optional[TokenData]:
+        if not self.enabled:
+            return None
+        return self._tokens.get(self._key(token))
+
+    def set(self, token: str, token_data: TokenData) -> None:
+        if not self.enabled or token_data.expires_at is None:
+            return
+
+        ttl = token_data.expires_at - time.time()
+        if ttl > 0:
+            self._tokens.set(self._key(token), token_data, ttl=ttl)
+
+    def evict(self, token: str) -> None:
+        self._tokens.delete(self._key(token))
+
+    def clear(self) -> None:
+        self._tokens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._tokens.stats()
+        stats.pop("ttl_seconds")
+        return {"enabled": self.enabled, **stats}
+
+
+token_cache = TokenCache(
+    max_size=env.TOKEN_CACHE_MAX_SIZE,
+    enabled=env.TOKEN_CACHE_ENABLED,
+)
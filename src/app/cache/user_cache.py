@@ -0,0 +1,229 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import make_transient_to_detached
+
+import src.config.env as env
+from src.app.cache.backend import cache_backend, cache_key
+from src.app.cache.base import CacheBackend
+from src.app.cache.lru import TTLCache
+from src.database.factories.user_factory import User
+
+# Password hash tidak pernah di-cache (L1 maupun shared backend): auth baca
+# hash langsung dari database
+USER_COLUMNS = [
+    column.key for column in User.__table__.columns if column.key != "password"
+]
+# Namespace key shared backend. v2: snapshot tanpa password hash; entry lama
+# (v1, masih berisi hash) tidak pernah dibaca lagi dan habis lewat TTL
+SHARED_KEY_VERSION = "v2"
+DATETIME_COLUMNS = {
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+}
+
+
+class UserCache:
+    """
+    Cache untuk User lookup by id / username / email
+    L1: in-process LRU+TTL. L2: shared backend (Redis) kalau dikonfigurasi,
+    dengan pub/sub supaya invalidation sampai ke semua worker.
+    Yang disimpan snapshot kolom (bukan ORM instance), jadi tidak ada object
+    yang di-share antar session. Username/email cuma index ke id, jadi
+    invalidate by id sudah cukup
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        enabled: bool = True,
+        backend: Optional[CacheBackend] = None,
+        shared_ttl: Optional[float] = None,
+    ):
+        self.enabled = enabled
+        self.backend = backend
+        self.shared_ttl = shared_ttl
+        self._users: TTLCache[Dict[str, Any]] = TTLCache(max_size=max_size, ttl=ttl)
+        self._index: TTLCache[int] = TTLCache(max_size=max_size * 2, ttl=ttl)
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def shared(self) -> bool:
+        return self.backend is not None and self.backend.shared
+
+    @staticmethod
+    def _shared_key(*parts) -> str:
+        return cache_key("user", SHARED_KEY_VERSION, *parts)
+
+    @property
+    def channel(self) -> str:
+        return cache_key("user-cache", "invalidate")
+
+    async def start(self) -> None:
+        """Subscribe invalidation dari worker lain (dipanggil saat startup)"""
+        if self.enabled and self.shared:
+            await self.backend.subscribe(self.channel, self._on_invalidate)
+
+    def _on_invalidate(self, message: str) -> None:
+        self._users.delete(int(message))
+
+    # =============== Snapshot ===============
+    @staticmethod
+    def _snapshot(user: User) -> Dict[str, Any]:
+        return {key: getattr(user, key) for key in USER_COLUMNS}
+
+    @staticmethod
+    def _hydrate(snapshot: Dict[str, Any]) -> User:
+        # Detached instance dengan identity, bukan pending insert
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    @staticmethod
+    def _encode(snapshot: Dict[str, Any]) -> bytes:
+        return json.dumps(
+            snapshot, default=lambda value: value.isoformat(), separators=(",", ":")
+        ).encode()
+
+    @staticmethod
+    def _decode(raw: bytes) -> Dict[str, Any]:
+        # Cuma kolom yang dikenal (field lain dari writer lain dibuang)
+        data = json.loads(raw)
+        snapshot = {key: data.get(key) for key in USER_COLUMNS}
+        for key in DATETIME_COLUMNS:
+            if snapshot.get(key) is not None:
+                snapshot[key] = datetime.fromisoformat(snapshot[key])
+        return snapshot
+
+    def _store_local(self, snapshot: Dict[str, Any]) -> None:
+        self._users.set(snapshot["id"], snapshot)
+        self._index.set(("username", snapshot["username"]), snapshot["id"])
+        self._index.set(("email", snapshot["email"]), snapshot["id"])
+
+    # =============== Lookups ===============
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        if not self.enabled:
+            return None
+
+        snapshot = self._users.get(user_id)
+        if snapshot is not None:
+            self.local_hits += 1
+            return self._hydrate(snapshot)
+
+        if self.shared:
+            raw = await self.backend.get(self._shared_key("id", user_id))
+            if raw is not None:
+                snapshot = self._decode(raw)
+                self._store_local(snapshot)
+                self.shared_hits += 1
+                return self._hydrate(snapshot)
+
+        self.misses += 1
+        return None
+
+    async def get_by_field(self, field: str, value: str) -> Optional[User]:
+        """Lookup by username / email lewat index ke id"""
+        if not self.enabled:
+            return None
+
+        return await self._lookup((field,), value)
+
+    async def get_by_identifier(self, identifier: str) -> Optional[User]:
+        """Lookup by username atau email (login)"""
+        if not self.enabled:
+            return None
+
+        return await self._lookup(("username", "email"), identifier)
+
+    async def _lookup(self, fields: Tuple[str, ...], value: str) -> Optional[User]:
+        for field in fields:
+            user_id = self._index.get((field, value))
+            snapshot = self._users.get(user_id) if user_id is not None else None
+
+            # Index bisa stale kalau username/email sudah berubah
+            if snapshot is not None and snapshot[field] == value:
+                self.local_hits += 1
+                return self._hydrate(snapshot)
+
+        if self.shared:
+            user_ids = await self.backend.get_many(
+                [self._shared_key(field, value) for field in fields]
+            )
+            for field, user_id in zip(fields, user_ids):
+                if user_id is None:
+                    continue
+
+                raw = await self.backend.get(self._shared_key("id", int(user_id)))
+                if raw is None:
+                    continue
+
+                snapshot = self._decode(raw)
+                if snapshot[field] == value:
+                    self._store_local(snapshot)
+                    self.shared_hits += 1
+                    return self._hydrate(snapshot)
+
+        self.misses += 1
+        return None
+
+    # =============== Writes ===============
+    async def set(self, user: Optional[User]) -> Optional[User]:
+        """Simpan user (return user lagi supaya enak dipakai di return statement)"""
+        if not self.enabled or user is None:
+            return user
+
+        snapshot = self._snapshot(user)
+        self._store_local(snapshot)
+
+        if self.shared:
+            user_id = str(user.id).encode()
+            await self.backend.set_many(
+                {
+                    self._shared_key("id", user.id): self._encode(snapshot),
+                    self._shared_key("username", user.username): user_id,
+                    self._shared_key("email", user.email): user_id,
+                },
+                ttl=self.shared_ttl,
+            )
+
+        return user
+
+    async def invalidate(self, user_id: int) -> None:
+        self._users.delete(user_id)
+
+        if self.enabled and self.shared:
+            await self.backend.delete(self._shared_key("id", user_id))
+            await self.backend.publish(self.channel, str(user_id))
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.local_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.shared else "local",
+            "size": len(self._users),
+            "max_size": self._users.max_size,
+            "ttl_seconds": self._users.ttl,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self._users.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_cache = UserCache(
+    max_size=env.USER_CACHE_MAX_SIZE,
+    ttl=env.USER_CACHE_TTL_SECONDS,
+    enabled=env.USER_CACHE_ENABLED,
+    backend=cache_backend,
+    shared_ttl=env.USER_CACHE_SHARED_TTL_SECONDS,
+)
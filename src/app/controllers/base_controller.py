@@ -1,11 +1,26 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from fastapi import HTTPException, status, Request
-from fastapi.responses import JSONResponse
-from datetime import datetime
+from fastapi.responses import JSONResponse, StreamingResponse
+import base64
+import csv
+import io
+import json
 import logging
 
+from src.app.exception_handlers import resolve_error
+from src.app.exceptions import (
+    AppError,
+    InvalidCursorError,
+    InvalidFormatError,
+    NotFoundError,
+)
+from src.app.responses import FastJSONResponse, clock
+
 logger = logging.getLogger(__name__)
 
+# Format streaming list -> media type
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 
 class BaseController:
     """
@@ -20,13 +35,17 @@ class BaseController:
         message: str = "Success",
         status_code: int = 200,
         meta: Optional[Dict] = None,
-    ) -> Dict[str, Any]:
-        """Standard success response format"""
+    ) -> FastJSONResponse:
+        """
+        Standard success response format (schema: SuccessEnvelope)
+        Langsung jadi response (pydantic model / datetime di `data` di-encode
+        native), FastAPI tidak perlu validate + jsonable_encoder lagi
+        """
         response = {
             "success": True,
             "status_code": status_code,
             "message": message,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": clock.isoformat(),
         }
 
         if data is not None:
@@ -35,7 +54,7 @@ class BaseController:
         if meta:
             response["meta"] = meta
 
-        return response
+        return FastJSONResponse(response)
 
     @staticmethod
     def error_response(
@@ -43,13 +62,14 @@ class BaseController:
         status_code: int = 500,
         error_code: Optional[str] = None,
         details: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> HTTPException:
-        """Standard error response format"""
+        """Standard error response format (schema: ErrorEnvelope)"""
         error_data = {
             "success": False,
             "status_code": status_code,
             "message": message,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": clock.isoformat(),
         }
 
         if error_code:
@@ -58,17 +78,40 @@ class BaseController:
         if details:
             error_data["details"] = details
 
-        return HTTPException(status_code=status_code, detail=error_data)
+        return HTTPException(
+            status_code=status_code, detail=error_data, headers=headers
+        )
 
     @staticmethod
     def paginated_response(
         data: List[Any],
-        page: int = 1,
+        page: Optional[int] = 1,
         per_page: int = 10,
-        total: int = 0,
+        total: Optional[int] = 0,
         message: str = "Data retrieved successfully",
-    ) -> Dict[str, Any]:
-        """Standard paginated response format"""
+        next_cursor: Optional[str] = None,
+        has_next: Optional[bool] = None,
+        total_mode: str = "exact",
+    ) -> FastJSONResponse:
+        """
+        Standard paginated response format (schema: PageEnvelope)
+        page=None artinya cursor pagination: client kirim balik `next_cursor`
+        """
+        if page is None:
+            meta = {
+                "pagination": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor,
+                    "has_next": next_cursor is not None,
+                    "total": total,
+                    "total_mode": total_mode,
+                }
+            }
+            return BaseController.success_response(
+                data=data, message=message, meta=meta
+            )
+
+        total = total or 0
         total_pages = (total + per_page - 1) // per_page if total > 0 else 1
 
         meta = {
@@ -77,50 +120,62 @@ class BaseController:
                 "per_page": per_page,
                 "total": total,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
+                "has_next": has_next if has_next is not None else page < total_pages,
                 "has_prev": page > 1,
             }
         }
 
+        if total_mode != "exact":
+            meta["pagination"]["total_mode"] = total_mode
+
         return BaseController.success_response(data=data, message=message, meta=meta)
 
+    @staticmethod
+    def encode_cursor(values: Dict[str, Any]) -> str:
+        """Opaque cursor (base64url JSON) dari key row terakhir"""
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @staticmethod
+    def decode_cursor(
+        cursor: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Decode cursor dari client, raise error 400 kalau rusak / key beda"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(values, dict):
+                raise ValueError("Cursor must be an object")
+            if fields is not None and set(values) != set(fields):
+                raise ValueError("Cursor fields mismatch")
+            return values
+        except ValueError:
+            raise InvalidCursorError()
+
     @staticmethod
     def handle_service_error(
         error: Exception, default_message: str = "Service error"
-    ) -> HTTPException:
-        """Handle errors dari service layer"""
-        logger.error(f"Service error: {str(error)}")
-
-        # Jika error sudah HTTPException, langsung return
+    ) -> Union[HTTPException, AppError]:
+        """
+        Handle errors dari service layer
+        HTTPException / domain error (AppError) diteruskan apa adanya ke exception
+        handler; exception library di-map lewat dispatch table by type
+        """
         if isinstance(error, HTTPException):
             return error
 
-        # Handle specific error types
-        if "not found" in str(error).lower():
-            return BaseController.error_response(
-                message=str(error),
-                status_code=status.HTTP_404_NOT_FOUND,
-                error_code="NOT_FOUND",
-            )
-        elif "already exists" in str(error).lower():
-            return BaseController.error_response(
-                message=str(error),
-                status_code=status.HTTP_409_CONFLICT,
-                error_code="ALREADY_EXISTS",
-            )
-        elif "validation" in str(error).lower():
-            return BaseController.error_response(
-                message=str(error),
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                error_code="VALIDATION_ERROR",
-            )
-        else:
-            return BaseController.error_response(
-                message=default_message,
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                error_code="INTERNAL_ERROR",
-                details={"original_error": str(error)},
-            )
+        domain_error = resolve_error(error)
+        if domain_error is not None:
+            return domain_error
+
+        # Error tidak dikenal: bug / infrastruktur
+        logger.error("%s: %r", default_message, error, exc_info=error)
+        return BaseController.error_response(
+            message=default_message,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error_code="INTERNAL_ERROR",
+            details={"original_error": str(error)},
+        )
 
     @staticmethod
     def validate_request_data(data: Any, required_fields: List[str] = None) -> None:
@@ -140,14 +195,13 @@ class BaseController:
 
     @staticmethod
     def log_request(request: Request, action: str, user_id: Optional[int] = None):
-        """Log request untuk audit trail"""
-        logger.info(
-            f"Action: {action} | "
-            f"IP: {request.client.host} | "
-            f"User: {user_id} | "
-            f"Method: {request.method} | "
-            f"URL: {request.url}"
-        )
+        """
+        Tandai action / user request untuk audit trail
+        Record ditulis AccessLogMiddleware setelah response (plus status + latency)
+        """
+        state = request.state
+        state.action = action
+        state.user_id = user_id
 
 
 class CRUDController(BaseController):
@@ -157,7 +211,7 @@ class CRUDController(BaseController):
     """
 
     @classmethod
-    def create_item(
+    async def create_item(
         cls,
         service_method,
         item_data,
@@ -165,7 +219,7 @@ class CRUDController(BaseController):
     ):
         """Generic create method"""
         try:
-            result = service_method(item_data)
+            result = await service_method(item_data)
             return cls.success_response(
                 data=result,
                 message=success_message,
@@ -175,7 +229,7 @@ class CRUDController(BaseController):
             raise cls.handle_service_error(e, "Failed to create item")
 
     @classmethod
-    def get_item(
+    async def get_item(
         cls,
         service_method,
         item_id: Union[int, str],
@@ -183,41 +237,133 @@ class CRUDController(BaseController):
     ):
         """Generic get single item method"""
         try:
-            result = service_method(item_id)
+            result = await service_method(item_id)
             if not result:
-                raise cls.error_response(
-                    message="Item not found",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="NOT_FOUND",
-                )
+                raise NotFoundError()
             return cls.success_response(data=result, message=success_message)
-        except HTTPException:
+        except (HTTPException, AppError):
             raise
         except Exception as e:
             raise cls.handle_service_error(e, "Failed to retrieve item")
 
     @classmethod
-    def get_items(cls, service_method, page: int = 1, per_page: int = 10, **filters):
-        """Generic get multiple items method with pagination"""
+    async def get_items(
+        cls,
+        service_method,
+        page: Optional[int] = None,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        total: str = "none",
+        cursor_field: Union[str, Tuple[str, ...]] = "id",
+        serializer: Optional[Callable[[Any], Any]] = None,
+        **filters,
+    ):
+        """
+        Generic get multiple items method with pagination
+        Default cursor (keyset) pagination: service dapat `after` = nilai
+        `cursor_field` row terakhir (tuple kalau key-nya beberapa kolom),
+        jadi tidak ada OFFSET scan. Kirim `page` untuk offset pagination lama.
+        `total` = exact | estimate | none
+        """
         try:
-            skip = (page - 1) * per_page
-            items = service_method(skip=skip, limit=per_page, **filters)
+            fields = (cursor_field,) if isinstance(cursor_field, str) else cursor_field
+
+            # Ambil satu row lebih untuk tahu masih ada page berikutnya
+            if page is None:
+                after = None
+                if cursor:
+                    values = cls.decode_cursor(cursor, fields)
+                    after = tuple(values[field] for field in fields)
+                    if len(fields) == 1:
+                        after = after[0]
+
+                items = await service_method(
+                    after=after, limit=per_page + 1, total=total, **filters
+                )
+            else:
+                skip = (page - 1) * per_page
+                items = await service_method(
+                    skip=skip, limit=per_page + 1, total=total, **filters
+                )
 
             # Jika service return tuple (items, total), handle pagination
             if isinstance(items, tuple):
-                items_data, total = items
-                return cls.paginated_response(
-                    data=items_data, page=page, per_page=per_page, total=total
-                )
+                items_data, total_count = items
             else:
-                return cls.success_response(
-                    data=items, message="Items retrieved successfully"
+                items_data, total_count = items, None
+
+            has_next = len(items_data) > per_page
+            items_data = items_data[:per_page]
+
+            next_cursor = None
+            if page is None and has_next:
+                last = items_data[-1]
+                next_cursor = cls.encode_cursor(
+                    {field: getattr(last, field) for field in fields}
                 )
+
+            if serializer:
+                items_data = [serializer(item) for item in items_data]
+
+            return cls.paginated_response(
+                data=items_data,
+                page=page,
+                per_page=per_page,
+                total=total_count,
+                next_cursor=next_cursor,
+                has_next=has_next,
+                total_mode=total,
+            )
+        except (HTTPException, AppError):
+            raise
         except Exception as e:
             raise cls.handle_service_error(e, "Failed to retrieve items")
 
     @classmethod
-    def update_item(
+    def stream_items(
+        cls,
+        stream_method,
+        fmt: str = "ndjson",
+        serializer: Optional[Callable[[Any], Dict[str, Any]]] = None,
+        **filters,
+    ) -> StreamingResponse:
+        """
+        Generic streaming list (NDJSON / CSV) tanpa pagination
+        `stream_method` async generator yang yield list item per chunk (server-side
+        cursor), jadi memory worker tidak ikut besar dengan jumlah row
+        """
+        if fmt not in STREAM_MEDIA_TYPES:
+            raise InvalidFormatError(f"Unsupported stream format: {fmt}")
+
+        serialize = serializer or (lambda item: item)
+
+        async def body():
+            header = None
+            async for items in stream_method(**filters):
+                rows = [serialize(item) for item in items]
+                if fmt == "ndjson":
+                    yield "".join(
+                        json.dumps(row, separators=(",", ":"), default=str) + "\n"
+                        for row in rows
+                    )
+                    continue
+
+                if not rows:
+                    continue
+
+                # Header CSV dari key row pertama
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=header or list(rows[0]))
+                if header is None:
+                    header = writer.fieldnames
+                    writer.writeheader()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+
+        return StreamingResponse(body(), media_type=STREAM_MEDIA_TYPES[fmt])
+
+    @classmethod
+    async def update_item(
         cls,
         service_method,
         item_id: Union[int, str],
@@ -226,21 +372,17 @@ class CRUDController(BaseController):
     ):
         """Generic update method"""
         try:
-            result = service_method(item_id, update_data)
+            result = await service_method(item_id, update_data)
             if not result:
-                raise cls.error_response(
-                    message="Item not found",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="NOT_FOUND",
-                )
+                raise NotFoundError()
             return cls.success_response(data=result, message=success_message)
-        except HTTPException:
+        except (HTTPException, AppError):
             raise
         except Exception as e:
             raise cls.handle_service_error(e, "Failed to update item")
 
     @classmethod
-    def delete_item(
+    async def delete_item(
         cls,
         service_method,
         item_id: Union[int, str],
@@ -248,17 +390,13 @@ class CRUDController(BaseController):
     ):
         """Generic delete method"""
         try:
-            success = service_method(item_id)
+            success = await service_method(item_id)
             if not success:
-                raise cls.error_response(
-                    message="Item not found",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="NOT_FOUND",
-                )
+                raise NotFoundError()
             return cls.success_response(
                 data={"deleted_id": item_id}, message=success_message
             )
-        except HTTPException:
+        except (HTTPException, AppError):
             raise
         except Exception as e:
             raise cls.handle_service_error(e, "Failed to delete item")
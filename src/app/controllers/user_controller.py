@@ -0,0 +1,148 @@
+import io
+from typing import Optional
+
+from fastapi import Request, UploadFile
+from fastapi.responses import StreamingResponse
+
+from src.app.controllers.base_controller import CRUDController
+from src.app.exceptions import InvalidImportError
+from src.app.responses import FastJSONResponse
+from src.app.schemas.user_schema import UserResponse
+from src.app.services.user_service import UserService
+from src.app.services.user_transfer_service import UserTransferService
+
+# Media type untuk streaming export
+EXPORT_MEDIA_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+
+
+class UserController(CRUDController):
+    """
+    User Controller - Handle user listing & search
+    Semua logic ada di UserService, controller cuma handle request/response
+    """
+
+    @classmethod
+    async def list_users(
+        cls,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        page: Optional[int] = None,
+        total: str = "none",
+        is_active: Optional[bool] = None,
+        request: Request = None,
+    ) -> FastJSONResponse:
+        """Handle list users request (cursor pagination)"""
+        if request:
+            cls.log_request(request, "LIST_USERS")
+
+        return await cls.get_items(
+            UserService.get_users_paginated,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            total=total,
+            serializer=UserResponse.model_validate,
+            is_active=is_active,
+        )
+
+    @classmethod
+    def stream_users(
+        cls,
+        fmt: str = "ndjson",
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        request: Request = None,
+    ) -> StreamingResponse:
+        """Handle streaming list users (NDJSON / CSV, lanjut dari cursor)"""
+        if request:
+            cls.log_request(request, "STREAM_USERS")
+
+        after = cls.decode_cursor(cursor, ["id"])["id"] if cursor else None
+        return cls.stream_items(
+            UserService.stream_users,
+            fmt,
+            serializer=lambda user: UserResponse.model_validate(user).model_dump(
+                mode="json"
+            ),
+            is_active=is_active,
+            after=after,
+        )
+
+    @classmethod
+    async def search_users(
+        cls,
+        query: str,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        page: Optional[int] = None,
+        total: str = "none",
+        request: Request = None,
+    ) -> FastJSONResponse:
+        """Handle search users request (ranked, cursor pagination)"""
+        if request:
+            cls.log_request(request, "SEARCH_USERS")
+
+        return await cls.get_items(
+            UserService.search_users,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            total=total,
+            cursor_field=("search_rank", "id"),
+            serializer=UserResponse.model_validate,
+            query=query,
+        )
+
+    @classmethod
+    async def get_stats(cls, fresh: bool = False, request: Request = None):
+        """Handle user statistics request"""
+        if request:
+            cls.log_request(request, "USER_STATS")
+
+        try:
+            stats = await UserService.get_user_stats(fresh=fresh)
+            return cls.success_response(
+                data=stats, message="User statistics retrieved successfully"
+            )
+        except Exception as e:
+            raise cls.handle_service_error(e, "Failed to retrieve user statistics")
+
+    @classmethod
+    async def import_users(
+        cls,
+        file: UploadFile,
+        fmt: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        request: Request = None,
+    ) -> FastJSONResponse:
+        """Handle bulk import users (CSV / JSONL upload)"""
+        if request:
+            cls.log_request(request, "IMPORT_USERS")
+
+        fmt = fmt or UserTransferService.detect_format(file.filename)
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+
+        try:
+            report = await UserTransferService.import_users(stream, fmt, batch_size)
+            return cls.success_response(
+                data=report, message="Users imported successfully"
+            )
+        except UnicodeDecodeError:
+            raise InvalidImportError("Import file must be UTF-8 encoded")
+        except Exception as e:
+            raise cls.handle_service_error(e, "Failed to import users")
+        finally:
+            # Jangan ikut close file upload (di-handle FastAPI)
+            stream.detach()
+
+    @classmethod
+    def export_users(cls, fmt: str = "jsonl", request: Request = None):
+        """Handle streaming export users"""
+        if request:
+            cls.log_request(request, "EXPORT_USERS")
+
+        return StreamingResponse(
+            UserTransferService.export_users(fmt),
+            media_type=EXPORT_MEDIA_TYPES[fmt],
+            headers={"Content-Disposition": f'attachment; filename="users.{fmt}"'},
+        )
@@ -0,0 +1,129 @@
+import logging
+from typing import Any, Dict, Optional, Tuple, Type
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from jose import ExpiredSignatureError, JWTError
+from pydantic_core import to_json
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.app.exceptions import (
+    AppError,
+    DatabaseBusyError,
+    InvalidTokenError,
+    TokenExpiredError,
+)
+from src.app.responses import FastJSONResponse, clock
+
+logger = logging.getLogger(__name__)
+
+# Dispatch table: exception library -> domain error (dicari lewat MRO)
+ERROR_TYPES: Dict[Type[Exception], Type[AppError]] = {
+    ExpiredSignatureError: TokenExpiredError,
+    JWTError: InvalidTokenError,
+    PoolTimeoutError: DatabaseBusyError,
+}
+
+# Hasil lookup MRO per concrete type
+_resolved: Dict[type, Optional[Type[AppError]]] = {}
+
+# Placeholder timestamp di body prebuilt, diganti waktu render
+_TIMESTAMP = "__timestamp__"
+
+# Domain error type -> body (bytes) sebelum dan sesudah timestamp
+_prebuilt: Dict[Type[AppError], Tuple[bytes, bytes]] = {}
+
+
+def resolve_error(error: Exception) -> Optional[AppError]:
+    """Map exception ke domain error lewat dispatch table (None kalau tidak dikenal)"""
+    if isinstance(error, AppError):
+        return error
+
+    error_type = type(error)
+    try:
+        domain_type = _resolved[error_type]
+    except KeyError:
+        domain_type = next(
+            (ERROR_TYPES[t] for t in error_type.__mro__ if t in ERROR_TYPES), None
+        )
+        _resolved[error_type] = domain_type
+
+    return domain_type() if domain_type is not None else None
+
+
+def error_content(error: AppError, timestamp: str) -> Dict[str, Any]:
+    """Body error (format sama dengan BaseController.error_response)"""
+    detail = {
+        "success": False,
+        "status_code": error.status_code,
+        "message": error.message,
+        "timestamp": timestamp,
+        "error_code": error.error_code,
+    }
+
+    if error.details:
+        detail["details"] = error.details
+
+    return {"detail": detail}
+
+
+def prebuild(error_type: Type[AppError]) -> Tuple[bytes, bytes]:
+    """Render body default error type sekali, split di timestamp"""
+    body = to_json(error_content(error_type, _TIMESTAMP))
+    head, tail = body.split(b'"' + _TIMESTAMP.encode() + b'"')
+    _prebuilt[error_type] = (head, tail)
+    return head, tail
+
+
+def render_error(error: AppError) -> Response:
+    """Response untuk domain error; message/details default pakai body prebuilt"""
+    if not error.is_default:
+        return FastJSONResponse(
+            error_content(error, clock.isoformat()),
+            status_code=error.status_code,
+            headers=error.headers,
+        )
+
+    head, tail = _prebuilt.get(type(error)) or prebuild(type(error))
+    body = b'%s"%s"%s' % (head, clock.isoformat().encode(), tail)
+    return Response(
+        body,
+        status_code=error.status_code,
+        headers=error.headers,
+        media_type="application/json",
+    )
+
+
+async def app_error_handler(request: Request, error: AppError) -> Response:
+    """Exception handler untuk semua AppError"""
+    if error.status_code >= 500:
+        logger.warning(
+            "%s %s -> %s: %s",
+            request.method,
+            request.url.path,
+            error.error_code,
+            error.message,
+        )
+    return render_error(error)
+
+
+async def mapped_error_handler(request: Request, error: Exception) -> Response:
+    """Exception handler untuk exception library yang ada di ERROR_TYPES"""
+    return await app_error_handler(request, resolve_error(error))
+
+
+def _subclasses(error_type: Type[AppError]):
+    for subclass in error_type.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Register handler domain error + prebuild body semua AppError subclass"""
+    app.add_exception_handler(AppError, app_error_handler)
+    for error_type in ERROR_TYPES:
+        app.add_exception_handler(error_type, mapped_error_handler)
+
+    prebuild(AppError)
+    for error_type in _subclasses(AppError):
+        prebuild(error_type)
@@ -0,0 +1,146 @@
+from typing import Any, Dict, Optional
+
+
+class AppError(Exception):
+    """
+    Base domain error
+    Status code, error code dan message default ada di class, jadi handler
+    map error by type (bukan parsing message). Error tanpa message / details
+    custom di-render dari body yang sudah di-prebuild per class
+    """
+
+    status_code: int = 500
+    error_code: str = "INTERNAL_ERROR"
+    message: str = "An error occurred"
+    headers: Optional[Dict[str, str]] = None
+    details: Optional[Dict[str, Any]] = None
+
+    def __init__(
+        self, message: Optional[str] = None, details: Optional[Dict[str, Any]] = None
+    ):
+        if message is not None:
+            self.message = message
+        self.details = details
+        super().__init__(self.message)
+
+    @property
+    def is_default(self) -> bool:
+        """Message dan details default class (body bisa pakai prebuilt)"""
+        return "message" not in self.__dict__ and not self.details
+
+
+# =============== 400 ===============
+class BadRequestError(AppError):
+    status_code = 400
+    error_code = "BAD_REQUEST"
+    message = "Bad request"
+
+
+class InvalidCursorError(BadRequestError):
+    error_code = "INVALID_CURSOR"
+    message = "Invalid pagination cursor"
+
+
+class InvalidFormatError(BadRequestError):
+    error_code = "INVALID_FORMAT"
+    message = "Unsupported format"
+
+
+class InvalidImportError(BadRequestError):
+    error_code = "INVALID_IMPORT"
+    message = "Invalid import file"
+
+
+class IncorrectPasswordError(BadRequestError):
+    error_code = "INCORRECT_PASSWORD"
+    message = "Current password is incorrect"
+
+
+class InvalidResetTokenError(BadRequestError):
+    error_code = "INVALID_RESET_TOKEN"
+    message = "Invalid or expired reset token"
+
+
+# =============== 401 / 403 ===============
+class AuthenticationError(AppError):
+    status_code = 401
+    error_code = "UNAUTHORIZED"
+    message = "Not authenticated"
+    headers = {"WWW-Authenticate": "Bearer"}
+
+
+class InvalidCredentialsError(AuthenticationError):
+    error_code = "INVALID_CREDENTIALS"
+    message = "Invalid credentials"
+
+
+class InvalidTokenError(AuthenticationError):
+    message = "Invalid token"
+
+
+class TokenExpiredError(InvalidTokenError):
+    message = "Token has expired"
+
+
+class TokenRevokedError(InvalidTokenError):
+    message = "Token has been revoked"
+
+
+class InvalidRefreshTokenError(AuthenticationError):
+    error_code = "INVALID_REFRESH_TOKEN"
+    message = "Invalid refresh token"
+
+
+class PermissionDeniedError(AppError):
+    status_code = 403
+    error_code = "FORBIDDEN"
+    message = "Permission denied"
+
+
+class AccountDeactivatedError(PermissionDeniedError):
+    error_code = "ACCOUNT_DEACTIVATED"
+    message = "Account is deactivated"
+
+
+# =============== 404 / 409 / 422 ===============
+class NotFoundError(AppError):
+    status_code = 404
+    error_code = "NOT_FOUND"
+    message = "Item not found"
+
+
+class UserNotFoundError(NotFoundError):
+    message = "User not found"
+
+
+class ConflictError(AppError):
+    status_code = 409
+    error_code = "ALREADY_EXISTS"
+    message = "Item already exists"
+
+
+class DomainValidationError(AppError):
+    status_code = 422
+    error_code = "VALIDATION_ERROR"
+    message = "Validation error"
+
+
+# =============== 503 ===============
+class ServiceUnavailableError(AppError):
+    status_code = 503
+    error_code = "SERVICE_UNAVAILABLE"
+    message = "Service temporarily unavailable"
+    headers = {"Retry-After": "1"}
+
+
+class ServiceBusyError(ServiceUnavailableError):
+    error_code = "SERVICE_BUSY"
+    message = "Service is busy, retry later"
+
+
+class DatabaseBusyError(ServiceBusyError):
+    message = "Database connection pool exhausted, retry later"
+
+
+class ProfilerBusyError(ServiceBusyError):
+    message = "Profiler already running in this worker, retry later"
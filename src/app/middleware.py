@@ -0,0 +1,184 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+import src.config.env as env
+from src.app.exception_handlers import render_error
+from src.app.exceptions import AppError, InvalidFormatError
+from src.app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from src.app.profiler import (
+    PROFILE_FORMATS,
+    profile_response,
+    start_profile,
+    stop_profile,
+)
+from src.app.responses import FastJSONResponse
+from src.config.security import require_api_key
+
+access_logger = logging.getLogger("access")
+
+
+class AccessLogMiddleware:
+    """
+    Access log (pure ASGI middleware) - satu record per request setelah response
+    selesai: action, ip, user, method, path, status, latency
+    Action / user di-set controller lewat BaseController.log_request.
+    Action volume tinggi di-sample (ACCESS_LOG_SAMPLE_RATES), 5xx selalu di-log
+    """
+
+    def __init__(self, app, sample_rates: Optional[Dict[str, float]] = None):
+        self.app = app
+        self.sample_rates = (
+            env.ACCESS_LOG_SAMPLE_RATES if sample_rates is None else sample_rates
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.log(scope, status_code, time.perf_counter() - start)
+
+    def log(self, scope, status_code: int, elapsed: float) -> None:
+        state = scope.get("state") or {}
+        action = state.get("action")
+
+        sample_rate = self.sample_rates.get(action, 1.0)
+        if status_code < 500 and sample_rate < 1.0 and random.random() >= sample_rate:
+            return
+
+        client = scope.get("client")
+        access_logger.info(
+            "%s %s %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            extra={
+                "action": action,
+                "ip": client[0] if client else None,
+                "user": state.get("user_id"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "latency_ms": round(elapsed * 1000, 3),
+                "sample_rate": sample_rate,
+            },
+        )
+
+
+class MetricsMiddleware:
+    """
+    Request metrics (pure ASGI middleware): latency histogram per
+    method / route template / status + jumlah request in flight
+    Route pakai template (/users/{id}), bukan path asli, supaya cardinality tetap
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+
+class ProfilerMiddleware:
+    """
+    Profile satu request (pure ASGI middleware): kirim header
+    `X-Profile: collapsed | speedscope` + `X-API-Key`, response diganti file
+    profile (status asli di header X-Profile-Status)
+    Yang di-sample thread event loop, jadi request lain yang jalan bersamaan
+    ikut masuk profile
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        profile_format = headers.get(b"x-profile")
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        api_key = headers.get(b"x-api-key", b"").decode("latin-1") or None
+        profile_format = profile_format.decode("latin-1").strip().lower()
+        try:
+            await require_api_key(api_key)
+            if profile_format not in PROFILE_FORMATS:
+                raise InvalidFormatError(
+                    f"Unsupported profile format, use one of: "
+                    f"{', '.join(PROFILE_FORMATS)}"
+                )
+            sampler = start_profile({threading.get_ident()})
+        except HTTPException as error:
+            response = FastJSONResponse(
+                {"detail": error.detail}, status_code=error.status_code
+            )
+            await response(scope, receive, send)
+            return
+        except AppError as error:
+            await render_error(error)(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            stop_profile(sampler)
+
+        response = profile_response(
+            sampler,
+            profile_format,
+            name=f"{scope['method']} {scope['path']}",
+            headers={"X-Profile-Status": str(status_code)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi.responses import PlainTextResponse, Response
+
+import src.config.env as env
+from src.app.exceptions import ProfilerBusyError
+from src.app.responses import FastJSONResponse
+
+# Format output profile
+PROFILE_FORMATS = ("collapsed", "speedscope")
+
+Stack = Tuple[str, ...]
+
+
+# Prefix path yang dibuang dari nama frame
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+def _short_path(filename: str) -> str:
+    """Path relatif ke project / site-packages / stdlib supaya frame name pendek"""
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    if filename.startswith(_STDLIB_DIR):
+        return filename[len(_STDLIB_DIR) :]
+    if filename.startswith(os.getcwd() + os.sep):
+        return os.path.relpath(filename)
+    return filename
+
+
+class StackSampler:
+    """
+    Sampling profiler: thread terpisah ambil stack thread lain tiap `interval`
+    (sys._current_frames), jadi kode yang diprofile tidak di-instrument.
+    thread_ids=None artinya semua thread (kecuali sampler sendiri)
+    """
+
+    def __init__(self, interval: float, thread_ids: Optional[Set[int]] = None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> "StackSampler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                thread_name = names.get(thread_id, str(thread_id))
+                self.samples[(thread_name,) + self._stack(frame)] += 1
+
+    def _stack(self, frame: Optional[FrameType]) -> Stack:
+        """Stack root -> leaf, satu label per function"""
+        labels: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({_short_path(code.co_filename)}:"
+                    f"{code.co_firstlineno})"
+                ).replace(";", ":")
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    # =============== Export ===============
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed stacks (flamegraph.pl, speedscope, inferno)"""
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """Speedscope file format (sampled profile, weight dalam ms)"""
+        frames: List[Dict[str, str]] = []
+        frame_index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+
+        for stack, count in self.samples.items():
+            indexes = []
+            for label in stack:
+                index = frame_index.get(label)
+                if index is None:
+                    index = frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indexes.append(index)
+            samples.append(indexes)
+            weights.append(round(count * self.interval * 1000, 3))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "fastapi-starter",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+# Satu profile aktif per worker (sampler thread + overhead GIL)
+_active: Optional[StackSampler] = None
+
+
+def start_profile(thread_ids: Optional[Set[int]] = None) -> StackSampler:
+    """Mulai sampling; ProfilerBusyError kalau worker sedang diprofile"""
+    global _active
+    if _active is not None:
+        raise ProfilerBusyError()
+    _active = StackSampler(env.PROFILER_INTERVAL, thread_ids).start()
+    return _active
+
+
+def stop_profile(sampler: StackSampler) -> StackSampler:
+    global _active
+    sampler.stop()
+    if _active is sampler:
+        _active = None
+    return sampler
+
+
+async def profile_window(seconds: float) -> StackSampler:
+    """Sample semua thread worker selama `seconds` (event loop tetap jalan)"""
+    sampler = start_profile()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stop_profile(sampler)
+    return sampler
+
+
+def profile_response(
+    sampler: StackSampler,
+    profile_format: str,
+    name: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Profile sebagai file download (collapsed text / speedscope JSON)"""
+    headers = {
+        **(headers or {}),
+        "X-Profile-Samples": str(sum(sampler.samples.values())),
+        "X-Profile-Duration": f"{sampler.duration:.3f}",
+    }
+
+    if profile_format == "collapsed":
+        headers["Content-Disposition"] = 'attachment; filename="profile.collapsed"'
+        return PlainTextResponse(sampler.collapsed(), headers=headers)
+
+    headers["Content-Disposition"] = 'attachment; filename="profile.speedscope.json"'
+    return FastJSONResponse(sampler.speedscope(name), headers=headers)
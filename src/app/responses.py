@@ -0,0 +1,40 @@
+import time
+from datetime import datetime
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response yang di-encode pydantic-core (Rust)
+    Pydantic model, datetime, UUID, Decimal, dll di-encode langsung tanpa
+    jsonable_encoder + json.dumps
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+class CoarseClock:
+    """
+    Timestamp ISO untuk response envelope, di-cache per `resolution` detik
+    Response dalam window yang sama pakai string yang sama, jadi tidak ada
+    datetime.now().isoformat() per response
+    """
+
+    def __init__(self, resolution: float = 0.001):
+        self.resolution = resolution
+        self._last = 0.0
+        self._value = ""
+
+    def isoformat(self) -> str:
+        now = time.time()
+        if now - self._last >= self.resolution:
+            self._last = now
+            self._value = datetime.fromtimestamp(now).isoformat()
+        return self._value
+
+
+clock = CoarseClock()
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class SuccessEnvelope(BaseModel, Generic[T]):
+    """
+    Standard success response envelope (BaseController.success_response)
+    Dipakai sebagai response_model supaya OpenAPI akurat; response-nya sendiri
+    di-render langsung dari dict oleh FastJSONResponse
+    """
+
+    success: bool = True
+    status_code: int = 200
+    message: str
+    timestamp: str
+    data: Optional[T] = None
+    meta: Optional[Dict[str, Any]] = None
+
+
+class PagePagination(BaseModel):
+    """Offset pagination meta (page=N)"""
+
+    current_page: int
+    per_page: int
+    total: int
+    total_pages: int
+    has_next: bool
+    has_prev: bool
+    total_mode: Optional[str] = None
+
+
+class CursorPagination(BaseModel):
+    """Cursor pagination meta - kirim balik `next_cursor` untuk page berikutnya"""
+
+    per_page: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+    total: Optional[int] = None
+    total_mode: str
+
+
+class PageMeta(BaseModel):
+    """Meta untuk paginated response"""
+
+    pagination: Union[CursorPagination, PagePagination]
+
+
+class PageEnvelope(SuccessEnvelope[List[T]], Generic[T]):
+    """Paginated response envelope (BaseController.paginated_response)"""
+
+    meta: PageMeta
+
+
+class ErrorEnvelope(BaseModel):
+    """Standard error body (isi `detail` dari BaseController.error_response)"""
+
+    success: bool = False
+    status_code: int
+    message: str
+    timestamp: str
+    error_code: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
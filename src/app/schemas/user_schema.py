@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, validator
 
@@ -83,6 +83,46 @@ class UserProfile(BaseModel):
         from_attributes = True
 
 
+class CurrentUser(UserResponse):
+    """Schema untuk /me (user yang sedang login)"""
+
+    last_login: Optional[datetime] = None
+
+
+class UserIdResult(BaseModel):
+    """Schema untuk response yang cuma return user id"""
+
+    user_id: int
+
+
+class UserStats(BaseModel):
+    """Schema untuk user statistics snapshot"""
+
+    total_users: int
+    active_users: int
+    verified_users: int
+    inactive_users: int
+    computed_at: str
+
+
+class ImportRowError(BaseModel):
+    """Error per baris di bulk import"""
+
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    """Schema untuk hasil bulk import users"""
+
+    processed: int
+    created: int
+    skipped_existing: int
+    duplicates: int
+    invalid: int
+    errors: List[ImportRowError]
+
+
 class UserInternalResponse(UserResponse):
     """Schema untuk internal user response (dengan sensitive info)"""
 
@@ -102,16 +142,55 @@ class Token(BaseModel):
     """Schema untuk JWT token response"""
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     expires_in: int
     user: UserResponse
 
 
+class TokenRefresh(BaseModel):
+    """Schema untuk refresh token response (refresh token di-rotate)"""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class TokenValidation(BaseModel):
+    """Schema untuk validate token response"""
+
+    valid: bool
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+
+
+class TokenInfo(BaseModel):
+    """Schema untuk token info (tanpa verifikasi signature)"""
+
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    token_type: Optional[str] = None
+    issued_at: Optional[str] = None
+    expires_at: Optional[str] = None
+    error: Optional[str] = None
+
+
 class TokenData(BaseModel):
     """Schema untuk token payload data"""
 
     username: Optional[str] = None
     user_id: Optional[int] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    issued_at: Optional[int] = None
+    expires_at: Optional[int] = None
+    jti: Optional[str] = None
 
 
 class PasswordReset(BaseModel):
@@ -120,6 +199,14 @@ class PasswordReset(BaseModel):
     email: EmailStr
 
 
+class PasswordResetRequested(BaseModel):
+    """Schema untuk forgot password response"""
+
+    reset_token: str
+    message: str
+    note: str
+
+
 class PasswordResetConfirm(BaseModel):
     """Schema untuk confirm password reset"""
 
@@ -1,8 +1,25 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwt
 import secrets
-
+import time
+
+import src.config.env as env
+from src.app.cache.token_cache import token_cache
+from src.app.exceptions import (
+    AccountDeactivatedError,
+    AppError,
+    AuthenticationError,
+    InvalidCredentialsError,
+    InvalidRefreshTokenError,
+    InvalidResetTokenError,
+    InvalidTokenError,
+    TokenExpiredError,
+    TokenRevokedError,
+    UserNotFoundError,
+)
+from src.app.metrics import CRYPTO_DURATION, timed
+from src.app.services.revocation_service import RevocationService
 from src.app.services.user_service import UserService
 from src.database.factories.user_factory import User
 from src.app.schemas.user_schema import UserCreate, UserResponse, Token, TokenData
@@ -20,6 +37,18 @@ class AuthService:
     """
 
     # =============== JWT Token Management ===============
+    @staticmethod
+    @timed(CRYPTO_DURATION, "jwt_encode")
+    def encode_jwt(data: dict) -> str:
+        """Sign JWT"""
+        return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+
+    @staticmethod
+    @timed(CRYPTO_DURATION, "jwt_decode")
+    def decode_jwt(token: str) -> Dict[str, Any]:
+        """Verify signature + expiry JWT dan return payload"""
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
     @staticmethod
     def create_access_token(
         data: dict, expires_delta: Optional[timedelta] = None
@@ -33,9 +62,23 @@ class AuthService:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
         to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
+        to_encode.setdefault("jti", secrets.token_urlsafe(16))  # Untuk revocation
+
+        return AuthService.encode_jwt(to_encode)
 
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+    @staticmethod
+    def create_user_access_token(user: User) -> str:
+        """Create access token dengan claims user (dipakai stateless auth)"""
+        return AuthService.create_access_token(
+            data={
+                "sub": user.username,
+                "user_id": user.id,
+                "email": user.email,
+                "is_active": user.is_active,
+                "is_verified": user.is_verified,
+            },
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
 
     @staticmethod
     def create_refresh_token(user_id: int) -> str:
@@ -48,205 +91,269 @@ class AuthService:
             "jti": secrets.token_urlsafe(32),  # JWT ID untuk invalidation
         }
 
-        return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+        return AuthService.encode_jwt(data)
 
     @staticmethod
     def verify_token(token: str) -> TokenData:
         """
         Verify JWT token dan return token data
-        Raise exception jika token invalid
+        Raise InvalidTokenError jika token invalid
         """
+        if not token:
+            raise AuthenticationError()
+
+        # Token yang sama dikirim berkali-kali selama umurnya
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = AuthService.decode_jwt(token)
 
             # Check token type
             token_type = payload.get("type", "access")
             if token_type != "access":
-                raise ValueError("Invalid token type")
+                raise InvalidTokenError("Invalid token type")
 
             # Extract user info
             username: str = payload.get("sub")
             user_id: int = payload.get("user_id")
 
             if username is None and user_id is None:
-                raise ValueError("Token missing user identification")
+                raise InvalidTokenError("Token missing user identification")
+
+            token_data = TokenData(
+                username=username,
+                user_id=user_id,
+                email=payload.get("email"),
+                is_active=payload.get("is_active"),
+                is_verified=payload.get("is_verified"),
+                issued_at=payload.get("iat"),
+                expires_at=payload.get("exp"),
+                jti=payload.get("jti"),
+            )
 
-            return TokenData(username=username, user_id=user_id)
+        except ExpiredSignatureError:
+            raise TokenExpiredError()
+        except JWTError:
+            raise InvalidTokenError()
 
-        except JWTError as e:
-            raise ValueError(f"Token validation failed: {str(e)}")
+        token_cache.set(token, token_data)
+        return token_data
 
     @staticmethod
-    def get_current_user(token: str) -> User:
-        """Get current user from JWT token"""
+    async def authenticate_token(token: str) -> TokenData:
+        """Verify token dan pastikan belum di-revoke (logout)"""
         token_data = AuthService.verify_token(token)
 
+        if await RevocationService.is_token_revoked(token_data.jti):
+            token_cache.evict(token)
+            raise TokenRevokedError()
+
+        return token_data
+
+    @staticmethod
+    async def get_current_user(token: str) -> User:
+        """Get current user from JWT token"""
+        token_data = await AuthService.authenticate_token(token)
+        return await AuthService.get_user_for_token_data(token_data)
+
+    @staticmethod
+    async def get_user_for_token_data(token_data: TokenData) -> User:
+        """
+        Lookup user dari TokenData yang sudah di-authenticate (tanpa verify
+        token lagi); InvalidTokenError / AccountDeactivatedError kalau tidak valid
+        """
         # Get user by username or user_id
         if token_data.username:
-            user = UserService.get_user_by_username(token_data.username)
+            user = await UserService.get_user_by_username(token_data.username)
         elif token_data.user_id:
-            user = UserService.get_user_by_id(token_data.user_id)
+            user = await UserService.get_user_by_id(token_data.user_id)
         else:
-            raise ValueError("Token data incomplete")
+            raise InvalidTokenError("Token data incomplete")
 
         if user is None:
-            raise ValueError("User not found")
+            raise InvalidTokenError("User not found")
 
         if not user.is_active:
-            raise ValueError("User account is deactivated")
+            raise AccountDeactivatedError()
 
         return user
 
+    @staticmethod
+    def claims_are_fresh(token_data: TokenData) -> bool:
+        """Claims bisa dipakai tanpa DB: lengkap, belum lewat max age, belum di-revoke"""
+        if token_data.user_id is None or token_data.is_active is None:
+            return False  # Token lama tanpa status claims
+
+        if token_data.issued_at is None:
+            return False
+
+        age = time.time() - token_data.issued_at
+        if age > env.AUTH_CLAIMS_MAX_AGE_SECONDS:
+            return False
+
+        return not RevocationService.are_user_claims_revoked(
+            token_data.user_id, token_data.issued_at
+        )
+
+    @staticmethod
+    async def get_current_principal(token: str) -> TokenData:
+        """
+        Get identitas user dari token
+        Kalau AUTH_STATELESS_CLAIMS aktif dan claims masih fresh, jawab langsung
+        dari signed claims; selain itu lookup ke database
+        """
+        token_data = await AuthService.authenticate_token(token)
+
+        if env.AUTH_STATELESS_CLAIMS and AuthService.claims_are_fresh(token_data):
+            if not token_data.is_active:
+                raise AccountDeactivatedError()
+            return token_data
+
+        user = await AuthService.get_user_for_token_data(token_data)
+
+        return TokenData(
+            username=user.username,
+            user_id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            issued_at=token_data.issued_at,
+        )
+
     # =============== Authentication Methods ===============
     @staticmethod
-    def register_user(user_data: UserCreate) -> Dict[str, Any]:
+    async def register_user(user_data: UserCreate) -> Dict[str, Any]:
         """
         Register new user
         Logic: Create user, generate token, return response
         """
-        try:
-            # Create user via UserService
-            user = UserService.create_user(user_data)
-
-            # Generate access token
-            access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            access_token = AuthService.create_access_token(
-                data={"sub": user.username, "user_id": user.id, "email": user.email},
-                expires_delta=access_token_expires,
-            )
+        # Create user via UserService
+        user = await UserService.create_user(user_data)
 
-            # Generate refresh token
-            refresh_token = AuthService.create_refresh_token(user.id)
+        # Generate access token
+        access_token = AuthService.create_user_access_token(user)
 
-            # Convert user to response format
-            user_response = UserResponse.model_validate(user)
+        # Generate refresh token
+        refresh_token = AuthService.create_refresh_token(user.id)
 
-            return {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_type": "bearer",
-                "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
-                "user": user_response,
-            }
+        # Convert user to response format
+        user_response = UserResponse.model_validate(user)
 
-        except ValueError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(f"Registration failed: {str(e)}")
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
+            "user": user_response,
+        }
 
     @staticmethod
-    def login_user(identifier: str, password: str) -> Dict[str, Any]:
+    async def login_user(identifier: str, password: str) -> Dict[str, Any]:
         """
         Login user dengan username/email dan password
         Logic: Authenticate, generate tokens, return response
         """
-        try:
-            # Authenticate user
-            user = UserService.authenticate_user(identifier, password)
+        # Authenticate user
+        user = await UserService.authenticate_user(identifier, password)
 
-            if not user:
-                raise ValueError("Invalid username/email or password")
-
-            # Generate access token
-            access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            access_token = AuthService.create_access_token(
-                data={"sub": user.username, "user_id": user.id, "email": user.email},
-                expires_delta=access_token_expires,
-            )
+        if not user:
+            raise InvalidCredentialsError()
 
-            # Generate refresh token
-            refresh_token = AuthService.create_refresh_token(user.id)
+        # Generate access token
+        access_token = AuthService.create_user_access_token(user)
 
-            # Convert user to response format
-            user_response = UserResponse.model_validate(user)
+        # Generate refresh token
+        refresh_token = AuthService.create_refresh_token(user.id)
 
-            return {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_type": "bearer",
-                "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
-                "user": user_response,
-            }
+        # Convert user to response format
+        user_response = UserResponse.model_validate(user)
 
-        except ValueError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(f"Login failed: {str(e)}")
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
+            "user": user_response,
+        }
 
     @staticmethod
-    def refresh_access_token(refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(refresh_token: str) -> Dict[str, Any]:
         """Refresh access token using refresh token"""
         try:
             # Decode refresh token
-            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = AuthService.decode_jwt(refresh_token)
 
             # Check token type
             if payload.get("type") != "refresh":
-                raise ValueError("Invalid token type")
+                raise InvalidRefreshTokenError("Invalid token type")
 
             user_id = payload.get("user_id")
             if not user_id:
-                raise ValueError("Invalid refresh token")
+                raise InvalidRefreshTokenError()
+
+            # Refresh token cuma bisa dipakai sekali (rotation): revoke jti lama
+            # secara atomic, cuma satu dari request concurrent yang lolos
+            jti = payload.get("jti")
+            if jti and not await RevocationService.consume_token(jti, payload["exp"]):
+                raise InvalidRefreshTokenError("Refresh token has been revoked")
 
             # Get user
-            user = UserService.get_user_by_id(user_id)
+            user = await UserService.get_user_by_id(user_id)
             if not user or not user.is_active:
-                raise ValueError("User not found or inactive")
+                raise InvalidRefreshTokenError("User not found or inactive")
 
             # Generate new access token
-            access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            access_token = AuthService.create_access_token(
-                data={"sub": user.username, "user_id": user.id, "email": user.email},
-                expires_delta=access_token_expires,
-            )
+            access_token = AuthService.create_user_access_token(user)
 
             return {
                 "access_token": access_token,
+                "refresh_token": AuthService.create_refresh_token(user.id),
                 "token_type": "bearer",
                 "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
             }
 
-        except JWTError as e:
-            raise ValueError(f"Invalid refresh token: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Token refresh failed: {str(e)}")
+        except ExpiredSignatureError:
+            raise InvalidRefreshTokenError("Refresh token has expired")
+        except JWTError:
+            raise InvalidRefreshTokenError()
 
     # =============== Token Validation ===============
     @staticmethod
-    def validate_token(token: str) -> Dict[str, Any]:
+    async def validate_token(token: str) -> Dict[str, Any]:
         """Validate token dan return user info"""
         try:
-            user = AuthService.get_current_user(token)
+            principal = await AuthService.get_current_principal(token)
 
             return {
                 "valid": True,
-                "user_id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "is_active": user.is_active,
-                "is_verified": user.is_verified,
+                "user_id": principal.user_id,
+                "username": principal.username,
+                "email": principal.email,
+                "is_active": principal.is_active,
+                "is_verified": principal.is_verified,
             }
 
-        except Exception as e:
-            return {"valid": False, "error": str(e)}
+        except AppError as e:
+            return {"valid": False, "error": e.message}
 
     # =============== Password Management ===============
     @staticmethod
-    def change_password(user_id: int, current_password: str, new_password: str) -> bool:
+    async def change_password(
+        user_id: int, current_password: str, new_password: str
+    ) -> bool:
         """Change user password"""
-        try:
-            return UserService.change_password(user_id, current_password, new_password)
-        except ValueError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(f"Password change failed: {str(e)}")
+        return await UserService.change_password(
+            user_id, current_password, new_password
+        )
 
     @staticmethod
-    def generate_password_reset_token(email: str) -> str:
+    async def generate_password_reset_token(email: str) -> str:
         """Generate password reset token"""
-        user = UserService.get_user_by_email(email)
+        user = await UserService.get_user_by_email(email)
         if not user:
-            raise ValueError("User with this email not found")
+            raise UserNotFoundError()
 
         # Generate reset token with short expiry
         data = {
@@ -258,42 +365,61 @@ class AuthService:
             "jti": secrets.token_urlsafe(32),
         }
 
-        return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+        return AuthService.encode_jwt(data)
 
     @staticmethod
-    def reset_password_with_token(reset_token: str, new_password: str) -> bool:
+    async def reset_password_with_token(reset_token: str, new_password: str) -> bool:
         """Reset password using reset token"""
         try:
             # Decode reset token
-            payload = jwt.decode(reset_token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = AuthService.decode_jwt(reset_token)
 
             # Check token type
             if payload.get("type") != "password_reset":
-                raise ValueError("Invalid token type")
+                raise InvalidResetTokenError()
 
             user_id = payload.get("user_id")
             if not user_id:
-                raise ValueError("Invalid reset token")
+                raise InvalidResetTokenError()
 
-            # Get user and update password
-            user = UserService.get_user_by_id(user_id)
-            if not user:
-                raise ValueError("User not found")
+            # Reset token cuma bisa dipakai sekali (atomic, sama seperti refresh)
+            jti = payload.get("jti")
+            if jti and not await RevocationService.consume_token(jti, payload["exp"]):
+                raise InvalidResetTokenError()
 
             # Hash and update password
-            hashed_password = UserService.hash_password(new_password)
-
-            with UserService.get_db() as db:
-                db_user = db.query(User).filter(User.id == user_id).first()
-                db_user.password = hashed_password
-                db.commit()
+            if not await UserService.set_password(user_id, new_password):
+                raise InvalidResetTokenError()
 
             return True
 
-        except JWTError as e:
-            raise ValueError(f"Invalid reset token: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Password reset failed: {str(e)}")
+        except JWTError:
+            raise InvalidResetTokenError()
+
+    @staticmethod
+    async def logout(token: str, refresh_token: Optional[str] = None) -> TokenData:
+        """Revoke access token (dan refresh token kalau dikirim) sampai expired"""
+        token_data = await AuthService.authenticate_token(token)
+
+        if token_data.jti and token_data.expires_at:
+            await RevocationService.revoke_token(token_data.jti, token_data.expires_at)
+        token_cache.evict(token)
+
+        if refresh_token:
+            try:
+                payload = AuthService.decode_jwt(refresh_token)
+            except JWTError:
+                payload = {}
+
+            # Refresh token harus milik user yang sama
+            if (
+                payload.get("type") == "refresh"
+                and payload.get("jti")
+                and payload.get("user_id") == token_data.user_id
+            ):
+                await RevocationService.revoke_token(payload["jti"], payload["exp"])
+
+        return token_data
 
     # =============== Utility Methods ===============
     @staticmethod
@@ -319,7 +445,7 @@ class AuthService:
     def is_token_expired(token: str) -> bool:
         """Check if token is expired"""
         try:
-            jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            AuthService.decode_jwt(token)
             return False
         except jwt.ExpiredSignatureError:
             return True
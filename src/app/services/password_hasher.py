@@ -0,0 +1,200 @@
+import asyncio
+import functools
+import logging
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from passlib.context import CryptContext
+
+import src.config.env as env
+from src.app.exceptions import ServiceBusyError
+from src.app.metrics import CRYPTO_DURATION, timed
+
+logger = logging.getLogger(__name__)
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@functools.lru_cache(maxsize=None)
+def _bcrypt(rounds: int):
+    """Handler bcrypt dengan cost tertentu (di-cache per process)"""
+    return pwd_context.handler("bcrypt").using(rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    """Dijalankan di worker pool (harus module-level supaya bisa di-pickle)"""
+    return _bcrypt(rounds).hash(password)
+
+
+def _timed_hash(rounds: int) -> float:
+    """Durasi (detik) satu hash dengan cost `rounds`, untuk kalibrasi"""
+    start = time.perf_counter()
+    _hash("calibration", rounds)
+    return time.perf_counter() - start
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Dijalankan di worker pool (harus module-level supaya bisa di-pickle)"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasherBusyError(ServiceBusyError):
+    """Raised ketika antrian hashing penuh (503 + Retry-After)"""
+
+    message = "Password hashing is saturated, retry later"
+
+
+class PasswordHasher:
+    """
+    Password Hasher - bcrypt hash/verify di bounded executor pool
+    Event loop tidak pernah jalanin bcrypt langsung; kalau antrian penuh
+    langsung fail fast dengan PasswordHasherBusyError
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        rounds: int = 12,
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor_type}")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers or env.CPU_COUNT
+        self.max_queue = self.max_workers * 4 if max_queue is None else max_queue
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+
+    @property
+    def capacity(self) -> int:
+        """Jumlah maksimal job (running + queued) sebelum reject"""
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        # Dibuat lazy supaya process pool tidak di-fork saat import
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pwd-hash"
+                )
+        return self._executor
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise PasswordHasherBusyError()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    @timed(CRYPTO_DURATION, "bcrypt_hash")
+    async def hash(self, password: str) -> str:
+        """Hash password dengan bcrypt di worker pool"""
+        return await self._submit(_hash, password, self.rounds)
+
+    @timed(CRYPTO_DURATION, "bcrypt_verify")
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password against hash di worker pool"""
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Bulk hash (import user) paralel di semua worker
+        Tidak fail fast - nunggu giliran, tapi in-flight dibatasi max_workers
+        supaya request login/register tetap dapat slot di antrian
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(password: str) -> str:
+            async with semaphore:
+                self._pending += 1
+                try:
+                    with CRYPTO_DURATION.time("bcrypt_hash"):
+                        return await loop.run_in_executor(
+                            executor, _hash, password, self.rounds
+                        )
+                finally:
+                    self._pending -= 1
+                    self._completed += 1
+
+        return list(await asyncio.gather(*(run(password) for password in passwords)))
+
+    async def calibrate(
+        self, target_ms: Optional[float] = None, min_rounds: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Warmup: start semua worker (thread / process) dan load backend bcrypt
+        Kalau target_ms di-set, pilih cost tertinggi di [min_rounds, rounds]
+        yang hash-nya masih <= target_ms (tiap +1 round = 2x lebih lama)
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        # Satu hash murah per worker supaya semua worker sudah jalan
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _hash, "warmup", 4)
+                for _ in range(self.max_workers)
+            )
+        )
+
+        if target_ms:
+            base_ms = await loop.run_in_executor(executor, _timed_hash, min_rounds)
+            base_ms *= 1000
+            extra = math.floor(math.log2(target_ms / base_ms)) if base_ms > 0 else 0
+            self.rounds = max(min_rounds, min(self.rounds, min_rounds + extra))
+
+        hash_ms = await loop.run_in_executor(executor, _timed_hash, self.rounds) * 1000
+        if target_ms and hash_ms > target_ms:
+            logger.warning(
+                "bcrypt hash takes %.1fms at minimum cost %s (target %sms)",
+                hash_ms,
+                self.rounds,
+                target_ms,
+            )
+
+        return {"rounds": self.rounds, "hash_ms": round(hash_ms, 1)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot kondisi pool untuk monitoring"""
+        return {
+            "executor": self.executor_type,
+            "rounds": self.rounds,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Shutdown executor (dipanggil saat app shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Password hasher pool shut down")
+
+
+password_hasher = PasswordHasher(
+    executor_type=env.PASSWORD_HASH_EXECUTOR,
+    max_workers=env.PASSWORD_HASH_WORKERS,
+    max_queue=env.PASSWORD_HASH_MAX_QUEUE,
+    rounds=env.PASSWORD_HASH_ROUNDS,
+)
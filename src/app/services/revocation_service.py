@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import src.config.env as env
+from src.app.cache.backend import cache_backend, cache_key
+from src.app.cache.base import CacheBackend
+from src.app.cache.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationService:
+    """
+    Revocation Service - token revocation by jti dan user claims revocation
+    - Token (logout, refresh rotation, reset token sekali pakai) disimpan
+      by jti di cache backend dengan TTL sampai token expired. Bloom filter
+      lokal di depan store: token yang tidak pernah di-revoke tidak perlu
+      round trip ke store
+    - User claims: token yang di-issue sebelum perubahan user (password,
+      status, delete) harus dicek ulang ke database (stateless auth)
+    Kalau backend shared, revocation di-replicate ke worker lain lewat
+    pub/sub dan di-load waktu startup
+    """
+
+    backend: CacheBackend = cache_backend
+
+    # user_id -> timestamp terakhir claims user di-revoke
+    _user_revoked_at: Dict[int, float] = {}
+
+    # Prefilter untuk jti yang pernah di-revoke (di worker ini atau lewat pub/sub)
+    # Bloom filter tidak bisa delete: di-build ulang dari store secara berkala
+    # supaya jti yang sudah expired keluar dan filter tidak saturated
+    _bloom = BloomFilter(
+        capacity=env.REVOCATION_BLOOM_CAPACITY,
+        error_rate=env.REVOCATION_BLOOM_ERROR_RATE,
+    )
+    _bloom_saturated_logged = False
+    _bloom_rebuild_at = time.monotonic() + env.REVOCATION_BLOOM_REBUILD_SECONDS
+    _bloom_rebuild_task: Optional[asyncio.Task] = None
+    # jti yang di-add selama rebuild (scan async), ikut dimasukkan ke filter baru
+    _bloom_pending: Optional[List[str]] = None
+
+    @classmethod
+    def _user_channel(cls) -> str:
+        return cache_key("revocation", "user")
+
+    @classmethod
+    def _token_channel(cls) -> str:
+        return cache_key("revocation", "token")
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load revocation yang masih berlaku dan subscribe update dari worker lain"""
+        if not cls.backend.shared:
+            return
+
+        prefix = cache_key("revoked", "user", "")
+        for key, value in (await cls.backend.scan(prefix)).items():
+            cls._record(int(key[len(prefix) :]), float(value))
+
+        await cls.rebuild_bloom()
+
+        await cls.backend.subscribe(cls._user_channel(), cls._on_user_revoked)
+        await cls.backend.subscribe(cls._token_channel(), cls._bloom_add)
+
+    @classmethod
+    def _on_user_revoked(cls, message: str) -> None:
+        user_id, revoked_at = message.split(":", 1)
+        cls._record(int(user_id), float(revoked_at))
+
+    @classmethod
+    def _record(cls, user_id: int, revoked_at: float) -> None:
+        if revoked_at > cls._user_revoked_at.get(user_id, 0.0):
+            cls._user_revoked_at[user_id] = revoked_at
+
+    @classmethod
+    async def revoke_user_claims(cls, user_id: int, at: Optional[float] = None) -> None:
+        """Tandai semua claims user yang di-issue sebelum sekarang sebagai stale"""
+        cls._prune()
+        revoked_at = at if at is not None else time.time()
+        cls._record(user_id, revoked_at)
+
+        if cls.backend.shared:
+            await cls.backend.set(
+                cache_key("revoked", "user", user_id),
+                str(revoked_at).encode(),
+                ttl=env.AUTH_CLAIMS_MAX_AGE_SECONDS,
+            )
+            await cls.backend.publish(cls._user_channel(), f"{user_id}:{revoked_at}")
+
+    @classmethod
+    def are_user_claims_revoked(cls, user_id: int, issued_at: Optional[int]) -> bool:
+        """Check apakah token dengan iat ini di-issue sebelum user di-revoke"""
+        revoked_at = cls._user_revoked_at.get(user_id)
+        if revoked_at is None:
+            return False
+        if issued_at is None:
+            return True
+        return issued_at < revoked_at
+
+    @classmethod
+    def _prune(cls) -> None:
+        # Claims lebih tua dari max age selalu dicek ke database, jadi entry
+        # yang lebih tua dari itu sudah tidak relevan
+        cutoff = time.time() - env.AUTH_CLAIMS_MAX_AGE_SECONDS
+        expired = [uid for uid, ts in cls._user_revoked_at.items() if ts < cutoff]
+        for uid in expired:
+            del cls._user_revoked_at[uid]
+
+    # =============== Token Revocation (jti) ===============
+    @classmethod
+    async def revoke_token(cls, jti: str, expires_at: float) -> None:
+        """Revoke token by jti sampai token expired (exp)"""
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return  # Sudah expired, tidak perlu disimpan
+
+        await cls.backend.set(cache_key("revoked", "jti", jti), b"1", ttl=ttl)
+        cls._bloom_add(jti)
+
+        if cls.backend.shared:
+            await cls.backend.publish(cls._token_channel(), jti)
+
+    @classmethod
+    async def consume_token(cls, jti: str, expires_at: float) -> bool:
+        """
+        Revoke token sekali pakai secara atomic (SET NX): True untuk caller
+        pertama, False kalau jti sudah di-revoke / dipakai request lain
+        """
+        # Token baru saja lolos cek exp: TTL minimal 1 detik supaya tetap tercatat
+        ttl = max(expires_at - time.time(), 1.0)
+        if not await cls.backend.set_if_absent(
+            cache_key("revoked", "jti", jti), b"1", ttl=ttl
+        ):
+            return False
+
+        cls._bloom_add(jti)
+        if cls.backend.shared:
+            await cls.backend.publish(cls._token_channel(), jti)
+        return True
+
+    @classmethod
+    async def is_token_revoked(cls, jti: Optional[str]) -> bool:
+        """Check revocation; kebanyakan token berhenti di bloom filter"""
+        if jti is None:
+            return False
+
+        if cls._bloom.saturated:
+            if not cls._bloom_saturated_logged:
+                logger.warning("Revocation bloom filter saturated, rebuilding")
+                cls._bloom_saturated_logged = True
+                cls._bloom_rebuild_at = time.monotonic()
+        cls._maybe_rebuild_bloom()
+
+        if not cls._bloom.saturated and jti not in cls._bloom:
+            return False
+
+        return await cls.backend.get(cache_key("revoked", "jti", jti)) is not None
+
+    # =============== Bloom Filter Rebuild ===============
+    @classmethod
+    def _bloom_add(cls, jti: str) -> None:
+        cls._bloom.add(jti)
+        if cls._bloom_pending is not None:
+            cls._bloom_pending.append(jti)
+
+    @classmethod
+    async def rebuild_bloom(cls) -> int:
+        """
+        Build bloom filter baru dari key revoked:jti:* yang masih hidup dan swap
+        Capacity minimal 2x jumlah jti hidup supaya tidak langsung saturated
+        """
+        cls._bloom_rebuild_at = time.monotonic() + env.REVOCATION_BLOOM_REBUILD_SECONDS
+        cls._bloom_pending = []
+        try:
+            prefix = cache_key("revoked", "jti", "")
+            jtis = [key[len(prefix) :] for key in await cls.backend.scan(prefix)]
+            jtis.extend(cls._bloom_pending)
+        finally:
+            cls._bloom_pending = None
+
+        bloom = BloomFilter(
+            capacity=max(env.REVOCATION_BLOOM_CAPACITY, 2 * len(jtis)),
+            error_rate=env.REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti in jtis:
+            bloom.add(jti)
+
+        cls._bloom = bloom
+        cls._bloom_saturated_logged = False
+        return len(jtis)
+
+    @classmethod
+    def _maybe_rebuild_bloom(cls) -> None:
+        """Jadwalkan rebuild di background kalau sudah waktunya (hot path: cek murah)"""
+        if time.monotonic() < cls._bloom_rebuild_at:
+            return
+        if cls._bloom_rebuild_task is not None and not cls._bloom_rebuild_task.done():
+            return
+        cls._bloom_rebuild_task = asyncio.create_task(cls._rebuild_bloom_logged())
+
+    @classmethod
+    async def _rebuild_bloom_logged(cls) -> None:
+        try:
+            count = await cls.rebuild_bloom()
+            logger.info("Revocation bloom filter rebuilt with %s live jti", count)
+        except Exception:
+            logger.exception("Revocation bloom filter rebuild failed")
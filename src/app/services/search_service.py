@@ -0,0 +1,95 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, Select, and_, case, cast, func, literal, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.database.factories.user_factory import User
+
+# Batas atas untuk prefix range (lower(x) >= q AND lower(x) < q + MAX_CHAR)
+MAX_CHAR = "\U0010ffff"
+
+
+class SearchService:
+    """
+    Search Service - query builder untuk user search
+    PostgreSQL: substring match (ILIKE) di-backup trigram GIN index (pg_trgm),
+    ranking pakai similarity(). Dialect lain (SQLite): prefix match lewat
+    btree / expression index, ranking exact > username > full_name/email
+    """
+
+    @staticmethod
+    def escape_like(value: str) -> str:
+        """Escape wildcard LIKE supaya input user dianggap literal"""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def user_search(
+        query: str, dialect_name: str
+    ) -> Tuple[ColumnElement[bool], ColumnElement[float]]:
+        """Return (filter, rank) untuk search users"""
+        term = query.strip().lower()
+
+        if dialect_name == "postgresql":
+            return SearchService._trigram_search(term)
+        return SearchService._prefix_search(term)
+
+    @staticmethod
+    def _trigram_search(term: str):
+        pattern = f"%{SearchService.escape_like(term)}%"
+        columns = (User.username, User.email, User.full_name)
+
+        search_filter = or_(*(column.ilike(pattern, escape="\\") for column in columns))
+        # float8 supaya rank di cursor round trip persis (bukan numeric/real)
+        rank = cast(
+            func.greatest(
+                *(func.coalesce(func.similarity(column, term), 0) for column in columns)
+            ),
+            Float,
+        )
+        return search_filter, rank
+
+    @staticmethod
+    def _prefix_search(term: str):
+        # username/email disimpan lowercase; full_name pakai index lower(full_name)
+        full_name = func.lower(User.full_name)
+        upper = term + MAX_CHAR
+
+        def prefix(column):
+            return and_(column >= term, column < upper)
+
+        search_filter = or_(
+            prefix(User.username), prefix(User.email), prefix(full_name)
+        )
+        rank = case(
+            (or_(User.username == term, User.email == term), literal(1.0)),
+            (prefix(User.username), literal(0.75)),
+            (prefix(full_name), literal(0.5)),
+            else_=literal(0.25),
+        )
+        return search_filter, rank
+
+    @staticmethod
+    def ranked_user_search(
+        query: str,
+        dialect_name: str,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Select:
+        """
+        Select (User, rank) urut relevance lalu id
+        `after` = (rank, id) row terakhir page sebelumnya (keyset)
+        """
+        search_filter, rank = SearchService.user_search(query, dialect_name)
+        rank = rank.label("search_rank")
+
+        stmt = select(User, rank).where(search_filter).where(User.is_active == True)
+
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(
+                or_(
+                    rank.element < after_rank,
+                    and_(rank.element == after_rank, User.id > after_id),
+                )
+            )
+
+        return stmt.order_by(rank.desc(), User.id)
@@ -1,6 +1,8 @@
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+import asyncio
+import json
+from typing import AsyncIterator, Optional, List, Tuple
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from src.database.factories.user_factory import User
@@ -10,80 +12,131 @@ from src.app.schemas.user_schema import (
     UserResponse,
     UserProfile,
 )
-from src.database.session import get_db
+import src.config.env as env
+from src.app.cache.backend import cache_backend, cache_key
+from src.app.cache.user_cache import user_cache
+from src.app.exceptions import (
+    AccountDeactivatedError,
+    ConflictError,
+    IncorrectPasswordError,
+)
+from src.app.metrics import instrument
+from src.app.services.password_hasher import password_hasher
+from src.app.services.revocation_service import RevocationService
+from src.app.services.search_service import SearchService
+from src.database.query import count_rows
+from src.database.session import (
+    AsyncSessionLocal,
+    get_async_db,
+    release_connection,
+)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Unique column -> error message untuk registration conflict
+UNIQUE_VIOLATION_MESSAGES = {
+    "email": "Email already registered",
+    "username": "Username already taken",
+}
+
+# Serialize refresh stats snapshot dalam satu worker
+_stats_lock = asyncio.Lock()
 
 
 class UserService:
     """
     User Service - Semua business logic untuk User ada disini
     Controller cuma call methods dari service ini
+    Semua query async (AsyncSession) supaya tidak block event loop
     """
 
     # =============== Password Utilities ===============
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash password dengan bcrypt"""
-        return pwd_context.hash(password)
+    async def hash_password(password: str) -> str:
+        """Hash password dengan bcrypt (di password hasher pool)"""
+        return await password_hasher.hash(password)
+
+    @staticmethod
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify password against hash (di password hasher pool)"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+    @instrument("UserService")
+    async def get_password_hash(user_id: int) -> Optional[str]:
+        """
+        Password hash langsung dari database (tidak pernah lewat user cache)
+        None kalau user sudah tidak ada
+        """
+        async with get_async_db() as db:
+            return await db.scalar(select(User.password).where(User.id == user_id))
 
     # =============== User Queries ===============
     @staticmethod
-    def get_user_by_id(user_id: int) -> Optional[User]:
+    @instrument("UserService")
+    async def get_user_by_id(user_id: int) -> Optional[User]:
         """Get user by ID"""
-        with get_db() as db:
-            return db.query(User).filter(User.id == user_id).first()
+        cached = await user_cache.get_by_id(user_id)
+        if cached is not None:
+            return cached
+
+        async with get_async_db() as db:
+            return await user_cache.set(await db.get(User, user_id))
 
     @staticmethod
-    def get_user_by_email(email: str) -> Optional[User]:
+    @instrument("UserService")
+    async def get_user_by_email(email: str) -> Optional[User]:
         """Get user by email address"""
-        with get_db() as db:
-            return db.query(User).filter(User.email == email.lower()).first()
+        cached = await user_cache.get_by_field("email", email.lower())
+        if cached is not None:
+            return cached
+
+        async with get_async_db() as db:
+            result = await db.execute(select(User).where(User.email == email.lower()))
+            return await user_cache.set(result.scalars().first())
 
     @staticmethod
-    def get_user_by_username(username: str) -> Optional[User]:
+    @instrument("UserService")
+    async def get_user_by_username(username: str) -> Optional[User]:
         """Get user by username"""
-        with get_db() as db:
-            return db.query(User).filter(User.username == username.lower()).first()
+        cached = await user_cache.get_by_field("username", username.lower())
+        if cached is not None:
+            return cached
+
+        async with get_async_db() as db:
+            result = await db.execute(
+                select(User).where(User.username == username.lower())
+            )
+            return await user_cache.set(result.scalars().first())
 
     @staticmethod
-    def get_user_by_username_or_email(identifier: str) -> Optional[User]:
+    @instrument("UserService")
+    async def get_user_by_username_or_email(identifier: str) -> Optional[User]:
         """Get user by username or email (untuk login)"""
-        with get_db() as db:
-            return (
-                db.query(User)
-                .filter(
+        cached = await user_cache.get_by_identifier(identifier.lower())
+        if cached is not None:
+            return cached
+
+        async with get_async_db() as db:
+            result = await db.execute(
+                select(User).where(
                     (User.username == identifier.lower())
                     | (User.email == identifier.lower())
                 )
-                .first()
             )
+            return await user_cache.set(result.scalars().first())
 
     # =============== User CRUD Operations ===============
     @staticmethod
-    def create_user(user_data: UserCreate) -> User:
+    @instrument("UserService")
+    async def create_user(user_data: UserCreate) -> User:
         """
         Create new user
-        Logic: Hash password, check duplicates, create user
+        Logic: Hash password, insert, map unique constraint violation ke error
         """
-        with get_db() as db:
-            # Check if email already exists
-            if UserService.get_user_by_email(user_data.email):
-                raise ValueError("Email already registered")
-
-            # Check if username already exists
-            if UserService.get_user_by_username(user_data.username):
-                raise ValueError("Username already taken")
-
-            # Hash password
-            hashed_password = UserService.hash_password(user_data.password)
+        # Hash password (di luar session supaya connection tidak ditahan selama bcrypt)
+        await release_connection()
+        hashed_password = await UserService.hash_password(user_data.password)
 
+        async with get_async_db() as db:
             # Create user object
             db_user = User(
                 email=user_data.email.lower(),
@@ -97,31 +150,63 @@ class UserService:
             )
 
             db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
+
+            # Duplicate email/username dideteksi dari unique constraint (satu INSERT)
+            try:
+                await db.commit()
+            except IntegrityError as e:
+                await db.rollback()
+                message = UserService.get_unique_violation_message(e)
+                if message is None:
+                    raise
+                raise ConflictError(message) from e
 
             return db_user
 
     @staticmethod
-    def update_user(user_id: int, user_data: UserUpdate) -> Optional[User]:
+    def get_unique_violation_message(error: IntegrityError) -> Optional[str]:
+        """Map unique constraint violation di users.email / users.username ke error message"""
+        orig = error.orig
+        cause = getattr(orig, "__cause__", None)  # asyncpg exception
+        diag = getattr(orig, "diag", None)  # psycopg2 diagnostics
+
+        # PostgreSQL kasih nama constraint (ix_users_email), SQLite cuma message
+        # "UNIQUE constraint failed: users.email"
+        detail = (
+            getattr(cause, "constraint_name", None)
+            or getattr(diag, "constraint_name", None)
+            or str(orig)
+        ).lower()
+
+        for field, message in UNIQUE_VIOLATION_MESSAGES.items():
+            if field in detail:
+                return message
+
+        return None
+
+    @staticmethod
+    @instrument("UserService")
+    async def update_user(user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update existing user"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return None
 
             # Check for email conflicts
             if user_data.email and user_data.email.lower() != db_user.email:
-                existing_user = UserService.get_user_by_email(user_data.email)
+                existing_user = await UserService.get_user_by_email(user_data.email)
                 if existing_user and existing_user.id != user_id:
-                    raise ValueError("Email already registered by another user")
+                    raise ConflictError("Email already registered by another user")
 
             # Check for username conflicts
             if user_data.username and user_data.username.lower() != db_user.username:
-                existing_user = UserService.get_user_by_username(user_data.username)
+                existing_user = await UserService.get_user_by_username(
+                    user_data.username
+                )
                 if existing_user and existing_user.id != user_id:
-                    raise ValueError("Username already taken by another user")
+                    raise ConflictError("Username already taken by another user")
 
             # Update fields
             update_data = user_data.model_dump(exclude_unset=True)
@@ -130,124 +215,208 @@ class UserService:
                     value = value.lower()
                 setattr(db_user, field, value)
 
-            db.commit()
-            db.refresh(db_user)
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return db_user
 
     @staticmethod
-    def delete_user(user_id: int) -> bool:
+    @instrument("UserService")
+    async def delete_user(user_id: int) -> bool:
         """Delete user (soft delete by setting is_active = False)"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
             # Soft delete
             db_user.is_active = False
-            db.commit()
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     @staticmethod
-    def hard_delete_user(user_id: int) -> bool:
+    @instrument("UserService")
+    async def hard_delete_user(user_id: int) -> bool:
         """Hard delete user (permanent)"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
-            db.delete(db_user)
-            db.commit()
+            await db.delete(db_user)
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     # =============== User Lists & Search ===============
     @staticmethod
-    def get_users(
+    @instrument("UserService")
+    async def get_users(
         skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
     ) -> List[User]:
         """Get users list dengan filter"""
-        with get_db() as db:
-            query = db.query(User)
+        async with get_async_db() as db:
+            query = select(User)
 
             if is_active is not None:
-                query = query.filter(User.is_active == is_active)
+                query = query.where(User.is_active == is_active)
 
-            return query.offset(skip).limit(limit).all()
+            result = await db.execute(query.offset(skip).limit(limit))
+            return list(result.scalars().all())
 
     @staticmethod
-    def get_users_paginated(
-        skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
-    ) -> Tuple[List[User], int]:
-        """Get users with total count for pagination"""
-        with get_db() as db:
-            query = db.query(User)
+    @instrument("UserService")
+    async def get_users_paginated(
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        after: Optional[int] = None,
+        total: str = "exact",
+    ) -> Tuple[List[User], Optional[int]]:
+        """
+        Get users untuk pagination, urut by id
+        `after` = id terakhir page sebelumnya (keyset, tidak scan offset);
+        `total` = exact | estimate | none
+        """
+        async with get_async_db() as db:
+            query = select(User)
 
             if is_active is not None:
-                query = query.filter(User.is_active == is_active)
+                query = query.where(User.is_active == is_active)
+
+            count = await count_rows(db, query, total)
 
-            total = query.count()
-            users = query.offset(skip).limit(limit).all()
+            if after is not None:
+                query = query.where(User.id > after)
+            else:
+                query = query.offset(skip)
 
-            return users, total
+            result = await db.execute(query.order_by(User.id).limit(limit))
+            return list(result.scalars().all()), count
 
     @staticmethod
-    def search_users(
-        query: str, skip: int = 0, limit: int = 50
-    ) -> Tuple[List[User], int]:
-        """Search users by username, email, or full_name"""
-        with get_db() as db:
-            search_filter = f"%{query.lower()}%"
-
-            db_query = (
-                db.query(User)
-                .filter(
-                    (User.username.ilike(search_filter))
-                    | (User.email.ilike(search_filter))
-                    | (User.full_name.ilike(search_filter))
-                )
-                .filter(User.is_active == True)
+    async def stream_users(
+        is_active: Optional[bool] = None,
+        after: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[List[User]]:
+        """
+        Stream users per chunk dari server-side cursor (yield_per), urut by id
+        Pakai session sendiri: dikonsumsi StreamingResponse setelah handler
+        selesai. Memory konstan berapapun jumlah row
+        """
+        query = select(User).order_by(User.id)
+
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+        if after is not None:
+            query = query.where(User.id > after)
+
+        chunk_size = chunk_size or env.USER_EXPORT_CHUNK_SIZE
+        query = query.execution_options(yield_per=chunk_size)
+
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(query)
+
+            async for users in result.partitions():
+                yield users
+
+                # Lepas object dari identity map supaya memory tetap konstan
+                # (expunge per object; expunge_all mengganti identity map yang
+                # masih dipakai result stream)
+                for user in users:
+                    db.expunge(user)
+
+    @staticmethod
+    @instrument("UserService")
+    async def search_users(
+        query: str,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Tuple[float, int]] = None,
+        total: str = "exact",
+    ) -> Tuple[List[User], Optional[int]]:
+        """
+        Search users by username, email, or full_name, urut relevance
+        Tiap user dapat attribute `search_rank`; `after` = (search_rank, id)
+        row terakhir page sebelumnya
+        """
+        async with get_async_db() as db:
+            dialect_name = db.bind.dialect.name
+            search_filter, _ = SearchService.user_search(query, dialect_name)
+
+            count = await count_rows(
+                db,
+                select(User.id).where(search_filter).where(User.is_active == True),
+                total,
+            )
+
+            db_query = SearchService.ranked_user_search(
+                query, dialect_name, after=tuple(after) if after else None
             )
+            if after is None:
+                db_query = db_query.offset(skip)
 
-            total = db_query.count()
-            users = db_query.offset(skip).limit(limit).all()
+            users = []
+            for user, rank in (await db.execute(db_query.limit(limit))).all():
+                user.search_rank = rank
+                users.append(user)
 
-            return users, total
+            return users, count
 
     # =============== Authentication Logic ===============
     @staticmethod
-    def authenticate_user(identifier: str, password: str) -> Optional[User]:
+    @instrument("UserService")
+    async def authenticate_user(identifier: str, password: str) -> Optional[User]:
         """
         Authenticate user dengan username/email dan password
         Logic: Find user, verify password, update last_login
         """
-        user = UserService.get_user_by_username_or_email(identifier)
+        user = await UserService.get_user_by_username_or_email(identifier)
 
         if not user:
             return None
 
         if not user.is_active:
-            raise ValueError("Account is deactivated")
+            raise AccountDeactivatedError()
+
+        # Hash tidak ikut di-cache; user dari cache bisa saja sudah dihapus
+        hashed_password = await UserService.get_password_hash(user.id)
+        if hashed_password is None:
+            return None
+
+        # Lepas connection request session selama bcrypt verify
+        await release_connection()
 
-        if not UserService.verify_password(password, user.password):
+        if not await UserService.verify_password(password, hashed_password):
             return None
 
-        # Update last login
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user.id).first()
+        # Update last login (write-through ke cache)
+        async with get_async_db() as db:
+            db_user = await db.get(User, user.id)
+            # User bisa dihapus selama bcrypt verify
+            if db_user is None:
+                return None
+
             db_user.last_login = datetime.now()
-            db.commit()
+            await db.commit()
 
-        return user
+        return await user_cache.set(db_user)
 
     # =============== User Profile & Public Info ===============
     @staticmethod
-    def get_user_profile(user_id: int) -> Optional[UserProfile]:
+    @instrument("UserService")
+    async def get_user_profile(user_id: int) -> Optional[UserProfile]:
         """Get public user profile"""
-        user = UserService.get_user_by_id(user_id)
+        user = await UserService.get_user_by_id(user_id)
 
         if not user or not user.is_active:
             return None
@@ -263,85 +432,166 @@ class UserService:
 
     # =============== User Status Management ===============
     @staticmethod
-    def activate_user(user_id: int) -> bool:
+    @instrument("UserService")
+    async def activate_user(user_id: int) -> bool:
         """Activate user account"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
             db_user.is_active = True
-            db.commit()
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     @staticmethod
-    def deactivate_user(user_id: int) -> bool:
+    @instrument("UserService")
+    async def deactivate_user(user_id: int) -> bool:
         """Deactivate user account"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
             db_user.is_active = False
-            db.commit()
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     @staticmethod
-    def verify_user(user_id: int) -> bool:
+    @instrument("UserService")
+    async def verify_user(user_id: int) -> bool:
         """Mark user as verified"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
             db_user.is_verified = True
-            db.commit()
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     # =============== Password Management ===============
     @staticmethod
-    def change_password(user_id: int, current_password: str, new_password: str) -> bool:
+    @instrument("UserService")
+    async def change_password(
+        user_id: int, current_password: str, new_password: str
+    ) -> bool:
         """Change user password"""
-        with get_db() as db:
-            db_user = db.query(User).filter(User.id == user_id).first()
+        current_hashed = await UserService.get_password_hash(user_id)
+        if current_hashed is None:
+            return False
+
+        # Selesaikan transaksi read supaya connection tidak ditahan selama bcrypt
+        await release_connection()
+
+        # Verify current password & hash new password (tanpa connection)
+        if not await UserService.verify_password(current_password, current_hashed):
+            raise IncorrectPasswordError()
+
+        new_hashed = await UserService.hash_password(new_password)
+
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
 
             if not db_user:
                 return False
 
-            # Verify current password
-            if not UserService.verify_password(current_password, db_user.password):
-                raise ValueError("Current password is incorrect")
+            db_user.password = new_hashed
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
+
+            return True
+
+    @staticmethod
+    @instrument("UserService")
+    async def set_password(user_id: int, new_password: str) -> bool:
+        """Set password tanpa cek password lama (untuk reset password)"""
+        # Hash dulu, connection request session dilepas selama bcrypt
+        await release_connection()
+        new_hashed = await UserService.hash_password(new_password)
+
+        async with get_async_db() as db:
+            db_user = await db.get(User, user_id)
+
+            if not db_user:
+                return False
 
-            # Hash new password
-            new_hashed = UserService.hash_password(new_password)
             db_user.password = new_hashed
-            db.commit()
+            await db.commit()
+            await RevocationService.revoke_user_claims(user_id)
+            await user_cache.invalidate(user_id)
 
             return True
 
     # =============== Utility Methods ===============
     @staticmethod
-    def user_exists(identifier: str) -> bool:
+    @instrument("UserService")
+    async def user_exists(identifier: str) -> bool:
         """Check if user exists by username or email"""
-        return UserService.get_user_by_username_or_email(identifier) is not None
+        return await UserService.get_user_by_username_or_email(identifier) is not None
 
     @staticmethod
-    def get_user_stats() -> dict:
-        """Get user statistics"""
-        with get_db() as db:
-            total_users = db.query(User).count()
-            active_users = db.query(User).filter(User.is_active == True).count()
-            verified_users = db.query(User).filter(User.is_verified == True).count()
+    @instrument("UserService")
+    async def get_user_stats(fresh: bool = False) -> dict:
+        """
+        Get user statistics dari snapshot (di-refresh tiap USER_STATS_TTL_SECONDS)
+        Dashboard yang polling tidak scan tabel users tiap request
+        """
+        key = cache_key("stats", "users")
+
+        if not fresh:
+            cached = await cache_backend.get(key)
+            if cached is not None:
+                return json.loads(cached)
+
+        # Satu query per worker waktu snapshot expired, caller lain nunggu
+        async with _stats_lock:
+            if not fresh:
+                cached = await cache_backend.get(key)
+                if cached is not None:
+                    return json.loads(cached)
+
+            stats = await UserService.compute_user_stats()
+            await cache_backend.set(
+                key, json.dumps(stats).encode(), ttl=env.USER_STATS_TTL_SECONDS
+            )
+            return stats
+
+    @staticmethod
+    @instrument("UserService")
+    async def compute_user_stats() -> dict:
+        """Hitung user statistics dalam satu aggregate query"""
+
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        async with get_async_db() as db:
+            result = await db.execute(
+                select(
+                    func.count().label("total_users"),
+                    count_where(User.is_active == True).label("active_users"),
+                    count_where(User.is_verified == True).label("verified_users"),
+                )
+            )
+            row = result.one()
 
             return {
-                "total_users": total_users,
-                "active_users": active_users,
-                "verified_users": verified_users,
-                "inactive_users": total_users - active_users,
+                "total_users": row.total_users,
+                "active_users": row.active_users,
+                "verified_users": row.verified_users,
+                "inactive_users": row.total_users - row.active_users,
+                "computed_at": datetime.now().isoformat(),
             }
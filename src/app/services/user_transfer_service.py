@@ -0,0 +1,232 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+import src.config.env as env
+from src.app.exceptions import InvalidFormatError
+from src.app.schemas.user_schema import UserCreate
+from src.app.services.password_hasher import password_hasher
+from src.app.services.user_service import UserService
+from src.database.factories.user_factory import User
+from src.database.session import get_async_db
+
+# Kolom export = User.to_dict()
+EXPORT_FIELDS = [
+    "id",
+    "email",
+    "username",
+    "full_name",
+    "bio",
+    "avatar_url",
+    "is_active",
+    "is_verified",
+    "is_superuser",
+    "last_login",
+    "created_at",
+    "updated_at",
+]
+
+# Maksimal error per baris yang dikembalikan di report import
+MAX_REPORTED_ERRORS = 100
+
+# (line number, record atau error parsing)
+Record = Tuple[int, Any]
+
+
+class UserTransferService:
+    """
+    User Transfer Service - bulk import / export users
+    Import: stream CSV/JSONL per batch -> validasi UserCreate -> hash paralel
+    di password hasher pool -> INSERT executemany (skip yang sudah ada).
+    Export: server-side cursor (yield_per), memory konstan berapapun jumlah row
+    """
+
+    # =============== Import ===============
+    @staticmethod
+    def detect_format(filename: Optional[str], default: str = "jsonl") -> str:
+        """Format dari extension file (.csv / .jsonl / .ndjson)"""
+        if filename and filename.lower().endswith(".csv"):
+            return "csv"
+        if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+            return "jsonl"
+        return default
+
+    @staticmethod
+    def iter_records(stream: TextIO, fmt: str) -> Iterator[Record]:
+        """Parse stream baris per baris, error parsing dikembalikan per baris"""
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for record in reader:
+                # Kolom kosong di CSV dianggap tidak diisi
+                yield reader.line_num, {k: v for k, v in record.items() if v != ""}
+        elif fmt == "jsonl":
+            for line_no, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, ValueError(f"Invalid JSON: {e}")
+        else:
+            raise InvalidFormatError(f"Unsupported import format: {fmt}")
+
+    @staticmethod
+    async def import_users(
+        stream: TextIO, fmt: str, batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Import users dari CSV/JSONL stream, return report"""
+        batch_size = batch_size or env.USER_IMPORT_BATCH_SIZE
+        records = UserTransferService.iter_records(stream, fmt)
+        report = {
+            "processed": 0,
+            "created": 0,
+            "skipped_existing": 0,
+            "duplicates": 0,
+            "invalid": 0,
+            "errors": [],
+        }
+
+        while True:
+            # Baca file di thread supaya event loop tidak ke-block
+            batch = await asyncio.to_thread(
+                lambda: list(itertools.islice(records, batch_size))
+            )
+            if not batch:
+                break
+
+            await UserTransferService._import_batch(batch, report)
+
+        return report
+
+    @staticmethod
+    def _add_error(report: Dict[str, Any], line_no: int, error: str) -> None:
+        report["invalid"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_no, "error": error})
+
+    @staticmethod
+    async def _import_batch(batch: List[Record], report: Dict[str, Any]) -> None:
+        report["processed"] += len(batch)
+
+        # Validasi + dedupe dalam batch
+        users: List[UserCreate] = []
+        seen = set()
+        for line_no, record in batch:
+            if isinstance(record, Exception):
+                UserTransferService._add_error(report, line_no, str(record))
+                continue
+
+            try:
+                user = UserCreate.model_validate(record)
+            except ValidationError as e:
+                message = "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                    for err in e.errors()
+                )
+                UserTransferService._add_error(report, line_no, message)
+                continue
+
+            email, username = user.email.lower(), user.username.lower()
+            if email in seen or username in seen:
+                report["duplicates"] += 1
+                continue
+
+            seen.update((email, username))
+            users.append(user)
+
+        if not users:
+            return
+
+        async with get_async_db() as db:
+            # Skip user yang sudah ada sebelum bcrypt (hashing paling mahal)
+            result = await db.execute(
+                select(User.email, User.username).where(
+                    or_(
+                        User.email.in_([u.email.lower() for u in users]),
+                        User.username.in_([u.username.lower() for u in users]),
+                    )
+                )
+            )
+            existing = {value for row in result for value in row}
+
+            # Selesaikan transaksi read supaya connection tidak ditahan selama hashing
+            await db.commit()
+
+        new_users = [
+            u
+            for u in users
+            if u.email.lower() not in existing and u.username.lower() not in existing
+        ]
+        report["skipped_existing"] += len(users) - len(new_users)
+        if not new_users:
+            return
+
+        hashes = await password_hasher.hash_many([u.password for u in new_users])
+        rows = [
+            {
+                "email": u.email.lower(),
+                "username": u.username.lower(),
+                "password": hashed,
+                "full_name": u.full_name,
+                "bio": u.bio,
+                "avatar_url": u.avatar_url,
+                "is_active": True,
+                "is_verified": False,
+                "is_superuser": False,
+            }
+            for u, hashed in zip(new_users, hashes)
+        ]
+
+        async with get_async_db() as db:
+            # executemany; conflict (race dengan register) di-skip oleh database
+            dialect_name = db.bind.dialect.name
+            if dialect_name == "postgresql":
+                stmt = postgresql.insert(User).on_conflict_do_nothing()
+            elif dialect_name == "sqlite":
+                stmt = sqlite.insert(User).on_conflict_do_nothing()
+            else:
+                stmt = insert(User)
+
+            result = await db.execute(stmt.returning(User.id), rows)
+            created = len(result.all())
+            await db.commit()
+
+        report["created"] += created
+        report["skipped_existing"] += len(rows) - created
+
+    # =============== Export ===============
+    @staticmethod
+    async def export_users(
+        fmt: str = "jsonl", chunk_size: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Stream semua users (User.to_dict()) sebagai JSONL / CSV"""
+        if fmt not in ("jsonl", "csv"):
+            raise InvalidFormatError(f"Unsupported export format: {fmt}")
+
+        if fmt == "csv":
+            yield UserTransferService._csv_lines([EXPORT_FIELDS])
+
+        async for users in UserService.stream_users(chunk_size=chunk_size):
+            if fmt == "csv":
+                rows = (user.to_dict() for user in users)
+                yield UserTransferService._csv_lines(
+                    [[row[field] for field in EXPORT_FIELDS] for row in rows]
+                )
+            else:
+                yield "".join(
+                    json.dumps(user.to_dict(), separators=(",", ":")) + "\n"
+                    for user in users
+                )
+
+    @staticmethod
+    def _csv_lines(rows: List[List[Any]]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
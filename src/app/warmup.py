@@ -0,0 +1,119 @@
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from fastapi import FastAPI
+from pydantic import BaseModel, EmailStr, TypeAdapter
+from sqlalchemy.orm import configure_mappers
+
+import src.config.env as env
+from src.app.schemas import response_schema, user_schema
+from src.app.services.password_hasher import password_hasher
+from src.database.pool import prefill_pool
+from src.database.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+StepResult = Optional[Dict[str, Any]]
+
+
+class WarmupState:
+    """Hasil warmup per worker (dilaporkan di /health/ready)"""
+
+    def __init__(self):
+        self.completed = False
+        self.duration_ms: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def failed(self) -> bool:
+        return any(step["status"] != "ok" for step in self.steps.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "duration_ms": self.duration_ms,
+            "steps": self.steps,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def warm_schemas(app: FastAPI) -> Dict[str, Any]:
+    """
+    Build validator yang masih lazy: model yang belum complete, EmailStr
+    (email-validator load tabel IDNA di call pertama, ~60ms) dan OpenAPI schema
+    """
+    rebuilt = 0
+    for module in (user_schema, response_schema):
+        for value in vars(module).values():
+            if (
+                inspect.isclass(value)
+                and issubclass(value, BaseModel)
+                and value.__module__ == module.__name__
+                and not value.__pydantic_complete__
+            ):
+                value.model_rebuild()
+                rebuilt += 1
+
+    TypeAdapter(EmailStr).validate_python("warmup@example.com")
+    app.openapi()
+    return {"rebuilt": rebuilt}
+
+
+def warm_mappers() -> None:
+    """Configure semua SQLAlchemy mapper sekarang, bukan di query pertama"""
+    configure_mappers()
+
+
+async def warm_pool() -> Dict[str, Any]:
+    return {"connections": await prefill_pool(async_engine, env.WARMUP_POOL_SIZE)}
+
+
+async def warm_password_hasher() -> Dict[str, Any]:
+    return await password_hasher.calibrate(
+        target_ms=env.PASSWORD_HASH_TARGET_MS,
+        min_rounds=env.PASSWORD_HASH_MIN_ROUNDS,
+    )
+
+
+async def run_step(
+    name: str, step: Callable[[], Union[StepResult, Awaitable[StepResult]]]
+) -> None:
+    """Jalankan satu step; gagal cuma di-log (worker tetap start, lebih lambat)"""
+    start = time.perf_counter()
+    try:
+        result = step()
+        if inspect.isawaitable(result):
+            result = await result
+        status = {"status": "ok", **(result or {})}
+    except Exception as e:
+        logger.warning("Warmup step %s failed: %s", name, e)
+        status = {"status": "failed", "error": str(e)}
+
+    status["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    warmup_state.steps[name] = status
+
+
+async def warmup(app: FastAPI) -> WarmupState:
+    """
+    Warmup sebelum worker terima request (dipanggil dari lifespan):
+    mapper, schema validator, bcrypt (load backend + kalibrasi cost), pool
+    """
+    start = time.perf_counter()
+
+    await run_step("mappers", warm_mappers)
+    await run_step("schemas", lambda: warm_schemas(app))
+    await run_step("password_hasher", warm_password_hasher)
+    await run_step("database_pool", warm_pool)
+
+    warmup_state.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    warmup_state.completed = True
+    logger.info(
+        "🔥 Warmup finished in %sms (%s)",
+        warmup_state.duration_ms,
+        ", ".join(f"{name}={s['status']}" for name, s in warmup_state.steps.items()),
+    )
+    return warmup_state
@@ -1,12 +1,143 @@
+import os
+
 from dotenv import dotenv_values
 
-# Load environment variables from .env file
-config = dotenv_values(".env")
+# Load environment variables from .env file (ENV_FILE untuk file lain, mis. test / benchmark)
+ENV_FILE = os.environ.get("ENV_FILE", ".env")
+config = dotenv_values(ENV_FILE)
 
 # Database configuration
 DATABASE_URL = config.get("DATABASE_URL", "")
+# Optional, kalau kosong diturunkan dari DATABASE_URL (sqlite+aiosqlite / postgresql+asyncpg)
+ASYNC_DATABASE_URL = config.get("ASYNC_DATABASE_URL", "")
+
+# Connection pool tuning
+DB_POOL_SIZE = int(config.get("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(config.get("DB_MAX_OVERFLOW") or 10)
+DB_POOL_TIMEOUT = float(config.get("DB_POOL_TIMEOUT") or 30)
+DB_POOL_RECYCLE = int(config.get("DB_POOL_RECYCLE") or 1800)  # detik, -1 = off
+DB_POOL_PRE_PING = config.get("DB_POOL_PRE_PING", "true").lower() == "true"
 
 # API settings
-API_PORT = config.get("API_PORT", "8000")
+API_PORT = int(config.get("API_PORT") or 8000)
 API_HOST = config.get("API_HOST", "0.0.0.0")
-API_KEY = config.get("API_KEY", "")
\ No newline at end of file
+API_KEY = config.get("API_KEY", "")
+
+# Auth: jawab /validate dari signed JWT claims tanpa query database
+AUTH_STATELESS_CLAIMS = config.get("AUTH_STATELESS_CLAIMS", "false").lower() == "true"
+# Claims lebih tua dari ini dianggap stale dan dicek ulang ke database
+AUTH_CLAIMS_MAX_AGE_SECONDS = int(config.get("AUTH_CLAIMS_MAX_AGE_SECONDS") or 300)
+# Bloom filter di depan token revocation store
+REVOCATION_BLOOM_CAPACITY = int(config.get("REVOCATION_BLOOM_CAPACITY") or 100000)
+REVOCATION_BLOOM_ERROR_RATE = float(config.get("REVOCATION_BLOOM_ERROR_RATE") or 0.001)
+# Bloom filter di-build ulang dari jti yang masih di store (entry expired hilang)
+REVOCATION_BLOOM_REBUILD_SECONDS = float(
+    config.get("REVOCATION_BLOOM_REBUILD_SECONDS") or 900
+)
+
+# In-process user cache (lookup by id / username / email)
+USER_CACHE_ENABLED = config.get("USER_CACHE_ENABLED", "true").lower() == "true"
+USER_CACHE_MAX_SIZE = int(config.get("USER_CACHE_MAX_SIZE") or 10000)
+USER_CACHE_TTL_SECONDS = float(config.get("USER_CACHE_TTL_SECONDS") or 30)
+USER_CACHE_SHARED_TTL_SECONDS = float(
+    config.get("USER_CACHE_SHARED_TTL_SECONDS") or 300
+)
+
+# Shared cache backend: memory (per process) | redis (shared antar worker/node)
+CACHE_BACKEND = config.get("CACHE_BACKEND", "memory")
+CACHE_URL = config.get("CACHE_URL", "redis://localhost:6379/0")
+CACHE_KEY_PREFIX = config.get("CACHE_KEY_PREFIX", "fastapi-starter:")
+
+# Pagination (total=estimate berhenti count setelah cap rows)
+PAGINATION_COUNT_CAP = int(config.get("PAGINATION_COUNT_CAP") or 10000)
+
+# User stats snapshot (dashboard polling baca snapshot, bukan COUNT)
+USER_STATS_TTL_SECONDS = float(config.get("USER_STATS_TTL_SECONDS") or 10)
+
+# Bulk import / export users
+USER_IMPORT_BATCH_SIZE = int(config.get("USER_IMPORT_BATCH_SIZE") or 500)
+USER_EXPORT_CHUNK_SIZE = int(config.get("USER_EXPORT_CHUNK_SIZE") or 1000)
+
+# Verified token cache (skip HMAC + JSON parse untuk token yang sama)
+TOKEN_CACHE_ENABLED = config.get("TOKEN_CACHE_ENABLED", "true").lower() == "true"
+TOKEN_CACHE_MAX_SIZE = int(config.get("TOKEN_CACHE_MAX_SIZE") or 10000)
+
+# Logging (handler di thread terpisah lewat queue, ditulis per batch)
+LOG_LEVEL = config.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = config.get("LOG_FORMAT", "json")  # json | text
+LOG_QUEUE_SIZE = int(config.get("LOG_QUEUE_SIZE") or 10000)
+LOG_BATCH_SIZE = int(config.get("LOG_BATCH_SIZE") or 100)
+LOG_FLUSH_INTERVAL = float(config.get("LOG_FLUSH_INTERVAL") or 0.5)
+
+# Access log per request; sample rate per action, contoh "VALIDATE_TOKEN=0.01"
+ACCESS_LOG_ENABLED = config.get("ACCESS_LOG_ENABLED", "true").lower() == "true"
+_sample_rates = config.get("ACCESS_LOG_SAMPLE_RATES", "VALIDATE_TOKEN=0.01")
+ACCESS_LOG_SAMPLE_RATES = {
+    action.strip().upper(): float(rate)
+    for action, _, rate in (item.partition("=") for item in _sample_rates.split(","))
+    if action.strip() and rate.strip()
+}
+
+# Metrics (Prometheus text format di /metrics, per worker)
+METRICS_ENABLED = config.get("METRICS_ENABLED", "true").lower() == "true"
+
+# Profiler (opt-in): header X-Profile / GET /debug/profile, butuh API_KEY
+PROFILER_ENABLED = config.get("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_INTERVAL = float(config.get("PROFILER_INTERVAL") or 0.005)
+PROFILER_MAX_SECONDS = float(config.get("PROFILER_MAX_SECONDS") or 60)
+
+# Runtime
+CPU_COUNT = os.cpu_count() or 1
+
+# Server (python main.py). SERVER_RELOAD=true untuk development (1 worker)
+SERVER_RELOAD = config.get("SERVER_RELOAD", "false").lower() == "true"
+# Multi worker butuh CACHE_BACKEND=redis (revocation, rotation, cache invalidation
+# per process di memory backend): default 1 worker tanpa redis
+SERVER_WORKERS = (
+    1
+    if SERVER_RELOAD
+    else int(
+        config.get("SERVER_WORKERS") or (CPU_COUNT if CACHE_BACKEND == "redis" else 1)
+    )
+)
+# SERVER_LOOP: auto (uvloop kalau ter-install) | uvloop | asyncio
+SERVER_LOOP = config.get("SERVER_LOOP", "auto")
+# SERVER_HTTP: auto (httptools kalau ter-install) | httptools | h11
+SERVER_HTTP = config.get("SERVER_HTTP", "auto")
+SERVER_BACKLOG = int(config.get("SERVER_BACKLOG") or 2048)
+# Lebih lama dari idle timeout load balancer, supaya LB yang tutup koneksi
+SERVER_KEEPALIVE_TIMEOUT = int(config.get("SERVER_KEEPALIVE_TIMEOUT") or 75)
+# Waktu drain request in-flight waktu shutdown sebelum koneksi diputus
+SERVER_GRACEFUL_TIMEOUT = int(config.get("SERVER_GRACEFUL_TIMEOUT") or 30)
+# Optional: 503 di atas N koneksi per worker / restart worker tiap N request
+SERVER_LIMIT_CONCURRENCY = int(config.get("SERVER_LIMIT_CONCURRENCY") or 0) or None
+SERVER_LIMIT_MAX_REQUESTS = int(config.get("SERVER_LIMIT_MAX_REQUESTS") or 0) or None
+# URL publik untuk log startup (default dari API_HOST / API_PORT)
+API_PUBLIC_URL = (
+    config.get("API_PUBLIC_URL") or f"http://{API_HOST}:{API_PORT}"
+).rstrip("/")
+
+# Password hashing pool (bcrypt jalan di luar event loop)
+# PASSWORD_HASH_EXECUTOR: thread | process
+PASSWORD_HASH_EXECUTOR = config.get("PASSWORD_HASH_EXECUTOR", "thread")
+# Default: core dibagi rata antar server worker process (tidak oversubscribe
+# CPU). SERVER_PROCESSES di-set run() di main.py untuk worker yang di-spawn;
+# CLI, benchmark dan test tetap pakai semua core
+SERVER_PROCESSES = int(os.environ.get("SERVER_PROCESSES") or 1)
+PASSWORD_HASH_WORKERS = int(
+    config.get("PASSWORD_HASH_WORKERS") or max(1, CPU_COUNT // SERVER_PROCESSES)
+)
+# Minimal 32 supaya burst login/register kecil antri, bukan langsung 503
+PASSWORD_HASH_MAX_QUEUE = int(
+    config.get("PASSWORD_HASH_MAX_QUEUE") or max(32, PASSWORD_HASH_WORKERS * 4)
+)
+# bcrypt cost. PASSWORD_HASH_TARGET_MS di-set -> dikalibrasi waktu startup:
+# cost tertinggi di [MIN_ROUNDS, ROUNDS] yang hash-nya masih <= target
+PASSWORD_HASH_ROUNDS = int(config.get("PASSWORD_HASH_ROUNDS") or 12)
+PASSWORD_HASH_MIN_ROUNDS = int(config.get("PASSWORD_HASH_MIN_ROUNDS") or 10)
+PASSWORD_HASH_TARGET_MS = float(config.get("PASSWORD_HASH_TARGET_MS") or 0) or None
+
+# Warmup waktu startup (pool, mapper, schema, bcrypt) sebelum terima request
+WARMUP_ENABLED = config.get("WARMUP_ENABLED", "true").lower() == "true"
+# Koneksi yang dibuka duluan per worker (default DB_POOL_SIZE)
+WARMUP_POOL_SIZE = int(config.get("WARMUP_POOL_SIZE") or DB_POOL_SIZE)
@@ -0,0 +1,190 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+import src.config.env as env
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Atribut bawaan LogRecord; sisanya (extra=...) ikut jadi field JSON
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record = satu baris JSON (field `extra` ikut di top level)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+
+        return json.dumps(data, default=str, separators=(",", ":"))
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler yang tidak pernah block request path
+    Kalau queue penuh (writer ketinggalan), record di-drop dan dihitung
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Message (msg % args) di-render di thread caller, karena args bisa object
+        yang berubah / tidak thread-safe sebelum listener sempat format.
+        Beda dengan bawaan QueueHandler, exc_info tidak dibuang: traceback
+        di-format listener thread jadi field JSON sendiri
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler yang buffer baris dan write + flush sekali per batch
+    Flush kalau batch penuh, record >= ERROR, atau lewat flush_interval
+    """
+
+    def __init__(self, stream=None, batch_size: int = 100, flush_interval: float = 0.5):
+        super().__init__(stream)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        if (
+            len(self._buffer) >= self.batch_size
+            or record.levelno >= logging.ERROR
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            self.stream.write(self.terminator.join(lines) + self.terminator)
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener yang flush handler waktu queue idle dan waktu stop"""
+
+    def __init__(self, log_queue: queue.Queue, *handlers, flush_interval: float):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                # Tidak ada record baru: tulis sisa batch
+                self.flush()
+
+    def flush(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        super().stop()
+        self.flush()
+
+
+_listener: Optional[BatchingQueueListener] = None
+
+
+def configure_logging() -> BatchingQueueListener:
+    """
+    Setup root logger: record masuk queue (non-blocking), formatting + write
+    dijalankan listener thread per batch. Aman dipanggil berkali-kali;
+    sisa record di-flush waktu process exit
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handler = BatchingStreamHandler(
+        sys.stderr, batch_size=env.LOG_BATCH_SIZE, flush_interval=env.LOG_FLUSH_INTERVAL
+    )
+    if env.LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.Queue(maxsize=env.LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.handlers = [NonBlockingQueueHandler(log_queue)]
+    root.setLevel(env.LOG_LEVEL)
+
+    _listener = BatchingQueueListener(
+        log_queue, handler, flush_interval=env.LOG_FLUSH_INTERVAL
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """
+    Tunggu queue kosong (maksimal `timeout` detik) dan tulis sisa batch, tanpa
+    stop listener. Dipanggil di akhir shutdown: worker multiprocessing exit
+    lewat os._exit, jadi atexit tidak jalan. Blocking: dari event loop panggil
+    lewat asyncio.to_thread. Return False kalau queue belum habis
+    """
+    if _listener is None or _listener._thread is None:
+        return True
+
+    log_queue = _listener.queue
+    with log_queue.all_tasks_done:
+        drained = log_queue.all_tasks_done.wait_for(
+            lambda: not log_queue.unfinished_tasks, timeout
+        )
+    _listener.flush()
+    return drained
@@ -21,3 +21,17 @@ async def validate_api_key(api_key: str = Security(api_key_header)):
                 status_code=HTTP_403_FORBIDDEN, detail="Invalid API Key"
             )
     return api_key
+
+
+async def require_api_key(api_key: str = Security(api_key_header)):
+    """
+    Validate the API key, fail closed
+
+    For admin routes (user management): if no API key is configured the
+    routes are disabled instead of open to anonymous requests.
+    """
+    if not env.API_KEY:
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN, detail="API Key not configured"
+        )
+    return await validate_api_key(api_key)
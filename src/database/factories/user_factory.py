@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import DDL, Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Index, event
 from sqlalchemy.sql import func
 from src.database.session import Base
 
@@ -10,6 +11,8 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    # Ambil server default (created_at/updated_at) lewat RETURNING saat INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -51,3 +54,23 @@ class User(Base):
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
+
+
+# =============== Search Indexes ===============
+# PostgreSQL: trigram GIN index untuk ILIKE '%q%' + similarity() ranking
+# SQLite: prefix search pakai index username/email + lower(full_name)
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+for _column in ("username", "email", "full_name"):
+    Index(
+        f"ix_users_{_column}_trgm",
+        User.__table__.c[_column],
+        postgresql_using="gin",
+        postgresql_ops={_column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+Index("ix_users_full_name_lower", func.lower(User.full_name)).ddl_if(dialect="sqlite")
@@ -4,6 +4,7 @@ from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import make_url
 
 import src.config.env as env
 from src.database.session import Base
@@ -23,11 +24,20 @@ def get_url():
     return env.DATABASE_URL
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip index khusus dialect lain (Index.ddl_if), misalnya trigram index"""
+    ddl_if = getattr(object, "_ddl_if", None)
+    if type_ == "index" and ddl_if is not None and ddl_if.dialect is not None:
+        return ddl_if.dialect == make_url(get_url()).get_backend_name()
+    return True
+
+
 def run_migrations_offline() -> None:
     url = get_url()
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -45,7 +55,11 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
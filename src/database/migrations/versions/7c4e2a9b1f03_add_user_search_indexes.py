@@ -0,0 +1,70 @@
+"""add user search indexes
+
+PostgreSQL: pg_trgm + trigram GIN index (ILIKE '%q%' dan similarity ranking)
+SQLite: expression index lower(full_name) untuk prefix search
+
+Revision ID: 7c4e2a9b1f03
+Revises: 3a1f0c2b9d10
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2a9b1f03"
+down_revision: Union[str, None] = "3a1f0c2b9d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("username", "email", "full_name")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+        # CONCURRENTLY supaya tabel users tidak ke-lock waktu build index
+        with op.get_context().autocommit_block():
+            for column in TRIGRAM_COLUMNS:
+                op.create_index(
+                    f"ix_users_{column}_trgm",
+                    "users",
+                    [column],
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+
+    elif dialect == "sqlite":
+        op.create_index(
+            "ix_users_full_name_lower",
+            "users",
+            [sa.text("lower(full_name)")],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            for column in TRIGRAM_COLUMNS:
+                op.drop_index(
+                    f"ix_users_{column}_trgm",
+                    table_name="users",
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+
+    elif dialect == "sqlite":
+        op.drop_index("ix_users_full_name_lower", table_name="users", if_exists=True)
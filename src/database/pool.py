@@ -0,0 +1,159 @@
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from src.app.metrics import DB_QUERY_DURATION
+
+# Kata pertama statement -> label metric
+STATEMENT_TYPES = {
+    "select": "select",
+    "insert": "insert",
+    "update": "update",
+    "delete": "delete",
+    "with": "select",
+}
+
+
+class PoolMetrics:
+    """Counter untuk connection pool (checkout wait, timeout, connect)"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "avg_wait_ms": round(avg_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedPoolMixin:
+    """
+    Mixin untuk QueuePool - ukur berapa lama request nunggu connection
+    Wait time termasuk buka connection baru kalau pool masih bisa overflow
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() bikin pool baru, metrics tetap dibawa
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """QueuePool dengan PoolMetrics (sync engine)"""
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool dengan PoolMetrics (async engine)"""
+
+
+def register_pool_events(engine: Engine) -> None:
+    """Hitung connect baru dan invalidation lewat pool events"""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.invalidations += 1
+
+
+def register_query_events(engine: Engine) -> None:
+    """Ukur waktu cursor execute per statement type (db_query_duration_seconds)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("query_start", None)
+        if start is None:
+            return
+        words = statement.lstrip()[:7].lower().split(None, 1)
+        statement_type = STATEMENT_TYPES.get(words[0] if words else "", "other")
+        DB_QUERY_DURATION.observe(time.perf_counter() - start, statement_type)
+
+
+def get_pool_status(pool: Pool) -> Dict[str, Any]:
+    """Snapshot kondisi pool: ukuran, checked out, overflow, wait time"""
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.to_dict())
+
+    return status
+
+
+async def prefill_pool(engine: AsyncEngine, size: int) -> int:
+    """
+    Buka `size` koneksi sekaligus (ping SELECT 1) lalu kembalikan ke pool,
+    supaya request pertama tidak bayar connect + auth ke database
+    Dibatasi ukuran pool (koneksi overflow langsung ditutup waktu check in)
+    """
+    pool = engine.pool
+    # Pool lain (StaticPool / NullPool) cukup satu ping
+    size = min(size, pool.size()) if isinstance(pool, QueuePool) else min(size, 1)
+
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+    return size
@@ -0,0 +1,60 @@
+from typing import Optional
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import src.config.env as env
+
+# exact = COUNT(*) penuh, estimate = statistik planner / count dibatasi,
+# none = skip count (cursor pagination tidak butuh total)
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
+async def count_rows(
+    db: AsyncSession, query: Select, mode: str = "exact"
+) -> Optional[int]:
+    """Hitung total rows untuk query sesuai mode (None kalau mode "none")"""
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"Invalid total mode: {mode}")
+
+    if mode == "none":
+        return None
+
+    query = query.order_by(None).limit(None).offset(None)
+
+    if mode == "estimate":
+        # Tanpa filter: pakai statistik tabel (PostgreSQL reltuples)
+        if query.whereclause is None:
+            estimate = await estimate_table_rows(db, query)
+            if estimate is not None:
+                return estimate
+
+        # Dengan filter: count dibatasi, berhenti setelah cap rows
+        cap = env.PAGINATION_COUNT_CAP
+        capped = await db.scalar(
+            select(func.count()).select_from(query.limit(cap + 1).subquery())
+        )
+        return min(capped, cap)
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    return total
+
+
+async def estimate_table_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """Row estimate dari pg_class.reltuples, None kalau tidak tersedia"""
+    if db.bind.dialect.name != "postgresql":
+        return None
+
+    froms = query.get_final_froms()
+    if len(froms) != 1 or not hasattr(froms[0], "name"):
+        return None
+
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": froms[0].name},
+    )
+
+    # -1 = tabel belum pernah di-ANALYZE
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
@@ -1,21 +1,89 @@
-from contextlib import contextmanager  # tambah ini
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 import src.config.env as env
+from src.database.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    register_pool_events,
+    register_query_events,
+)
+
+logger = logging.getLogger(__name__)
+
+# Async driver yang dipakai kalau ASYNC_DATABASE_URL tidak di-set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Convert sync DATABASE_URL ke async driver equivalent"""
+    if env.ASYNC_DATABASE_URL:
+        return env.ASYNC_DATABASE_URL
+
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_pool_options(url: str, poolclass) -> Dict[str, Any]:
+    """Pool settings dari env (sqlite in-memory pakai StaticPool default)"""
+    if url.startswith("sqlite") and (":memory:" in url or url.endswith("://")):
+        return {}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": env.DB_POOL_SIZE,
+        "max_overflow": env.DB_MAX_OVERFLOW,
+        "pool_timeout": env.DB_POOL_TIMEOUT,
+        "pool_recycle": env.DB_POOL_RECYCLE,
+        "pool_pre_ping": env.DB_POOL_PRE_PING,
+    }
+
 
 engine = create_engine(
     env.DATABASE_URL,
     connect_args=(
         {"check_same_thread": False} if env.DATABASE_URL.startswith("sqlite") else {}
     ),
+    **get_pool_options(env.DATABASE_URL, InstrumentedQueuePool),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine - dipakai request path supaya query tidak block event loop
+ASYNC_DATABASE_URL = get_async_database_url(env.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **get_pool_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+register_pool_events(async_engine.sync_engine)
+register_query_events(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,  # Object tetap bisa dibaca setelah commit
+)
+
+# Session yang sedang aktif di context ini (per request / per task)
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "current_session", default=None
+)
+
 Base = declarative_base()
 
+
 @contextmanager
 def get_db():
     db = SessionLocal()
@@ -23,3 +91,72 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Async session context manager untuk service layer
+    Kalau sudah ada session aktif (request scope atau call di luar), session itu
+    yang dipakai - jadi nested service call share satu session & transaction
+    """
+    db = _current_session.get()
+    if db is not None:
+        yield db
+        return
+
+    async with AsyncSessionLocal() as db:
+        token = _current_session.set(db)
+        try:
+            yield db
+        finally:
+            _current_session.reset(token)
+
+
+async def release_connection() -> None:
+    """
+    Selesaikan transaksi session aktif (kalau ada) supaya connection balik ke
+    pool sebelum kerja lama non-DB (bcrypt); query berikutnya ambil connection lagi
+    Cuma untuk transaksi read: kalau session masih punya perubahan (new / dirty /
+    deleted) raise RuntimeError, supaya write caller tidak ikut ter-commit diam-diam
+    """
+    db = _current_session.get()
+    if db is None or not db.in_transaction():
+        return
+
+    if db.new or db.dirty or db.deleted:
+        raise RuntimeError(
+            "release_connection() called with pending changes in the session; "
+            "commit or roll back the unit of work first"
+        )
+    await db.commit()
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency - satu AsyncSession (unit of work) per request"""
+    async with get_async_db() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def check_database_health() -> Dict[str, Any]:
+    """
+    Ping database (untuk /health/db dan /health/ready, tanpa auth)
+    Detail error cuma di-log, response berisi pesan generik
+    """
+    health: Dict[str, Any] = {"status": "healthy"}
+
+    start = time.perf_counter()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        health["ping_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    except Exception:
+        logger.exception("Database health check failed")
+        health["status"] = "unhealthy"
+        health["error"] = "Database unavailable"
+
+    return health
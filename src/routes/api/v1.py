@@ -1,87 +1,194 @@
-from fastapi import APIRouter, Depends, Header, Request
+from fastapi import APIRouter, Depends, File, Header, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from typing import Optional
+from typing import Literal, Optional
 
 from src.app.controllers.auth_controller import AuthController
+from src.app.controllers.user_controller import UserController
+from src.config.security import require_api_key
+from src.database.session import get_async_session
+from src.app.schemas.response_schema import PageEnvelope, SuccessEnvelope
 from src.app.schemas.user_schema import (
     UserCreate,
     LoginRequest,
     ChangePassword,
+    CurrentUser,
+    ImportReport,
     PasswordReset,
     PasswordResetConfirm,
+    PasswordResetRequested,
+    Token,
+    TokenInfo,
+    TokenRefresh,
+    TokenValidation,
+    UserIdResult,
+    UserResponse,
+    UserStats,
 )
 
 # OAuth2 scheme for swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
-# Define router
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+# Define router - semua service call dalam satu request share satu session
+router = APIRouter(
+    prefix="/auth",
+    tags=["Authentication"],
+    dependencies=[Depends(get_async_session)],
+)
+
+# User management router - wajib API key (403 kalau API_KEY tidak di-set)
+user_router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+    dependencies=[Depends(require_api_key), Depends(get_async_session)],
+)
+
+# Total count: none (paling murah), estimate, exact
+TotalMode = Literal["none", "estimate", "exact"]
 
 
-@router.post("/register", response_model=dict)
+@router.post("/register", response_model=SuccessEnvelope[Token])
 async def register(user_data: UserCreate, request: Request):
     """Register new user"""
-    return AuthController.register(user_data, request)
+    return await AuthController.register(user_data, request)
 
 
-@router.post("/login", response_model=dict)
+@router.post("/login", response_model=SuccessEnvelope[Token])
 async def login(login_data: LoginRequest, request: Request):
     """Login user with username/email and password"""
-    return AuthController.login(login_data, request)
+    return await AuthController.login(login_data, request)
 
 
-@router.post("/refresh", response_model=dict)
+@router.post("/refresh", response_model=SuccessEnvelope[TokenRefresh])
 async def refresh_token(
     request: Request,
     refresh_token: str = Header(..., description="Refresh token in header"),
 ):
     """Refresh access token using refresh token"""
-    return AuthController.refresh_token(refresh_token, request)
+    return await AuthController.refresh_token(refresh_token, request)
 
 
-@router.post("/validate", response_model=dict)
+@router.post("/validate", response_model=SuccessEnvelope[TokenValidation])
 async def validate_token(request: Request, token: str = Depends(oauth2_scheme)):
     """Validate access token"""
-    return AuthController.validate_token(token, request)
+    return await AuthController.validate_token(token, request)
 
 
-@router.get("/me", response_model=dict)
+@router.get("/me", response_model=SuccessEnvelope[CurrentUser])
 async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
     """Get current user information from token"""
-    return AuthController.get_current_user(token, request)
+    return await AuthController.get_current_user(token, request)
 
 
-@router.post("/change-password", response_model=dict)
+@router.post("/change-password", response_model=SuccessEnvelope[UserIdResult])
 async def change_password(
     password_data: ChangePassword, request: Request, token: str = Depends(oauth2_scheme)
 ):
     """Change user password"""
     # Extract user ID from token first
-    user_info = AuthController.get_current_user(token, request)
-    user_id = user_info["data"]["id"]
+    principal = await AuthController.authenticate(token)
 
-    return AuthController.change_password(user_id, password_data, request)
+    return await AuthController.change_password(
+        principal.user_id, password_data, request
+    )
 
 
-@router.post("/forgot-password", response_model=dict)
+@router.post("/forgot-password", response_model=SuccessEnvelope[PasswordResetRequested])
 async def request_password_reset(reset_data: PasswordReset, request: Request):
     """Request password reset"""
-    return AuthController.request_password_reset(reset_data, request)
+    return await AuthController.request_password_reset(reset_data, request)
 
 
-@router.post("/reset-password", response_model=dict)
+@router.post("/reset-password", response_model=SuccessEnvelope[None])
 async def reset_password(reset_data: PasswordResetConfirm, request: Request):
     """Reset password using reset token"""
-    return AuthController.reset_password(reset_data, request)
+    return await AuthController.reset_password(reset_data, request)
 
 
-@router.post("/logout", response_model=dict)
-async def logout(request: Request, token: str = Depends(oauth2_scheme)):
-    """Logout user"""
-    return AuthController.logout(token, request)
+@router.post("/logout", response_model=SuccessEnvelope[UserIdResult])
+async def logout(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    refresh_token: Optional[str] = Header(
+        None, description="Refresh token to revoke as well"
+    ),
+):
+    """Logout user (revoke access token, and refresh token if provided)"""
+    return await AuthController.logout(token, refresh_token, request)
 
 
-@router.get("/token-info", response_model=dict)
+@router.get("/token-info", response_model=SuccessEnvelope[TokenInfo])
 async def get_token_info(request: Request, token: str = Depends(oauth2_scheme)):
     """Get token information"""
-    return AuthController.get_token_info(token, request)
+    return await AuthController.get_token_info(token, request)
+
+
+# =============== Users ===============
+@user_router.get(
+    "",
+    response_model=PageEnvelope[UserResponse],
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def list_users(
+    request: Request,
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor dari page sebelumnya"),
+    page: Optional[int] = Query(None, ge=1, description="Offset pagination (legacy)"),
+    total: TotalMode = "none",
+    is_active: Optional[bool] = None,
+    format: Literal["json", "ndjson", "csv"] = Query(
+        "json", description="ndjson/csv: stream semua rows (tanpa pagination)"
+    ),
+):
+    """List users with cursor pagination, or stream all rows as NDJSON/CSV"""
+    if format != "json":
+        return UserController.stream_users(format, cursor, is_active, request)
+
+    return await UserController.list_users(
+        per_page, cursor, page, total, is_active, request
+    )
+
+
+@user_router.get("/stats", response_model=SuccessEnvelope[UserStats])
+async def user_stats(
+    request: Request,
+    fresh: bool = Query(False, description="Bypass snapshot dan hitung ulang"),
+):
+    """User statistics (snapshot, refreshed periodically)"""
+    return await UserController.get_stats(fresh, request)
+
+
+@user_router.post("/import", response_model=SuccessEnvelope[ImportReport])
+async def import_users(
+    request: Request,
+    file: UploadFile = File(..., description="CSV or JSONL file"),
+    format: Optional[Literal["csv", "jsonl"]] = Query(
+        None, description="Default dari extension file"
+    ),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+):
+    """Bulk import users (existing email/username di-skip)"""
+    return await UserController.import_users(file, format, batch_size, request)
+
+
+@user_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_users(request: Request, format: Literal["jsonl", "csv"] = "jsonl"):
+    """Stream all users as JSONL or CSV"""
+    return UserController.export_users(format, request)
+
+
+@user_router.get("/search", response_model=PageEnvelope[UserResponse])
+async def search_users(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor dari page sebelumnya"),
+    page: Optional[int] = Query(None, ge=1, description="Offset pagination (legacy)"),
+    total: TotalMode = "none",
+):
+    """Search users by username, email, or full name"""
+    return await UserController.search_users(q, per_page, cursor, page, total, request)
@@ -0,0 +1,150 @@
+# Helper bersama benchmark: env override sebelum import app, statistik latency,
+# baseline JSON
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import dotenv_values
+
+# Root project (dua level di atas src/scripts)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def use_env_overrides(overrides: Dict[str, str]) -> str:
+    """
+    Tulis env file sementara (.env + overrides) dan set ENV_FILE
+    Harus dipanggil sebelum import src.* (config dibaca waktu import)
+    """
+    base = dotenv_values(os.path.join(ROOT_DIR, ".env"))
+    values = {**base, **overrides}
+
+    fd, path = tempfile.mkstemp(prefix="bench-", suffix=".env")
+    with os.fdopen(fd, "w") as env_file:
+        for key, value in values.items():
+            env_file.write(f"{key}={json.dumps(value or '')}\n")
+
+    os.environ["ENV_FILE"] = path
+    return path
+
+
+def parse_overrides(items: Sequence[str]) -> Dict[str, str]:
+    """KEY=VALUE dari argumen --set"""
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Invalid override (expected KEY=VALUE): {item}")
+        overrides[key.strip()] = value
+    return overrides
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile dari list yang sudah di-sort"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(
+    latencies: Iterable[float], elapsed: Optional[float] = None
+) -> Dict[str, float]:
+    """p50/p95/p99/mean/max (ms) dan throughput (kalau elapsed diisi)"""
+    values = sorted(latencies)
+    count = len(values)
+    summary = {
+        "count": count,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+    if elapsed is not None:
+        summary["rps"] = round(count / elapsed, 2) if elapsed > 0 else 0.0
+    return summary
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    """Metadata run supaya baseline bisa dibandingkan apple-to-apple"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_baseline(path: str, data: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump(data, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare_results(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    metrics: Sequence[Tuple[str, bool]],
+    threshold: float,
+) -> Tuple[List[List[str]], List[str]]:
+    """
+    Bandingkan hasil per nama benchmark dengan baseline
+    `metrics` = [(field, higher_is_better)]; return (baris tabel, regresi)
+    """
+    rows: List[List[str]] = []
+    regressions: List[str] = []
+
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for field, higher_is_better in metrics:
+            old, new = previous.get(field), result.get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > threshold else ""
+            rows.append(
+                [name, field, f"{old:g}", f"{new:g}", f"{change * 100:+.1f}%", flag]
+            )
+            if flag:
+                regressions.append(f"{name} {field}: {old:g} -> {new:g}")
+
+    return rows, regressions
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    cells = [[str(c) for c in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
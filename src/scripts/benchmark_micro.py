@@ -0,0 +1,365 @@
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Tambah root project ke path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.scripts.benchmark_common import (
+    compare_results,
+    environment_info,
+    load_baseline,
+    parse_overrides,
+    percentile,
+    print_table,
+    save_baseline,
+    use_env_overrides,
+)
+
+PASSWORD = "BenchPass123"
+
+# (field, higher_is_better) yang dicek waktu --compare
+COMPARE_METRICS = [("mean_us", False), ("p95_us", False), ("peak_kb", False)]
+
+
+class Benchmark:
+    """
+    Satu micro-benchmark: `fn` sync tanpa argumen
+    cached=True -> token cache & user cache aktif selama benchmark
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        cached: bool = False,
+        iterations: Optional[int] = None,
+    ):
+        self.name = name
+        self.fn = fn
+        self.cached = cached
+        self.iterations = iterations
+
+    async def call(self) -> Any:
+        return self.fn()
+
+
+class QueryBenchmark(Benchmark):
+    """Benchmark untuk `fn` yang return coroutine (service call / query DB)"""
+
+    async def call(self) -> Any:
+        return await self.fn()
+
+
+async def measure_time(benchmark: Benchmark, iterations: int) -> Dict[str, float]:
+    """Latency per call (tanpa tracemalloc) -> mean/p50/p95/p99 (µs), ops/s"""
+    for _ in range(min(iterations, 50)):
+        await benchmark.call()
+
+    latencies: List[float] = []
+    gc.collect()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await benchmark.call()
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "iterations": iterations,
+        "mean_us": round(total / iterations * 1e6, 2),
+        "p50_us": round(percentile(latencies, 50) * 1e6, 2),
+        "p95_us": round(percentile(latencies, 95) * 1e6, 2),
+        "p99_us": round(percentile(latencies, 99) * 1e6, 2),
+        "ops": round(iterations / total, 1) if total > 0 else 0.0,
+    }
+
+
+async def measure_allocations(benchmark: Benchmark, calls: int) -> Dict[str, float]:
+    """
+    Alokasi per call lewat tracemalloc (run terpisah, tracing bikin lambat):
+    peak_kb = puncak memory sementara satu call, retained_b = sisa per call
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        peaks = []
+        for _ in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await benchmark.call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        gc.collect()
+        end_current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peak_kb": round(sum(peaks) / calls / 1024, 2),
+        "retained_b": round(max(end_current - start_current, 0) / calls, 1),
+    }
+
+
+async def seed_users(count: int) -> List[Any]:
+    """Insert `count` user (satu bcrypt hash dipakai semua) dan return beberapa"""
+    from src.app.services.user_service import UserService
+    from src.database.factories.user_factory import User
+    from src.database.session import AsyncSessionLocal, async_engine
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(User.metadata.create_all)
+
+    hashed_password = await UserService.hash_password(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        db.add_all(
+            User(
+                email=f"bench_micro_{i}@example.com",
+                username=f"bench_micro_{i}",
+                password=hashed_password,
+                full_name=f"Bench Micro {i}",
+                bio="Micro benchmark user",
+                is_active=i % 10 != 0,
+                is_verified=i % 3 == 0,
+            )
+            for i in range(count)
+        )
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            User.__table__.select().where(User.username.like("bench_micro_%")).limit(20)
+        )
+        ids = [row.id for row in result]
+        return [await db.get(User, user_id) for user_id in ids]
+
+
+def build_benchmarks(users: List[Any]) -> List[Benchmark]:
+    from src.app.controllers.base_controller import BaseController
+    from src.app.schemas.user_schema import UserCreate, UserResponse
+    from src.app.services.auth_service import AuthService
+    from src.app.services.user_service import UserService
+
+    user = users[0]
+    claims = {
+        "sub": user.username,
+        "user_id": user.id,
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+    }
+    token = AuthService.create_access_token(claims)
+    create_payload = {
+        "email": "new_user@example.com",
+        "username": "new_user",
+        "password": PASSWORD,
+        "full_name": "New User",
+        "bio": "Hello",
+    }
+    user_response = UserResponse.model_validate(user)
+    page = [UserResponse.model_validate(u) for u in users]
+
+    return [
+        # =============== Auth / JWT ===============
+        Benchmark(
+            "AuthService.create_access_token",
+            lambda: AuthService.create_access_token(claims),
+        ),
+        Benchmark("AuthService.verify_token", lambda: AuthService.verify_token(token)),
+        Benchmark(
+            "AuthService.verify_token (cached)",
+            lambda: AuthService.verify_token(token),
+            cached=True,
+        ),
+        # =============== Schemas / Responses ===============
+        Benchmark(
+            "UserResponse.model_validate (ORM)",
+            lambda: UserResponse.model_validate(user),
+        ),
+        Benchmark(
+            "UserCreate validation", lambda: UserCreate.model_validate(create_payload)
+        ),
+        Benchmark(
+            "success_response (user)",
+            lambda: BaseController.success_response(data=user_response),
+        ),
+        Benchmark(
+            "paginated_response (20 users)",
+            lambda: BaseController.paginated_response(
+                data=page, page=1, per_page=20, total=1000
+            ),
+        ),
+        # =============== UserService query shapes ===============
+        QueryBenchmark("get_user_by_id", lambda: UserService.get_user_by_id(user.id)),
+        QueryBenchmark(
+            "get_user_by_id (cached)",
+            lambda: UserService.get_user_by_id(user.id),
+            cached=True,
+        ),
+        QueryBenchmark(
+            "get_user_by_email", lambda: UserService.get_user_by_email(user.email)
+        ),
+        QueryBenchmark(
+            "get_user_by_username",
+            lambda: UserService.get_user_by_username(user.username),
+        ),
+        QueryBenchmark(
+            "get_user_by_username_or_email",
+            lambda: UserService.get_user_by_username_or_email(user.email),
+        ),
+        QueryBenchmark("get_users (20)", lambda: UserService.get_users(limit=20)),
+        QueryBenchmark(
+            "get_users_paginated (offset, exact)",
+            lambda: UserService.get_users_paginated(skip=100, limit=20, total="exact"),
+        ),
+        QueryBenchmark(
+            "get_users_paginated (keyset, none)",
+            lambda: UserService.get_users_paginated(
+                after=user.id, limit=20, total="none"
+            ),
+        ),
+        QueryBenchmark(
+            "search_users (exact total)",
+            lambda: UserService.search_users("micro_1", limit=20, total="exact"),
+        ),
+        QueryBenchmark(
+            "compute_user_stats", UserService.compute_user_stats, iterations=200
+        ),
+    ]
+
+
+async def run_benchmarks(args) -> Dict[str, Dict[str, Any]]:
+    from src.app.cache.token_cache import token_cache
+    from src.app.cache.user_cache import user_cache
+    from src.database.session import async_engine
+
+    users = await seed_users(args.users)
+    benchmarks = build_benchmarks(users)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for benchmark in benchmarks:
+        if args.filter and args.filter.lower() not in benchmark.name.lower():
+            continue
+        # Default: cache off supaya yang diukur JWT decode / query DB
+        token_cache.enabled = user_cache.enabled = benchmark.cached
+
+        iterations = benchmark.iterations or args.iterations
+        result = await measure_time(benchmark, iterations)
+        result.update(
+            await measure_allocations(
+                benchmark, max(1, min(args.alloc_calls, iterations))
+            )
+        )
+        results[benchmark.name] = result
+
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark JWT, schema, response dan query UserService "
+        "(waktu + alokasi tracemalloc)"
+    )
+    parser.add_argument(
+        "--database-url", help="Override database (default: SQLite file sementara)"
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument(
+        "--alloc-calls",
+        type=int,
+        default=200,
+        help="Jumlah call untuk pengukuran alokasi (tracemalloc)",
+    )
+    parser.add_argument(
+        "--users", type=int, default=1000, help="Jumlah user seed di database"
+    )
+    parser.add_argument("--filter", help="Cuma jalankan benchmark yang namanya cocok")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override setting .env",
+    )
+    parser.add_argument("--output", help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument("--compare", help="Bandingkan dengan baseline JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Regresi kalau lebih buruk dari ini (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.db')}"
+    )
+    use_env_overrides(
+        {
+            "DATABASE_URL": database_url,
+            "ASYNC_DATABASE_URL": "",
+            "LOG_LEVEL": "WARNING",
+            **parse_overrides(args.set),
+        }
+    )
+
+    results = asyncio.run(run_benchmarks(args))
+
+    # Paling mahal di atas: urutan prioritas optimasi
+    ordered = sorted(results.items(), key=lambda item: -item[1]["mean_us"])
+    print_table(
+        ["benchmark", "mean_us", "p50_us", "p95_us", "ops/s", "peak_kb", "retained_b"],
+        [
+            [
+                name,
+                r["mean_us"],
+                r["p50_us"],
+                r["p95_us"],
+                r["ops"],
+                r["peak_kb"],
+                r["retained_b"],
+            ]
+            for name, r in ordered
+        ],
+    )
+
+    report = {
+        "benchmark": "micro",
+        "meta": {
+            **environment_info(),
+            "iterations": args.iterations,
+            "alloc_calls": args.alloc_calls,
+            "users": args.users,
+            "overrides": parse_overrides(args.set),
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        rows, regressions = compare_results(
+            results, baseline["results"], COMPARE_METRICS, args.threshold
+        )
+        print()
+        print_table(["benchmark", "metric", "baseline", "current", "change", ""], rows)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            exit_code = 1
+
+    if args.output:
+        save_baseline(args.output, report)
+        print(f"\nBaseline saved to {args.output}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Tambah root project ke path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.app.services.password_hasher import password_hasher
+from src.app.services.user_transfer_service import UserTransferService
+from src.database.session import async_engine
+
+
+async def import_users(args):
+    fmt = args.format or UserTransferService.detect_format(args.file)
+    with open(args.file, encoding="utf-8-sig", newline="") as stream:
+        report = await UserTransferService.import_users(stream, fmt, args.batch_size)
+    print(json.dumps(report, indent=2))
+
+
+async def export_users(args):
+    fmt = args.format or UserTransferService.detect_format(args.file)
+    out = sys.stdout if args.file == "-" else open(args.file, "w", newline="")
+    try:
+        async for chunk in UserTransferService.export_users(fmt, args.chunk_size):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+async def run(args):
+    try:
+        await args.handler(args)
+    finally:
+        password_hasher.shutdown()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import / export users")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import users dari CSV/JSONL")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"])
+    import_parser.add_argument("--batch-size", type=int)
+    import_parser.set_defaults(handler=import_users)
+
+    export_parser = commands.add_parser("export", help="Export users ke CSV/JSONL")
+    export_parser.add_argument("file", help="Output file, '-' untuk stdout")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"])
+    export_parser.add_argument("--chunk-size", type=int)
+    export_parser.set_defaults(handler=export_users)
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import pytest
+
+# Config dibaca waktu import (src/config/env.py): arahkan ke .env test
+# sebelum module src di-import
+_env_dir = tempfile.mkdtemp(prefix="fastapi-starter-test-")
+_env_file = os.path.join(_env_dir, ".env")
+with open(_env_file, "w") as f:
+    f.write(
+        f'DATABASE_URL="sqlite:///{_env_dir}/test.db"\n'
+        'SECRET_KEY="test-secret-key"\n'
+        'LOG_LEVEL="WARNING"\n'
+        # bcrypt cost minimum: hash di test (dan kalibrasi warmup) tetap cepat
+        'PASSWORD_HASH_ROUNDS="4"\n'
+        'PASSWORD_HASH_MIN_ROUNDS="4"\n'
+    )
+os.environ["ENV_FILE"] = _env_file
+
+from src.database.factories.user_factory import User  # noqa: E402
+from src.database.session import Base, engine  # noqa: E402
+
+Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Setiap test mulai dengan tabel users kosong"""
+    yield
+    with engine.begin() as conn:
+        conn.execute(User.__table__.delete())
+
+
+@pytest.fixture(autouse=True)
+def reset_state(monkeypatch):
+    """State in-process (revocation, cache) tidak bocor antar test"""
+    from src.app.cache.bloom import BloomFilter
+    from src.app.cache.memory_backend import MemoryCacheBackend
+    from src.app.cache.token_cache import token_cache
+    from src.app.cache.user_cache import user_cache
+    from src.app.services.revocation_service import RevocationService
+
+    # Revocation store + bloom filter baru per test
+    monkeypatch.setattr(RevocationService, "backend", MemoryCacheBackend())
+    monkeypatch.setattr(RevocationService, "_bloom", BloomFilter(capacity=1000))
+    monkeypatch.setattr(RevocationService, "_bloom_saturated_logged", False)
+    monkeypatch.setattr(RevocationService, "_user_revoked_at", {})
+    # Rebuild bloom background cuma kalau test yang minta
+    monkeypatch.setattr(RevocationService, "_bloom_rebuild_at", float("inf"))
+    monkeypatch.setattr(RevocationService, "_bloom_rebuild_task", None)
+    # Snapshot stats disimpan di cache backend
+    monkeypatch.setattr(
+        "src.app.services.user_service.cache_backend", MemoryCacheBackend()
+    )
+    yield
+    user_cache.clear()
+    token_cache.clear()
+
+
+@pytest.fixture
+def client():
+    """TestClient dengan lifespan app jalan (startup/shutdown)"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def api_client(client, monkeypatch):
+    """TestClient dengan API key terpasang (route /users wajib API key)"""
+    import src.config.env as env
+
+    monkeypatch.setattr(env, "API_KEY", "test-api-key")
+    client.headers["X-API-Key"] = "test-api-key"
+    return client
@@ -0,0 +1,77 @@
+PASSWORD = "Secret123"
+
+
+def register(client, username: str, email: str = None):
+    return client.post(
+        "/auth/register",
+        json={
+            "email": email or f"{username}@example.com",
+            "username": username,
+            "password": PASSWORD,
+        },
+    )
+
+
+def test_register_login_and_me(client):
+    response = register(client, "alice")
+    assert response.status_code == 200
+    assert response.json()["data"]["user"]["username"] == "alice"
+
+    response = client.post(
+        "/auth/login", json={"username": "alice", "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    token = response.json()["data"]["access_token"]
+
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["data"]["email"] == "alice@example.com"
+
+
+def test_login_with_wrong_password(client):
+    register(client, "alice")
+
+    response = client.post(
+        "/auth/login", json={"username": "alice", "password": "Wrong1234"}
+    )
+    assert response.status_code == 401
+
+
+def test_register_conflicts(client):
+    register(client, "alice")
+
+    response = register(client, "alice", email="other@example.com")
+    assert response.status_code == 409
+    assert response.json()["detail"]["message"] == "Username already taken"
+
+    response = register(client, "alice2", email="ALICE@example.com")
+    assert response.status_code == 409
+    assert response.json()["detail"]["message"] == "Email already registered"
+
+
+def test_refresh_rotation(client):
+    refresh_token = register(client, "alice").json()["data"]["refresh_token"]
+
+    response = client.post("/auth/refresh", headers={"refresh-token": refresh_token})
+    assert response.status_code == 200
+    assert response.json()["data"]["refresh_token"] != refresh_token
+
+    response = client.post("/auth/refresh", headers={"refresh-token": refresh_token})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_tokens(client):
+    tokens = register(client, "alice").json()["data"]
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post(
+        "/auth/logout",
+        headers={**headers, "refresh-token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 200
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    response = client.post(
+        "/auth/refresh", headers={"refresh-token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,213 @@
+import asyncio
+import time
+
+import pytest
+
+import src.config.env as env
+from src.app.cache.bloom import BloomFilter
+from src.app.exceptions import (
+    AccountDeactivatedError,
+    InvalidRefreshTokenError,
+    TokenRevokedError,
+)
+from src.app.schemas.user_schema import UserCreate
+from src.app.services.auth_service import AuthService
+from src.app.services.revocation_service import RevocationService
+from src.app.services.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def user():
+    return await UserService.create_user(
+        UserCreate(email="alice@example.com", username="alice", password="Secret123")
+    )
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(env, "AUTH_STATELESS_CLAIMS", True)
+
+
+async def test_token_carries_status_claims(user):
+    token_data = AuthService.verify_token(AuthService.create_user_access_token(user))
+
+    assert token_data.user_id == user.id
+    assert token_data.is_active is True
+    assert token_data.is_verified is False
+    assert token_data.issued_at is not None
+
+
+async def test_fresh_claims_skip_database(user, stateless, monkeypatch):
+    token = AuthService.create_user_access_token(user)
+
+    async def no_db(*args):
+        raise AssertionError("database lookup")
+
+    monkeypatch.setattr(UserService, "get_user_by_username", no_db)
+    monkeypatch.setattr(UserService, "get_user_by_id", no_db)
+
+    principal = await AuthService.get_current_principal(token)
+    assert principal.user_id == user.id
+
+
+async def test_user_change_makes_claims_stale(user, stateless):
+    token = AuthService.create_user_access_token(user)
+
+    await UserService.deactivate_user(user.id)
+
+    with pytest.raises(AccountDeactivatedError):
+        await AuthService.get_current_principal(token)
+
+
+async def test_old_claims_are_checked_against_database(user, stateless, monkeypatch):
+    token = AuthService.create_user_access_token(user)
+    monkeypatch.setattr(env, "AUTH_CLAIMS_MAX_AGE_SECONDS", -1)
+
+    assert not AuthService.claims_are_fresh(AuthService.verify_token(token))
+    principal = await AuthService.get_current_principal(token)
+    assert principal.username == "alice"
+
+
+async def test_stale_claims_authenticate_token_once(user, monkeypatch):
+    token = AuthService.create_user_access_token(user)
+    calls = []
+    authenticate = AuthService.authenticate_token
+
+    async def counting_authenticate(token):
+        calls.append(token)
+        return await authenticate(token)
+
+    monkeypatch.setattr(AuthService, "authenticate_token", counting_authenticate)
+
+    principal = await AuthService.get_current_principal(token)
+    assert principal.user_id == user.id
+    assert len(calls) == 1
+
+
+# =============== Token Cache ===============
+async def test_verify_token_is_cached(user, monkeypatch):
+    import src.app.services.auth_service as auth_service
+
+    token = AuthService.create_user_access_token(user)
+    decodes = []
+    decode = auth_service.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_service.jwt, "decode", counting_decode)
+
+    assert AuthService.verify_token(token).user_id == user.id
+    assert AuthService.verify_token(token).user_id == user.id
+    assert len(decodes) == 1
+
+
+async def test_cached_token_is_still_checked_for_revocation(user):
+    token = AuthService.create_user_access_token(user)
+    await AuthService.authenticate_token(token)
+
+    await AuthService.logout(token)
+
+    with pytest.raises(TokenRevokedError):
+        await AuthService.authenticate_token(token)
+
+
+# =============== Revocation ===============
+async def test_revoke_token_by_jti():
+    assert not await RevocationService.is_token_revoked("jti-1")
+
+    await RevocationService.revoke_token("jti-1", time.time() + 60)
+
+    assert await RevocationService.is_token_revoked("jti-1")
+    assert not await RevocationService.is_token_revoked("jti-2")
+    assert not await RevocationService.is_token_revoked(None)
+
+
+async def test_revoke_expired_token_is_not_stored():
+    await RevocationService.revoke_token("jti-1", time.time() - 1)
+    assert not await RevocationService.is_token_revoked("jti-1")
+
+
+async def test_saturated_bloom_still_checks_store(monkeypatch):
+    monkeypatch.setattr(RevocationService, "_bloom", BloomFilter(capacity=2))
+    for i in range(3):
+        await RevocationService.revoke_token(f"jti-{i}", time.time() + 60)
+    assert RevocationService._bloom.saturated
+
+    assert await RevocationService.is_token_revoked("jti-0")
+    assert not await RevocationService.is_token_revoked("other")
+
+
+async def test_consume_token_once():
+    assert await RevocationService.consume_token("jti-1", time.time() + 60)
+    assert not await RevocationService.consume_token("jti-1", time.time() + 60)
+    assert await RevocationService.is_token_revoked("jti-1")
+
+
+async def test_rebuild_bloom_drops_expired_jti(monkeypatch):
+    monkeypatch.setattr(RevocationService, "_bloom", BloomFilter(capacity=4))
+    for i in range(4):
+        await RevocationService.revoke_token(f"old-{i}", time.time() + 0.05)
+    await RevocationService.revoke_token("live", time.time() + 60)
+    assert RevocationService._bloom.saturated
+
+    await asyncio.sleep(0.1)
+    assert await RevocationService.rebuild_bloom() == 1
+
+    assert not RevocationService._bloom.saturated
+    assert "live" in RevocationService._bloom
+    assert await RevocationService.is_token_revoked("live")
+    assert not await RevocationService.is_token_revoked("old-0")
+
+
+# =============== Refresh Rotation & Logout ===============
+async def test_refresh_rotates_and_rejects_reuse(user):
+    refresh_token = AuthService.create_refresh_token(user.id)
+
+    result = await AuthService.refresh_access_token(refresh_token)
+    assert result["refresh_token"] != refresh_token
+    assert AuthService.verify_token(result["access_token"]).user_id == user.id
+
+    with pytest.raises(InvalidRefreshTokenError):
+        await AuthService.refresh_access_token(refresh_token)
+
+    # Token hasil rotation tetap bisa dipakai (sekali)
+    await AuthService.refresh_access_token(result["refresh_token"])
+
+
+async def test_concurrent_refresh_rotates_once(user):
+    refresh_token = AuthService.create_refresh_token(user.id)
+
+    results = await asyncio.gather(
+        *(AuthService.refresh_access_token(refresh_token) for _ in range(8)),
+        return_exceptions=True,
+    )
+
+    succeeded = [r for r in results if isinstance(r, dict)]
+    assert len(succeeded) == 1
+    assert all(
+        isinstance(r, InvalidRefreshTokenError) for r in results if r not in succeeded
+    )
+
+
+async def test_refresh_rejects_access_token(user):
+    access_token = AuthService.create_user_access_token(user)
+
+    with pytest.raises(InvalidRefreshTokenError):
+        await AuthService.refresh_access_token(access_token)
+
+
+async def test_logout_revokes_access_and_refresh_token(user):
+    access_token = AuthService.create_user_access_token(user)
+    refresh_token = AuthService.create_refresh_token(user.id)
+    await AuthService.authenticate_token(access_token)
+
+    await AuthService.logout(access_token, refresh_token)
+
+    with pytest.raises(TokenRevokedError):
+        await AuthService.authenticate_token(access_token)
+    with pytest.raises(InvalidRefreshTokenError):
+        await AuthService.refresh_access_token(refresh_token)
@@ -0,0 +1,70 @@
+import pytest
+
+from src.scripts.benchmark_common import (
+    compare_results,
+    parse_overrides,
+    percentile,
+    summarize_latencies,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_percentile_nearest_rank():
+    values = [0.1, 0.2, 0.3, 0.4]
+
+    assert percentile(values, 50) == 0.2
+    assert percentile(values, 99) == 0.4
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_latencies():
+    summary = summarize_latencies([0.003, 0.001, 0.002], elapsed=0.5)
+
+    assert summary["count"] == 3
+    assert summary["p50_ms"] == 2.0
+    assert summary["max_ms"] == 3.0
+    assert summary["rps"] == 6.0
+
+
+def test_parse_overrides():
+    assert parse_overrides(["A=1", "B=x=y", "C="]) == {"A": "1", "B": "x=y", "C": ""}
+
+    with pytest.raises(ValueError):
+        parse_overrides(["MISSING_VALUE"])
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"login": {"rps": 100, "p95_ms": 10}}
+    current = {"login": {"rps": 80, "p95_ms": 10.5}, "new": {"rps": 1}}
+
+    rows, regressions = compare_results(
+        current, baseline, [("rps", True), ("p95_ms", False)], threshold=0.1
+    )
+
+    assert len(rows) == 2
+    assert regressions == ["login rps: 100 -> 80"]
+
+
+async def test_micro_benchmarks_run(monkeypatch):
+    from src.app.cache.token_cache import token_cache
+    from src.app.cache.user_cache import user_cache
+    from src.scripts.benchmark_micro import (
+        build_benchmarks,
+        measure_allocations,
+        measure_time,
+        seed_users,
+    )
+
+    benchmarks = build_benchmarks(await seed_users(5))
+
+    for benchmark in benchmarks:
+        monkeypatch.setattr(token_cache, "enabled", benchmark.cached)
+        monkeypatch.setattr(user_cache, "enabled", benchmark.cached)
+
+        timing = await measure_time(benchmark, 2)
+        allocations = await measure_allocations(benchmark, 1)
+
+        assert timing["iterations"] == 2
+        assert timing["mean_us"] > 0
+        assert allocations["peak_kb"] >= 0
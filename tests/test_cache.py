@@ -0,0 +1,189 @@
+import time
+
+import pytest
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from src.app.cache.bloom import BloomFilter
+from src.app.cache.lru import TTLCache
+from src.app.cache.token_cache import TokenCache
+from src.app.cache.user_cache import UserCache, user_cache
+from src.app.schemas.user_schema import TokenData, UserCreate, UserUpdate
+from src.app.services.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+
+# =============== TTLCache ===============
+def test_ttl_cache_get_set():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = TTLCache(max_size=10, ttl=30)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=5)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get("default") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" sekarang paling lama tidak dipakai
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_set_existing_key_refreshes_position():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+# =============== BloomFilter ===============
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate_within_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.02
+
+
+def test_bloom_filter_saturation_and_clear():
+    bloom = BloomFilter(capacity=10, error_rate=0.01)
+    for i in range(9):
+        bloom.add(f"jti-{i}")
+    assert not bloom.saturated
+
+    bloom.add("jti-9")
+    assert bloom.saturated
+
+    bloom.clear()
+    assert not bloom.saturated
+    assert bloom.count == 0
+    assert "jti-0" not in bloom
+
+
+# =============== TokenCache ===============
+def test_token_cache_expires_at_token_exp():
+    cache = TokenCache(max_size=10)
+    cache.set("live", TokenData(user_id=1, expires_at=int(time.time()) + 60))
+    cache.set("expired", TokenData(user_id=1, expires_at=int(time.time()) - 1))
+    cache.set("no-exp", TokenData(user_id=1))
+
+    assert cache.get("live").user_id == 1
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+    assert cache.stats()["size"] == 1
+
+
+def test_token_cache_evict():
+    cache = TokenCache(max_size=10)
+    cache.set("token", TokenData(user_id=1, expires_at=int(time.time()) + 60))
+
+    cache.evict("token")
+
+    assert cache.get("token") is None
+
+
+# =============== UserCache ===============
+@pytest.fixture
+async def user():
+    return await UserService.create_user(
+        UserCreate(email="alice@example.com", username="alice", password="Secret123")
+    )
+
+
+async def test_lookups_read_through_cache(user):
+    await UserService.get_user_by_id(user.id)
+    hits = user_cache.local_hits
+
+    cached = await UserService.get_user_by_username("alice")
+    assert cached.id == user.id
+    assert (await UserService.get_user_by_email("alice@example.com")).id == user.id
+    assert user_cache.local_hits == hits + 2
+
+
+async def test_cached_user_is_detached_copy(user):
+    first = await UserService.get_user_by_id(user.id)
+    second = await UserService.get_user_by_id(user.id)
+
+    assert first is not second
+    assert first.username == second.username == "alice"
+
+
+async def test_password_hash_is_not_cached(user):
+    await UserService.get_user_by_id(user.id)
+    cached = await UserService.get_user_by_id(user.id)
+
+    assert "password" not in user_cache._users.get(user.id)
+    with pytest.raises(DetachedInstanceError):
+        cached.password
+
+
+async def test_update_invalidates_cache(user):
+    await UserService.get_user_by_id(user.id)
+
+    await UserService.update_user(user.id, UserUpdate(username="alice2"))
+
+    assert (await UserService.get_user_by_id(user.id)).username == "alice2"
+    # Index lama ("alice") sudah stale, harus miss lalu ke database
+    assert await UserService.get_user_by_username("alice") is None
+
+
+async def test_status_change_invalidates_cache(user):
+    await UserService.get_user_by_id(user.id)
+
+    await UserService.deactivate_user(user.id)
+
+    assert not (await UserService.get_user_by_id(user.id)).is_active
+
+
+async def test_disabled_cache_is_pass_through():
+    cache = UserCache(max_size=10, ttl=60, enabled=False)
+
+    assert await cache.set(None) is None
+    assert await cache.get_by_id(1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_health_cache_route(client):
+    response = client.get("/health/cache")
+
+    assert response.status_code == 200
+    assert "hit_rate" in response.json()["user_cache"]
+    assert "hit_rate" in response.json()["token_cache"]
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from src.app.cache.backend import cache_key
+from src.app.cache.memory_backend import MemoryCacheBackend
+from src.app.cache.redis_backend import RedisCacheBackend
+from src.app.cache.user_cache import UserCache
+from src.database.factories.user_factory import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request):
+    if request.param == "memory":
+        backend = MemoryCacheBackend()
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisCacheBackend(client=fakeredis.FakeAsyncRedis())
+
+    yield backend
+    await backend.close()
+
+
+async def test_get_set_delete(backend):
+    await backend.set("a", b"1")
+
+    assert await backend.get("a") == b"1"
+    await backend.delete("a", "missing")
+    assert await backend.get("a") is None
+
+
+async def test_ttl_expires(backend):
+    await backend.set("short", b"1", ttl=0.05)
+    await backend.set_many({"m1": b"1", "m2": b"2"}, ttl=0.05)
+    await backend.set("long", b"1", ttl=60)
+
+    await asyncio.sleep(0.1)
+    assert await backend.get_many(["short", "m1", "m2", "long"]) == [
+        None,
+        None,
+        None,
+        b"1",
+    ]
+
+
+async def test_incr_sets_ttl_on_create_only(backend):
+    assert await backend.incr("counter", ttl=0.1) == 1
+    await asyncio.sleep(0.06)
+    assert await backend.incr("counter", 2, ttl=0.1) == 3
+
+    # TTL tidak di-reset oleh increment kedua
+    await asyncio.sleep(0.06)
+    assert await backend.get("counter") is None
+
+
+async def test_set_if_absent(backend):
+    assert await backend.set_if_absent("once", b"1", ttl=60)
+    assert not await backend.set_if_absent("once", b"2", ttl=60)
+    assert await backend.get("once") == b"1"
+
+
+async def test_set_if_absent_after_expiry(backend):
+    assert await backend.set_if_absent("once", b"1", ttl=0.05)
+    await asyncio.sleep(0.1)
+    assert await backend.set_if_absent("once", b"2")
+
+
+async def test_scan_by_prefix(backend):
+    await backend.set_many({"user:1": b"a", "user:2": b"b", "other:1": b"c"})
+
+    assert await backend.scan("user:") == {"user:1": b"a", "user:2": b"b"}
+
+
+async def test_publish_reaches_subscribers(backend):
+    received = []
+    await backend.subscribe("channel", received.append)
+
+    await backend.publish("channel", "42")
+
+    for _ in range(50):
+        if received:
+            break
+        await asyncio.sleep(0.01)
+    assert received == ["42"]
+
+
+# =============== UserCache L2 ===============
+class SharedMemoryBackend(MemoryCacheBackend):
+    """Memory backend yang berperan sebagai Redis untuk beberapa 'worker'"""
+
+    shared = True
+
+
+def make_user(**overrides) -> User:
+    data = {
+        "id": 1,
+        "email": "alice@example.com",
+        "username": "alice",
+        "password": "hash",
+        "is_active": True,
+        "is_verified": False,
+        "is_superuser": False,
+    }
+    data.update(overrides)
+    return User(**data)
+
+
+async def test_shared_cache_serves_other_workers():
+    shared = SharedMemoryBackend()
+    worker_a = UserCache(max_size=10, ttl=60, backend=shared, shared_ttl=60)
+    worker_b = UserCache(max_size=10, ttl=60, backend=shared, shared_ttl=60)
+
+    await worker_a.set(make_user())
+
+    assert (await worker_b.get_by_id(1)).username == "alice"
+    assert (await worker_b.get_by_identifier("alice@example.com")).id == 1
+    assert worker_b.stats()["shared_hits"] == 1
+    assert worker_b.stats()["local_hits"] == 1
+
+
+async def test_shared_cache_never_stores_password_hash():
+    shared = SharedMemoryBackend()
+    cache = UserCache(max_size=10, ttl=60, backend=shared, shared_ttl=60)
+
+    await cache.set(make_user(password="$2b$12$secret-hash"))
+
+    stored = await shared.scan("")
+    assert stored
+    assert not any(b"secret-hash" in value for value in stored.values())
+
+
+async def test_legacy_shared_entries_with_hash_are_ignored():
+    shared = SharedMemoryBackend()
+    cache = UserCache(max_size=10, ttl=60, backend=shared, shared_ttl=60)
+    # Entry format lama (tanpa versi, berisi hash) dari worker yang belum update
+    legacy = b'{"id":1,"username":"alice","email":"alice@example.com","password":"h"}'
+    await shared.set(cache_key("user", "id", 1), legacy)
+    await shared.set(cache_key("user", "username", "alice"), b"1")
+
+    assert await cache.get_by_id(1) is None
+    assert await cache.get_by_identifier("alice") is None
+
+
+async def test_invalidation_is_broadcast():
+    shared = SharedMemoryBackend()
+    worker_a = UserCache(max_size=10, ttl=60, backend=shared)
+    worker_b = UserCache(max_size=10, ttl=60, backend=shared)
+    await worker_b.start()
+
+    await worker_a.set(make_user())
+    await worker_b.get_by_id(1)  # sekarang ada di L1 worker b
+
+    await worker_a.invalidate(1)
+
+    assert await worker_b.get_by_id(1) is None
+    assert worker_b.stats()["misses"] == 1
+
+
+async def test_memory_backend_is_local_only():
+    cache = UserCache(max_size=10, ttl=60, backend=MemoryCacheBackend())
+    await cache.set(make_user())
+
+    assert cache.stats()["backend"] == "local"
+    assert await cache.backend.scan("") == {}
@@ -0,0 +1,215 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import src.config.env as env
+from src.database.factories.user_factory import User
+from src.database.pool import InstrumentedAsyncQueuePool
+from src.database.session import (
+    async_engine,
+    check_database_health,
+    get_async_database_url,
+    get_async_db,
+    get_async_session,
+    get_pool_options,
+    release_connection,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgres://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("mysql+aiomysql://u:p@db/app", "mysql+aiomysql://u:p@db/app"),
+    ],
+)
+def test_async_url_derived_from_database_url(monkeypatch, url, expected):
+    monkeypatch.setattr(env, "ASYNC_DATABASE_URL", "")
+    assert get_async_database_url(url) == expected
+
+
+def test_async_url_override(monkeypatch):
+    monkeypatch.setattr(env, "ASYNC_DATABASE_URL", "sqlite+aiosqlite:///other.db")
+    assert get_async_database_url("sqlite:///app.db") == "sqlite+aiosqlite:///other.db"
+
+
+def test_async_engine_uses_async_driver():
+    assert async_engine.dialect.is_async
+    assert async_engine.url.drivername == "sqlite+aiosqlite"
+
+
+async def test_get_async_db_runs_queries():
+    async with get_async_db() as db:
+        assert isinstance(db, AsyncSession)
+        assert await db.scalar(select(1)) == 1
+
+
+async def test_get_async_session_dependency():
+    dependency = get_async_session()
+    db = await dependency.__anext__()
+    assert isinstance(db, AsyncSession)
+    assert await db.scalar(select(1)) == 1
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+
+def test_pool_options_from_env():
+    options = get_pool_options("sqlite:///app.db", InstrumentedAsyncQueuePool)
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == env.DB_POOL_SIZE
+    assert options["max_overflow"] == env.DB_MAX_OVERFLOW
+    assert get_pool_options("sqlite://", InstrumentedAsyncQueuePool) == {}
+    assert get_pool_options("sqlite:///:memory:", InstrumentedAsyncQueuePool) == {}
+
+
+async def test_pool_metrics_count_checkouts():
+    before = async_engine.pool.metrics.checkouts
+    async with get_async_db() as db:
+        await db.scalar(select(1))
+
+    assert isinstance(async_engine.pool, InstrumentedAsyncQueuePool)
+    assert async_engine.pool.metrics.checkouts > before
+
+
+async def test_check_database_health():
+    health = await check_database_health()
+
+    assert health == {"status": "healthy", "ping_ms": health["ping_ms"]}
+    assert health["ping_ms"] >= 0
+
+
+async def test_check_database_health_hides_error(monkeypatch, caplog):
+    def broken_connect():
+        raise OSError("connection refused to db.internal:5432")
+
+    monkeypatch.setattr(
+        "src.database.session.async_engine", SimpleNamespace(connect=broken_connect)
+    )
+
+    health = await check_database_health()
+
+    assert health == {"status": "unhealthy", "error": "Database unavailable"}
+    assert "db.internal" in caplog.text
+
+
+def test_health_db_route(client):
+    response = client.get("/health/db")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert "pool" not in response.json()
+
+
+def test_health_db_pool_requires_api_key(client, monkeypatch):
+    assert client.get("/health/db/pool").status_code == 403
+
+    monkeypatch.setattr(env, "API_KEY", "test-api-key")
+    assert client.get("/health/db/pool").status_code == 403
+
+    response = client.get("/health/db/pool", headers={"X-API-Key": "test-api-key"})
+    assert response.status_code == 200
+    assert response.json()["pool_class"] == "InstrumentedAsyncQueuePool"
+    assert "checkouts" in response.json()
+
+
+async def count_users() -> int:
+    async with get_async_db() as db:
+        return await db.scalar(select(func.count()).select_from(User))
+
+
+async def test_nested_get_async_db_shares_session():
+    async with get_async_db() as outer:
+        async with get_async_db() as inner:
+            assert inner is outer
+
+    async with get_async_db() as other:
+        assert other is not outer
+
+
+async def test_get_async_session_rolls_back_on_error():
+    dependency = get_async_session()
+    db = await dependency.__anext__()
+    db.add(User(email="alice@example.com", username="alice", password="x"))
+    await db.flush()
+
+    # Nested get_async_db lihat row yang belum di-commit (session sama)
+    assert await count_users() == 1
+
+    with pytest.raises(RuntimeError):
+        await dependency.athrow(RuntimeError("request failed"))
+
+    assert await count_users() == 0
+
+
+async def test_release_connection_ends_transaction():
+    async with get_async_db() as db:
+        await db.scalar(select(1))
+        assert db.in_transaction()
+
+        await release_connection()
+        assert not db.in_transaction()
+        assert await db.scalar(select(1)) == 1
+
+
+async def test_release_connection_refuses_pending_changes():
+    async with get_async_db() as db:
+        db.add(User(email="alice@example.com", username="alice", password="x"))
+
+        with pytest.raises(RuntimeError):
+            await release_connection()
+
+        await db.rollback()
+
+    assert await count_users() == 0
+
+
+def test_connection_released_during_bcrypt(client, monkeypatch):
+    from src.app.services.password_hasher import password_hasher
+
+    checked_out = []
+
+    def tracking(method):
+        async def wrapper(*args):
+            checked_out.append(async_engine.pool.checkedout())
+            return await method(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(password_hasher, "hash", tracking(password_hasher.hash))
+    monkeypatch.setattr(password_hasher, "verify", tracking(password_hasher.verify))
+
+    client.post(
+        "/auth/register",
+        json={
+            "email": "alice@example.com",
+            "username": "alice",
+            "password": "Secret123",
+        },
+    )
+    response = client.post(
+        "/auth/login", json={"username": "alice", "password": "Secret123"}
+    )
+    assert response.status_code == 200
+
+    token = response.json()["data"]["access_token"]
+    response = client.post(
+        "/auth/change-password",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "current_password": "Secret123",
+            "new_password": "Secret456",
+            "confirm_password": "Secret456",
+        },
+    )
+    assert response.status_code == 200
+
+    # register hash, login verify, change-password verify + hash
+    assert checked_out == [0, 0, 0, 0]
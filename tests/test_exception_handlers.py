@@ -0,0 +1,158 @@
+import json
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import ExpiredSignatureError, JWTError
+from jose.exceptions import JWTClaimsError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.app.exception_handlers import (
+    register_exception_handlers,
+    render_error,
+    resolve_error,
+)
+from src.app.exceptions import (
+    AppError,
+    DatabaseBusyError,
+    InvalidCredentialsError,
+    InvalidTokenError,
+    TokenExpiredError,
+    UserNotFoundError,
+)
+from src.app.services.auth_service import AuthService
+from src.database.factories.user_factory import User
+from src.database.session import engine
+
+
+# =============== Dispatch ===============
+def test_resolve_error_by_type():
+    error = UserNotFoundError()
+
+    assert resolve_error(error) is error
+    assert isinstance(resolve_error(ExpiredSignatureError()), TokenExpiredError)
+    assert isinstance(resolve_error(PoolTimeoutError()), DatabaseBusyError)
+    assert resolve_error(RuntimeError("boom")) is None
+
+
+def test_resolve_error_walks_mro():
+    # JWTClaimsError tidak ada di table, parent-nya (JWTError) ada
+    assert type(resolve_error(JWTClaimsError())) is InvalidTokenError
+
+
+# =============== Rendering ===============
+def test_default_error_uses_prebuilt_body():
+    response = render_error(InvalidCredentialsError())
+    body = json.loads(response.body)["detail"]
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert body["error_code"] == "INVALID_CREDENTIALS"
+    assert body["message"] == "Invalid credentials"
+    assert body["timestamp"]
+
+
+def test_custom_message_and_details():
+    response = render_error(UserNotFoundError("No user 7", details={"id": 7}))
+    body = json.loads(response.body)["detail"]
+
+    assert response.status_code == 404
+    assert body["message"] == "No user 7"
+    assert body["details"] == {"id": 7}
+
+
+# =============== Handlers ===============
+@pytest.fixture
+def app_client():
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/pool-timeout")
+    async def pool_timeout():
+        raise PoolTimeoutError("QueuePool limit reached")
+
+    @app.get("/jwt")
+    async def jwt_error():
+        raise JWTError("Signature verification failed")
+
+    @app.get("/app-error")
+    async def app_error():
+        raise AppError()
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_library_errors_are_mapped(app_client):
+    response = app_client.get("/pool-timeout")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["error_code"] == "SERVICE_BUSY"
+
+    response = app_client.get("/jwt")
+    assert response.status_code == 401
+    assert response.json()["detail"]["message"] == "Invalid token"
+
+
+def test_base_app_error_is_500(app_client):
+    response = app_client.get("/app-error")
+
+    assert response.status_code == 500
+    assert response.json()["detail"]["error_code"] == "INTERNAL_ERROR"
+
+
+# =============== Routes ===============
+def register(client, username="alice"):
+    return client.post(
+        "/auth/register",
+        json={
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": "Secret123",
+        },
+    ).json()["data"]
+
+
+def test_missing_token_is_401(client):
+    response = client.get("/auth/me")
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_expired_token_is_401(client):
+    user = register(client)["user"]
+    token = AuthService.create_access_token(
+        {"sub": user["username"], "user_id": user["id"]},
+        expires_delta=timedelta(seconds=-1),
+    )
+
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"]["message"] == "Token has expired"
+
+
+def test_deactivated_login_is_403(client):
+    register(client)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.update().values(is_active=False))
+
+    response = client.post(
+        "/auth/login", json={"username": "alice", "password": "Secret123"}
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"]["error_code"] == "ACCOUNT_DEACTIVATED"
+
+
+def test_wrong_password_is_401(client):
+    register(client)
+
+    response = client.post(
+        "/auth/login", json={"username": "alice", "password": "Wrong1234"}
+    )
+
+    assert response.status_code == 401
+    assert response.json()["detail"]["error_code"] == "INVALID_CREDENTIALS"
@@ -0,0 +1,171 @@
+import io
+import json
+import logging
+import queue
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.app.middleware import AccessLogMiddleware
+import src.config.logger as logger_module
+from src.config.logger import (
+    BatchingStreamHandler,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    flush_logging,
+)
+
+
+def make_record(message="hello %s", args=("world",), level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, message, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+# =============== Formatter & Handlers ===============
+def test_json_formatter_includes_extra_fields():
+    line = JsonFormatter().format(make_record(action="LOGIN", status=200))
+    data = json.loads(line)
+
+    assert data["message"] == "hello world"
+    assert data["level"] == "INFO"
+    assert data["action"] == "LOGIN"
+    assert data["status"] == 200
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = make_record("failed", (), exc_info=sys.exc_info())
+
+    data = json.loads(JsonFormatter().format(record))
+    assert "RuntimeError: boom" in data["exc_info"]
+
+
+def test_queue_handler_renders_message_on_caller_thread():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    args = {"user": "alice"}
+    handler.handle(make_record("login %s", (args,)))
+    args["user"] = "changed"
+
+    queued = handler.queue.get_nowait()
+
+    assert queued.getMessage() == "login {'user': 'alice'}"
+    assert queued.args is None
+
+
+def test_queue_handler_keeps_exception_for_listener():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        handler.handle(make_record("failed %s", ("login",), exc_info=sys.exc_info()))
+
+    queued = handler.queue.get_nowait()
+    data = json.loads(JsonFormatter().format(queued))
+
+    assert data["message"] == "failed login"
+    assert "RuntimeError: boom" in data["exc_info"]
+    assert "Traceback" not in data["message"]
+
+
+def test_flush_logging_wait_is_bounded(monkeypatch):
+    log_queue = queue.Queue()
+    flushed = []
+    listener = SimpleNamespace(
+        queue=log_queue, _thread=object(), flush=lambda: flushed.append(True)
+    )
+    monkeypatch.setattr(logger_module, "_listener", listener)
+
+    # Record belum diproses listener: berhenti setelah timeout
+    log_queue.put(make_record())
+    assert flush_logging(timeout=0.05) is False
+
+    log_queue.get_nowait()
+    log_queue.task_done()
+    assert flush_logging(timeout=0.05) is True
+    assert flushed == [True, True]
+
+
+def test_queue_handler_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_batching_handler_writes_per_batch():
+    stream = io.StringIO()
+    handler = BatchingStreamHandler(stream, batch_size=3, flush_interval=60)
+
+    handler.emit(make_record())
+    handler.emit(make_record())
+    assert stream.getvalue() == ""
+
+    handler.emit(make_record())
+    assert stream.getvalue().count("\n") == 3
+
+
+def test_batching_handler_flushes_errors_immediately():
+    stream = io.StringIO()
+    handler = BatchingStreamHandler(stream, batch_size=100, flush_interval=60)
+
+    handler.emit(make_record())
+    handler.emit(make_record("failed", (), level=logging.ERROR))
+
+    assert stream.getvalue().count("\n") == 2
+
+
+# =============== Access Log ===============
+@pytest.fixture
+def access_app():
+    app = FastAPI()
+
+    @app.get("/action/{name}")
+    async def action(name: str, request: Request):
+        request.state.action = name
+        request.state.user_id = 7
+        return {}
+
+    @app.get("/error")
+    async def error(request: Request):
+        request.state.action = "NOISY"
+        raise RuntimeError("boom")
+
+    return app
+
+
+def access_records(caplog):
+    return [r for r in caplog.records if r.name == "access"]
+
+
+def test_access_log_one_record_per_request(access_app, caplog):
+    client = TestClient(AccessLogMiddleware(access_app, sample_rates={}))
+
+    with caplog.at_level(logging.INFO, logger="access"):
+        client.get("/action/LOGIN")
+
+    (record,) = access_records(caplog)
+    assert record.action == "LOGIN"
+    assert record.user == 7
+    assert record.status == 200
+    assert record.path == "/action/LOGIN"
+    assert record.latency_ms >= 0
+
+
+def test_access_log_sampling_keeps_server_errors(access_app, caplog):
+    app = AccessLogMiddleware(access_app, sample_rates={"NOISY": 0.0})
+    client = TestClient(app, raise_server_exceptions=False)
+
+    with caplog.at_level(logging.INFO, logger="access"):
+        client.get("/action/NOISY")
+        client.get("/error")
+
+    assert [r.status for r in access_records(caplog)] == [500]
@@ -0,0 +1,91 @@
+import pytest
+
+from src.app.metrics import Counter, Gauge, Histogram, MetricsRegistry, timed
+
+pytestmark = pytest.mark.anyio
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("kind",))
+    gauge = registry.gauge("queue_depth", "Queue depth")
+
+    counter.inc("email")
+    counter.inc("email", amount=2)
+    gauge.set(5)
+    gauge.dec()
+
+    lines = registry.render().splitlines()
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{kind="email"} 3' in lines
+    assert "# TYPE queue_depth gauge" in lines
+    assert "queue_depth 4" in lines
+
+
+def test_callback_metric_read_at_render():
+    values = {(): 1}
+    gauge = Gauge("pending", "Pending", callback=lambda: values)
+
+    values[()] = 7
+    assert "pending 7" in gauge.render()
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3, "/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_label_values_escaped():
+    counter = Counter("errors_total", "Errors", ("message",))
+    counter.inc('say "hi"\n')
+
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in counter.render()
+
+
+def test_duplicate_metric_rejected():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs")
+
+    with pytest.raises(ValueError):
+        registry.counter("jobs_total", "Jobs")
+
+
+async def test_timed_observes_sync_and_async():
+    histogram = Histogram("call_seconds", "Calls", ("fn",))
+
+    @timed(histogram, "sync")
+    def sync_call():
+        return 1
+
+    @timed(histogram, "async")
+    async def async_call():
+        return 2
+
+    assert sync_call() == 1
+    assert await async_call() == 2
+    assert 'call_seconds_count{fn="sync"} 1' in histogram.render()
+    assert 'call_seconds_count{fn="async"} 1' in histogram.render()
+
+
+def test_metrics_route_uses_route_template(client):
+    client.get("/health/db")
+    client.get("/missing/12345")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'method="GET",route="/health/db",status="200"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/missing/12345" not in body
+    assert "db_pool_checkouts_total" in body
+    assert 'cache_hits_total{cache="user"}' in body
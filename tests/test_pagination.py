@@ -0,0 +1,227 @@
+import base64
+import csv
+import io
+import json
+
+import pytest
+
+import src.config.env as env
+from src.app.controllers.base_controller import BaseController
+from src.app.exceptions import InvalidCursorError
+from src.app.services.search_service import SearchService
+from src.app.services.user_service import UserService
+from src.database.factories.user_factory import User
+from src.database.session import engine
+
+
+def insert_users(count: int, **overrides):
+    """Insert langsung (tanpa bcrypt) supaya listing test cepat"""
+    rows = [
+        {
+            "email": f"user{i}@example.com",
+            "username": f"user{i}",
+            "password": "hash",
+            "full_name": f"User {i}",
+            **overrides,
+        }
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), rows)
+
+
+# =============== Cursor ===============
+def test_cursor_round_trip():
+    values = {"search_rank": 0.75, "id": 42}
+    cursor = BaseController.encode_cursor(values)
+
+    assert "=" not in cursor
+    assert BaseController.decode_cursor(cursor, ["search_rank", "id"]) == values
+
+
+def test_cursor_rejects_different_fields():
+    cursor = BaseController.encode_cursor({"id": 1, "is_superuser": True})
+
+    with pytest.raises(InvalidCursorError):
+        BaseController.decode_cursor(cursor, ["id"])
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage!!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    ],
+)
+def test_cursor_rejects_tampered_value(cursor):
+    with pytest.raises(InvalidCursorError):
+        BaseController.decode_cursor(cursor, ["id"])
+
+
+# =============== /users ===============
+def test_list_users_walks_all_pages(api_client):
+    insert_users(5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"per_page": 2, **({"cursor": cursor} if cursor else {})}
+        response = api_client.get("/users", params=params)
+        assert response.status_code == 200
+
+        body = response.json()
+        seen += [user["username"] for user in body["data"]]
+        cursor = body["meta"]["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"user{i}" for i in range(5)]
+
+
+def test_list_users_totals(api_client):
+    insert_users(3)
+
+    pagination = api_client.get("/users", params={"total": "exact"}).json()["meta"][
+        "pagination"
+    ]
+    assert pagination["total"] == 3
+    assert pagination["has_next"] is False
+
+    pagination = api_client.get("/users").json()["meta"]["pagination"]
+    assert pagination["total"] is None
+
+
+def test_list_users_offset_mode(api_client):
+    insert_users(3)
+
+    body = api_client.get("/users", params={"page": 2, "per_page": 2}).json()
+
+    assert [user["username"] for user in body["data"]] == ["user2"]
+    assert body["meta"]["pagination"]["has_prev"] is True
+
+
+def test_list_users_invalid_cursor(api_client):
+    response = api_client.get("/users", params={"cursor": "garbage!!"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_CURSOR"
+
+
+def test_search_users_ranked(api_client):
+    insert_users(3)
+    with engine.begin() as conn:
+        conn.execute(
+            User.__table__.insert(),
+            {
+                "email": "zed@example.com",
+                "username": "zed",
+                "password": "hash",
+                "full_name": "User1 Fan",
+            },
+        )
+
+    body = api_client.get("/users/search", params={"q": "User1"}).json()
+
+    # Exact username dulu, baru prefix full_name
+    assert [user["username"] for user in body["data"]] == ["user1", "zed"]
+
+
+def test_search_users_walks_pages_by_rank_cursor(api_client):
+    insert_users(5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "user", "per_page": 2, **({"cursor": cursor} if cursor else {})}
+        body = api_client.get("/users/search", params=params).json()
+        seen += [user["username"] for user in body["data"]]
+        cursor = body["meta"]["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == [f"user{i}" for i in range(5)]
+    assert len(seen) == 5
+
+
+def test_search_escapes_like_wildcards():
+    assert SearchService.escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+
+def test_users_require_api_key(api_client, monkeypatch):
+    assert api_client.get("/users").status_code == 200
+    assert api_client.get("/users", headers={"X-API-Key": "wrong"}).status_code == 403
+
+    # Fail closed: tanpa API_KEY ter-config, /users tidak bisa diakses
+    monkeypatch.setattr(env, "API_KEY", "")
+    assert api_client.get("/users").status_code == 403
+
+
+# =============== /users/stats ===============
+def test_user_stats_route(api_client):
+    insert_users(2)
+    insert_users(1, username="inactive", email="inactive@example.com", is_active=False)
+
+    response = api_client.get("/users/stats")
+    assert response.status_code == 200
+    stats = response.json()["data"]
+    assert stats["total_users"] == 3
+    assert stats["active_users"] == 2
+    assert stats["inactive_users"] == 1
+    assert stats["verified_users"] == 0
+
+    insert_users(1, username="late", email="late@example.com")
+    assert api_client.get("/users/stats").json()["data"]["total_users"] == 3
+    response = api_client.get("/users/stats", params={"fresh": True})
+    assert response.json()["data"]["total_users"] == 4
+
+
+# =============== /users?format=ndjson|csv ===============
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Beberapa partition per stream
+    monkeypatch.setattr(env, "USER_EXPORT_CHUNK_SIZE", 2)
+
+
+def test_stream_users_ndjson(api_client, small_chunks):
+    insert_users(5)
+    insert_users(1, username="inactive", email="inactive@example.com", is_active=False)
+
+    response = api_client.get("/users", params={"format": "ndjson", "is_active": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(5)]
+    assert "password" not in rows[0]
+
+
+def test_stream_users_csv(api_client, small_chunks):
+    insert_users(5)
+
+    response = api_client.get("/users", params={"format": "csv"})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(5)]
+
+
+def test_stream_users_resumes_from_cursor(api_client, small_chunks):
+    insert_users(5)
+    cursor = api_client.get("/users", params={"per_page": 2}).json()["meta"][
+        "pagination"
+    ]["next_cursor"]
+
+    response = api_client.get("/users", params={"format": "ndjson", "cursor": cursor})
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["username"] for row in rows] == ["user2", "user3", "user4"]
+
+
+@pytest.mark.anyio
+async def test_stream_users_yields_chunks():
+    insert_users(5)
+
+    chunks = [
+        [user.username for user in users]
+        async for users in UserService.stream_users(chunk_size=2)
+    ]
+
+    assert chunks == [["user0", "user1"], ["user2", "user3"], ["user4"]]
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.app.services.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hash_and_verify_in_pool():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    try:
+        hashed = await hasher.hash("Secret123")
+
+        assert await hasher.verify("Secret123", hashed)
+        assert not await hasher.verify("Wrong1234", hashed)
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+async def test_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        # Isi worker + antrian dengan job yang ditahan
+        jobs = [
+            asyncio.ensure_future(hasher._submit(release.wait))
+            for _ in range(hasher.capacity)
+        ]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.hash("Secret123")
+        assert hasher.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(*jobs)
+        assert hasher.stats()["pending"] == 0
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_unknown_executor_type():
+    with pytest.raises(ValueError):
+        PasswordHasher(executor_type="fiber")
+
+
+def test_register_returns_503_when_busy(client, monkeypatch):
+    async def busy(password):
+        raise PasswordHasherBusyError("Password hashing is saturated, retry later")
+
+    monkeypatch.setattr("src.app.services.password_hasher.password_hasher.hash", busy)
+
+    response = client.post(
+        "/auth/register",
+        json={
+            "email": "alice@example.com",
+            "username": "alice",
+            "password": "Secret123",
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["error_code"] == "SERVICE_BUSY"
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.config.env as env
+from src.app import profiler
+from src.app.exceptions import ProfilerBusyError
+from src.app.middleware import ProfilerMiddleware
+from src.app.profiler import StackSampler, start_profile, stop_profile
+
+
+def busy_loop(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collects_target_thread_stacks():
+    sampler = StackSampler(0.001, {threading.get_ident()}).start()
+    busy_loop(0.05)
+    sampler.stop()
+
+    assert sum(sampler.samples.values()) > 0
+    assert "busy_loop" in sampler.collapsed()
+    assert all(" " in line for line in sampler.collapsed().splitlines())
+
+
+def test_speedscope_export():
+    sampler = StackSampler(0.005)
+    sampler.samples[("main", "a (x.py:1)", "b (x.py:2)")] = 2
+    sampler.samples[("main", "a (x.py:1)")] = 1
+
+    data = sampler.speedscope("test")
+    frames = [frame["name"] for frame in data["shared"]["frames"]]
+    profile = data["profiles"][0]
+
+    assert frames == ["main", "a (x.py:1)", "b (x.py:2)"]
+    assert profile["samples"] == [[0, 1, 2], [0, 1]]
+    assert profile["weights"] == [10.0, 5.0]
+    assert profile["endValue"] == 15.0
+
+
+def test_one_profile_per_worker(monkeypatch):
+    monkeypatch.setattr(profiler, "_active", None)
+    sampler = start_profile()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            start_profile()
+    finally:
+        stop_profile(sampler)
+
+    stop_profile(start_profile())
+
+
+@pytest.fixture
+def profiled_client(monkeypatch):
+    monkeypatch.setattr(env, "API_KEY", "test-api-key")
+    monkeypatch.setattr(profiler, "_active", None)
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        busy_loop(0.05)
+        return {"ok": True}
+
+    @app.get("/async-work")
+    async def async_work():
+        busy_loop(0.05)
+        return {"ok": True}
+
+    return TestClient(ProfilerMiddleware(app))
+
+
+def test_middleware_passes_through_without_header(profiled_client):
+    response = profiled_client.get("/work")
+
+    assert response.json() == {"ok": True}
+
+
+def test_middleware_returns_profile(profiled_client):
+    response = profiled_client.get(
+        "/async-work",
+        headers={"X-Profile": "collapsed", "X-API-Key": "test-api-key"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Status"] == "200"
+    assert "profile.collapsed" in response.headers["Content-Disposition"]
+    assert "async_work" in response.text
+
+
+def test_middleware_requires_api_key(profiled_client):
+    response = profiled_client.get("/work", headers={"X-Profile": "collapsed"})
+
+    assert response.status_code == 403
+
+
+def test_middleware_fails_closed_without_configured_key(profiled_client, monkeypatch):
+    monkeypatch.setattr(env, "API_KEY", "")
+
+    response = profiled_client.get("/work", headers={"X-Profile": "collapsed"})
+
+    assert response.status_code == 403
+
+
+def test_middleware_rejects_unknown_format(profiled_client):
+    response = profiled_client.get(
+        "/work", headers={"X-Profile": "pstats", "X-API-Key": "test-api-key"}
+    )
+
+    assert response.status_code == 400
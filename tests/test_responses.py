@@ -0,0 +1,70 @@
+import json
+import time
+from datetime import datetime
+
+from src.app.controllers.base_controller import BaseController
+from src.app.responses import CoarseClock, FastJSONResponse
+from src.app.schemas.user_schema import TokenData
+
+
+def test_fast_json_response_encodes_models_and_datetimes():
+    response = FastJSONResponse(
+        {
+            "data": TokenData(user_id=1, username="alice"),
+            "at": datetime(2024, 1, 2, 3, 4, 5),
+        }
+    )
+
+    body = json.loads(response.body)
+    assert body["data"]["user_id"] == 1
+    assert body["at"] == "2024-01-02T03:04:05"
+
+
+def test_success_response_renders_envelope():
+    response = BaseController.success_response(
+        data={"id": 1}, message="Created", status_code=201
+    )
+
+    assert isinstance(response, FastJSONResponse)
+    body = json.loads(response.body)
+    assert body["status_code"] == 201
+    assert body["message"] == "Created"
+    assert body["data"] == {"id": 1}
+
+
+def test_register_envelope_includes_nested_user(client):
+    response = client.post(
+        "/auth/register",
+        json={
+            "email": "alice@example.com",
+            "username": "alice",
+            "password": "Secret123",
+        },
+    )
+
+    body = response.json()
+    assert response.headers["content-type"] == "application/json"
+    assert body["success"] is True
+    assert body["data"]["user"]["username"] == "alice"
+    assert "password" not in body["data"]["user"]
+
+
+def test_coarse_clock_reuses_value_within_resolution(monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    clock = CoarseClock(resolution=1.0)
+
+    first = clock.isoformat()
+    monkeypatch.setattr(time, "time", lambda: now + 0.5)
+    assert clock.isoformat() is first
+
+    monkeypatch.setattr(time, "time", lambda: now + 1.5)
+    assert clock.isoformat() != first
+
+
+def test_openapi_documents_envelopes(client):
+    schema = client.get("/openapi.json").json()
+
+    login = schema["paths"]["/auth/login"]["post"]["responses"]["200"]
+    ref = login["content"]["application/json"]["schema"]["$ref"]
+    assert ref.rsplit("/", 1)[-1].startswith("SuccessEnvelope")
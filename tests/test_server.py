@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import main
+import src.config.env as env
+from src.app.metrics import registry
+
+
+def test_run_uses_server_settings(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.uvicorn, "run", lambda *a, **kw: calls.append((a, kw)))
+    monkeypatch.setattr(env, "SERVER_WORKERS", 1)
+    monkeypatch.setattr(env, "SERVER_RELOAD", False)
+    monkeypatch.delenv("SERVER_PROCESSES", raising=False)
+
+    main.run()
+
+    ((args, kwargs),) = calls
+    assert args == ("main:app",)
+    assert kwargs["workers"] == 1
+    assert kwargs["reload"] is False
+    assert kwargs["port"] == env.API_PORT
+    assert kwargs["timeout_keep_alive"] == env.SERVER_KEEPALIVE_TIMEOUT
+    assert kwargs["timeout_graceful_shutdown"] == env.SERVER_GRACEFUL_TIMEOUT
+    assert kwargs["access_log"] is False
+    # Worker yang di-spawn bagi core password hasher per process
+    assert os.environ["SERVER_PROCESSES"] == "1"
+
+
+def test_hash_pool_uses_all_cores_outside_main():
+    assert env.SERVER_PROCESSES == 1
+    assert env.PASSWORD_HASH_WORKERS == env.CPU_COUNT
+    assert env.PASSWORD_HASH_MAX_QUEUE >= 32
+
+
+def test_api_port_parsed_as_int():
+    assert isinstance(env.API_PORT, int)
+
+
+def test_runtime_metrics_register_once():
+    main.register_runtime_metrics()
+    main.register_runtime_metrics()
+
+    assert "db_pool_connections" in registry
+
+
+def test_lifespan_restarts_cleanly():
+    from fastapi.testclient import TestClient
+
+    # Startup / shutdown dua kali (worker baru import main.py lagi)
+    for _ in range(2):
+        with TestClient(main.app) as client:
+            assert client.get("/health/db").status_code == 200
+
+
+def test_run_refuses_multiple_workers_without_redis(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.uvicorn, "run", lambda *a, **kw: calls.append(kw))
+    monkeypatch.setattr(env, "SERVER_WORKERS", 4)
+    monkeypatch.setattr(env, "CACHE_BACKEND", "memory")
+    monkeypatch.delenv("SERVER_PROCESSES", raising=False)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.run()
+
+    assert exit_info.value.code == 1
+    assert calls == []
+
+    monkeypatch.setattr(env, "CACHE_BACKEND", "redis")
+    main.run()
+    assert calls[0]["workers"] == 4
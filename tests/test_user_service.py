@@ -0,0 +1,203 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.app.exceptions import AccountDeactivatedError, ConflictError
+from src.app.schemas.user_schema import UserCreate, UserUpdate
+from src.app.services.user_service import UserService
+from src.database.factories.user_factory import User
+from src.database.session import engine
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "Secret123"
+
+
+async def create_user(username: str, **overrides):
+    data = {
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": PASSWORD,
+    }
+    data.update(overrides)
+    return await UserService.create_user(UserCreate(**data))
+
+
+async def test_create_user_hashes_password():
+    user = await create_user("alice", full_name="Alice")
+
+    assert user.id is not None
+    assert user.password != PASSWORD
+    assert await UserService.verify_password(PASSWORD, user.password)
+    assert user.is_active and not user.is_verified
+
+
+async def test_create_user_rejects_duplicates():
+    await create_user("alice")
+
+    with pytest.raises(ConflictError, match="Email already registered"):
+        await create_user("alice2", email="ALICE@example.com")
+    with pytest.raises(ConflictError, match="Username already taken"):
+        await create_user("Alice", email="other@example.com")
+
+
+async def test_concurrent_registration_has_one_winner():
+    results = await asyncio.gather(
+        create_user("alice"),
+        create_user("alice", email="alice2@example.com"),
+        return_exceptions=True,
+    )
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    assert len(errors) == 1
+    assert str(errors[0]) == "Username already taken"
+
+
+class ConstraintError(Exception):
+    """asyncpg-style exception dengan constraint_name"""
+
+    def __init__(self, constraint_name):
+        super().__init__("duplicate key value violates unique constraint")
+        self.constraint_name = constraint_name
+
+
+def integrity_error(orig: Exception) -> IntegrityError:
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("UNIQUE constraint failed: users.email", "Email already registered"),
+        ("UNIQUE constraint failed: users.username", "Username already taken"),
+        ("NOT NULL constraint failed: users.password", None),
+    ],
+)
+def test_unique_violation_message_from_sqlite(message, expected):
+    error = integrity_error(Exception(message))
+    assert UserService.get_unique_violation_message(error) == expected
+
+
+def test_unique_violation_message_from_asyncpg_constraint_name():
+    orig = Exception("wrapped")
+    orig.__cause__ = ConstraintError("ix_users_username")
+
+    message = UserService.get_unique_violation_message(integrity_error(orig))
+    assert message == "Username already taken"
+
+
+def test_unique_violation_message_from_psycopg2_diag():
+    orig = Exception("duplicate key value")
+    orig.diag = ConstraintError("ix_users_email")
+
+    message = UserService.get_unique_violation_message(integrity_error(orig))
+    assert message == "Email already registered"
+
+
+async def test_lookups_are_case_insensitive():
+    user = await create_user("alice")
+
+    assert (await UserService.get_user_by_id(user.id)).username == "alice"
+    assert (await UserService.get_user_by_email("ALICE@example.com")).id == user.id
+    assert (await UserService.get_user_by_username("ALICE")).id == user.id
+    assert (await UserService.get_user_by_username_or_email("Alice")).id == user.id
+    assert await UserService.get_user_by_id(user.id + 1) is None
+
+
+async def test_update_user():
+    user = await create_user("alice")
+    await create_user("bob")
+
+    updated = await UserService.update_user(user.id, UserUpdate(full_name="Alice A"))
+    assert updated.full_name == "Alice A"
+
+    with pytest.raises(ConflictError, match="Username already taken"):
+        await UserService.update_user(user.id, UserUpdate(username="bob"))
+    assert await UserService.update_user(9999, UserUpdate(bio="x")) is None
+
+
+async def test_authenticate_user():
+    user = await create_user("alice")
+
+    authenticated = await UserService.authenticate_user("alice@example.com", PASSWORD)
+    assert authenticated.id == user.id
+    assert (await UserService.get_user_by_id(user.id)).last_login is not None
+
+    assert await UserService.authenticate_user("alice", "Wrong1234") is None
+    assert await UserService.authenticate_user("nobody", PASSWORD) is None
+
+    await UserService.deactivate_user(user.id)
+    with pytest.raises(AccountDeactivatedError):
+        await UserService.authenticate_user("alice", PASSWORD)
+
+
+async def test_authenticate_cached_user_reads_hash_from_database():
+    user = await create_user("alice")
+    await UserService.get_user_by_username("alice")
+
+    assert (await UserService.authenticate_user("alice", PASSWORD)).id == user.id
+    assert await UserService.change_password(user.id, PASSWORD, "Secret456")
+    assert await UserService.authenticate_user("alice", "Secret456") is not None
+
+    # User dihapus langsung di database, snapshot cache masih ada
+    with engine.begin() as conn:
+        conn.execute(User.__table__.delete())
+    assert await UserService.authenticate_user("alice", "Secret456") is None
+    assert not await UserService.change_password(user.id, "Secret456", "Secret789")
+
+
+async def test_authenticate_user_deleted_during_verify(monkeypatch):
+    await create_user("alice")
+    verify = UserService.verify_password
+
+    async def verify_then_delete(plain_password, hashed_password):
+        with engine.begin() as conn:
+            conn.execute(User.__table__.delete())
+        return await verify(plain_password, hashed_password)
+
+    monkeypatch.setattr(UserService, "verify_password", verify_then_delete)
+
+    assert await UserService.authenticate_user("alice", PASSWORD) is None
+
+
+async def test_pagination_and_search():
+    alice = await create_user("alice", full_name="Alice Smith")
+    await create_user("bob")
+
+    users, total = await UserService.get_users_paginated(skip=0, limit=1)
+    assert total == 2 and len(users) == 1
+
+    users, total = await UserService.search_users("alice s")
+    assert total == 1 and users[0].id == alice.id
+
+
+async def test_user_stats_snapshot():
+    alice = await create_user("alice")
+    await create_user("bob")
+    await UserService.verify_user(alice.id)
+
+    stats = await UserService.get_user_stats()
+    assert stats["total_users"] == 2
+    assert stats["active_users"] == 2
+    assert stats["verified_users"] == 1
+    assert stats["inactive_users"] == 0
+
+    # Snapshot dipakai sampai TTL habis, fresh=True hitung ulang
+    await UserService.deactivate_user(alice.id)
+    assert await UserService.get_user_stats() == stats
+
+    stats = await UserService.get_user_stats(fresh=True)
+    assert stats["active_users"] == 1
+    assert stats["inactive_users"] == 1
+
+
+async def test_delete_user():
+    user = await create_user("alice")
+
+    assert await UserService.delete_user(user.id)
+    assert not (await UserService.get_user_by_id(user.id)).is_active
+
+    assert await UserService.hard_delete_user(user.id)
+    assert await UserService.get_user_by_id(user.id) is None
+    assert not await UserService.delete_user(user.id)
@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.app.exceptions import InvalidFormatError
+from src.app.services.user_service import UserService
+from src.app.services.user_transfer_service import (
+    EXPORT_FIELDS,
+    UserTransferService,
+)
+from src.database.factories.user_factory import User
+from src.database.session import engine
+
+pytestmark = pytest.mark.anyio
+
+
+def jsonl(*records) -> io.StringIO:
+    return io.StringIO(
+        "".join(
+            (record if isinstance(record, str) else json.dumps(record)) + "\n"
+            for record in records
+        )
+    )
+
+
+def user_record(username: str, **overrides):
+    return {
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": "Secret123",
+        **overrides,
+    }
+
+
+def insert_users(count: int):
+    rows = [
+        {"email": f"user{i}@example.com", "username": f"user{i}", "password": "hash"}
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), rows)
+
+
+# =============== Import ===============
+async def test_import_jsonl_report():
+    insert_users(1)
+    stream = jsonl(
+        user_record("alice", full_name="Alice"),
+        user_record("bob"),
+        "{not json",
+        user_record("carol", password="short"),
+        user_record("alice", email="alice2@example.com"),
+        user_record("user0", email="fresh@example.com"),
+    )
+
+    report = await UserTransferService.import_users(stream, "jsonl", batch_size=2)
+
+    assert report["processed"] == 6
+    assert report["created"] == 2
+    # alice (batch sebelumnya) dan user0 sudah ada di database
+    assert report["skipped_existing"] == 2
+    assert report["invalid"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+
+    alice = await UserService.get_user_by_username("alice")
+    assert alice.full_name == "Alice"
+    assert await UserService.verify_password("Secret123", alice.password)
+
+
+async def test_import_duplicates_within_batch():
+    stream = jsonl(user_record("alice"), user_record("alice", email="a2@example.com"))
+
+    report = await UserTransferService.import_users(stream, "jsonl")
+
+    assert report["created"] == 1
+    assert report["duplicates"] == 1
+
+
+async def test_import_csv_treats_empty_columns_as_missing():
+    stream = io.StringIO(
+        "email,username,password,full_name\n" "alice@example.com,alice,Secret123,\n"
+    )
+
+    report = await UserTransferService.import_users(stream, "csv")
+
+    assert report["created"] == 1
+    assert (await UserService.get_user_by_username("alice")).full_name is None
+
+
+def test_detect_format():
+    assert UserTransferService.detect_format("users.CSV") == "csv"
+    assert UserTransferService.detect_format("users.ndjson") == "jsonl"
+    assert UserTransferService.detect_format(None, default="csv") == "csv"
+
+
+def test_unsupported_import_format():
+    with pytest.raises(InvalidFormatError):
+        list(UserTransferService.iter_records(io.StringIO(""), "xml"))
+
+
+# =============== Export ===============
+async def export(fmt: str, chunk_size: int = 2) -> str:
+    return "".join(
+        [chunk async for chunk in UserTransferService.export_users(fmt, chunk_size)]
+    )
+
+
+async def test_export_jsonl_streams_all_users():
+    insert_users(5)
+
+    rows = [json.loads(line) for line in (await export("jsonl")).splitlines()]
+
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(5)]
+    assert "password" not in rows[0]
+
+
+async def test_export_csv_has_single_header():
+    insert_users(3)
+
+    rows = list(csv.reader(io.StringIO(await export("csv"))))
+
+    assert rows[0] == EXPORT_FIELDS
+    assert [row[2] for row in rows[1:]] == ["user0", "user1", "user2"]
+
+
+# =============== /users/import & /users/export ===============
+def test_import_route(api_client):
+    body = "\n".join(json.dumps(user_record(name)) for name in ("alice", "bob"))
+
+    response = api_client.post(
+        "/users/import",
+        files={"file": ("users.jsonl", body.encode(), "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["created"] == 2
+
+
+def test_import_route_rejects_bad_encoding(api_client):
+    response = api_client.post(
+        "/users/import",
+        files={"file": ("users.csv", b"email\n\xff\xfe\n", "text/csv")},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_IMPORT"
+
+
+def test_export_route_streams_csv(api_client):
+    insert_users(3)
+
+    response = api_client.get("/users/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="users.csv"' in response.headers["content-disposition"]
+    assert len(list(csv.reader(io.StringIO(response.text)))) == 4
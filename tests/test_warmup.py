@@ -0,0 +1,97 @@
+import pytest
+
+from src.app import warmup as warmup_module
+from src.app.services.password_hasher import PasswordHasher
+from src.app.warmup import WarmupState, run_step, warmup
+from src.database.pool import prefill_pool
+from src.database.session import async_engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def state(monkeypatch):
+    """warmup_state baru per test (module global dipakai /health/ready)"""
+    fresh = WarmupState()
+    monkeypatch.setattr(warmup_module, "warmup_state", fresh)
+    monkeypatch.setattr("main.warmup_state", fresh)
+    return fresh
+
+
+async def test_warmup_runs_every_step(state):
+    from main import app
+
+    await warmup(app)
+
+    assert state.completed
+    assert not state.failed
+    assert set(state.steps) == {
+        "mappers",
+        "schemas",
+        "password_hasher",
+        "database_pool",
+    }
+    assert state.steps["password_hasher"]["rounds"] == 4
+
+
+async def test_failed_step_is_recorded(state):
+    def broken():
+        raise RuntimeError("boom")
+
+    await run_step("broken", broken)
+
+    assert state.failed
+    assert state.steps["broken"]["status"] == "failed"
+    assert state.steps["broken"]["error"] == "boom"
+
+
+async def test_prefill_pool_opens_connections():
+    before = async_engine.pool.metrics.checkouts
+
+    opened = await prefill_pool(async_engine, 2)
+
+    assert opened == 2
+    assert async_engine.pool.metrics.checkouts - before == 2
+
+
+async def test_calibrate_picks_cost_within_budget():
+    hasher = PasswordHasher(max_workers=1, rounds=6)
+    try:
+        # Budget mustahil: turun ke min_rounds
+        result = await hasher.calibrate(target_ms=0.001, min_rounds=4)
+        assert result["rounds"] == 4
+
+        # Budget longgar: cost tetap di batas atas
+        hasher.rounds = 6
+        result = await hasher.calibrate(target_ms=60_000, min_rounds=4)
+        assert result["rounds"] == 6
+
+        hashed = await hasher.hash("Secret123")
+        assert hashed.startswith("$2b$06$")
+    finally:
+        hasher.shutdown()
+
+
+def test_readiness_after_startup(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["warmup"]["completed"]
+
+
+def test_readiness_before_warmup(client, state):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+
+
+def test_readiness_degraded_when_step_failed(client, state):
+    state.completed = True
+    state.steps["schemas"] = {"status": "failed", "error": "boom"}
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"